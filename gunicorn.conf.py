@@ -0,0 +1,23 @@
+"""
+Gunicorn configuration, read from the working directory on start.
+
+Server options (bind address, worker class) are passed on command line
+in Makefile and Procfile.
+"""
+
+
+def post_worker_init(worker):
+    """Compile templates before the worker accepts requests."""
+    from django.conf import settings  # noqa: WPS433
+
+    if not settings.TEMPLATES_WARMUP:
+        return
+
+    from task_manager.utils.templates import warm_templates  # noqa: WPS433
+
+    num_templates, elapsed = warm_templates()
+    worker.log.info(
+        "Compiled %s templates in %.1f ms",  # noqa: WPS323
+        num_templates,
+        elapsed,
+    )
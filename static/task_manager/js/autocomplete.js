@@ -0,0 +1,64 @@
+// Search input for selects with options fetched from autocomplete endpoint.
+// Selected options are kept, matching objects are added after them.
+(function () {
+  "use strict";
+
+  var DEBOUNCE_MS = 250;
+
+  function replaceOptions(select, results) {
+    Array.prototype.slice.call(select.options).forEach(function (option) {
+      if (!option.selected && option.value) {
+        select.removeChild(option);
+      }
+    });
+    var present = {};
+    Array.prototype.forEach.call(select.options, function (option) {
+      present[option.value] = true;
+    });
+    results.forEach(function (result) {
+      var value = String(result.id);
+      if (!present[value]) {
+        select.appendChild(new Option(result.text, value));
+      }
+    });
+  }
+
+  function setUpAutocomplete(select) {
+    var input = document.createElement("input");
+    var timer = null;
+    var request = null;
+    input.type = "search";
+    input.className = "form-control form-control-sm mb-1";
+    input.placeholder = select.options.length && !select.options[0].value
+      ? select.options[0].text
+      : "";
+    input.autocomplete = "off";
+    select.parentNode.insertBefore(input, select);
+
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        if (request) {
+          request.abort();
+        }
+        request = new AbortController();
+        var url = new URL(select.dataset.autocompleteUrl, window.location.href);
+        url.searchParams.set("q", input.value.trim());
+        fetch(url, {
+          credentials: "same-origin",
+          headers: { Accept: "application/json" },
+          signal: request.signal,
+        })
+          .then(function (response) { return response.json(); })
+          .then(function (data) { replaceOptions(select, data.results); })
+          .catch(function () {});
+      }, DEBOUNCE_MS);
+    });
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document
+      .querySelectorAll("select[data-autocomplete-url]")
+      .forEach(setUpAutocomplete);
+  });
+})();
@@ -1,8 +1,20 @@
 from django.apps import AppConfig
 
+from task_manager.db import functions, metrics
+
 
 class TaskManagerConfig(AppConfig):
     """Application config."""
 
     name = "task_manager"
     label = "task_manager"
+
+    def ready(self):
+        """Connect signal receivers, register index expressions."""
+        from task_manager import search, signals  # noqa: WPS433
+
+        functions.connect_signals()
+        functions.register_index_wrappers()
+        metrics.connect_signals()
+        search.connect_signals(sender=self)
+        signals.connect_signals()
@@ -0,0 +1,348 @@
+"""
+Versioned cache namespaces and objects.
+
+Cached values are keyed by the version of their namespace. Changing
+any object of the namespace bumps its version, so all values cached
+for the previous version are never read again and expire by timeout,
+without tracking or deleting individual keys.
+
+Template fragments are keyed by the versions of the objects they show,
+so changing an object invalidates only the fragments showing it.
+
+Tasks created by and assigned to a user are cached as lists of their
+ordering keys, changed in place as tasks are saved and deleted.
+
+Versions and task lists are kept in the default cache, values keyed by
+versions in `choices` and `fragments` caches (see cache_config.py).
+Hits and misses of lookups are counted per cache alias in the process
+and added to totals in the default cache from time to time.
+"""
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.db.models import Model
+from django.utils import timezone, translation
+from django.utils.crypto import md5
+
+from task_manager.cache_config import CHOICES_ALIAS, FRAGMENTS_ALIAS
+from task_manager.pagination import count_greater_keys
+
+STATUSES_NAMESPACE = "statuses"
+LABELS_NAMESPACE = "labels"
+USERS_NAMESPACE = "users"
+
+KEY_SEPARATOR = ":"
+
+# Timeout of values cached under a namespace version
+VERSIONED_CACHE_TIMEOUT = 60 * 60 * 24
+# Object versions outlive fragments keyed by them; an expired version is
+# replaced by a new one, so expiry costs misses, never stale fragments
+OBJECT_VERSION_TIMEOUT = VERSIONED_CACHE_TIMEOUT * 2
+
+# Number of the newest tasks of a user kept in cached task lists
+USER_TASKS_LIMIT = 1000
+# Cached task lists are changed without locking, so lists that lost
+# a concurrent change are rebuilt soon
+USER_TASKS_TIMEOUT = 60 * 10
+
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+FRAGMENT_HIT = CACHE_HIT
+FRAGMENT_MISS = CACHE_MISS
+# Lookups of cached template fragments in this process,
+# by (fragment name, FRAGMENT_HIT or FRAGMENT_MISS)
+fragment_stats = Counter()
+
+# Seconds between writes of lookup counters of a process to the cache
+LOOKUP_STATS_FLUSH_INTERVAL = 10
+
+
+class LookupStats:
+    """
+    Thread-safe counters of cache lookups per alias in this process.
+
+    Counters are added to the totals of all processes, kept in the
+    default cache, by `flush`, at most once per
+    LOOKUP_STATS_FLUSH_INTERVAL unless forced, so that lookups don't cost
+    extra cache round trips.
+    """
+
+    def __init__(self):
+        """Set up empty counters."""
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._flushed_at = time.monotonic()
+
+    def count(self, alias, hits=0, misses=0):
+        """Count hits and misses of lookups in the cache alias."""
+        with self._lock:
+            self._pending[(alias, CACHE_HIT)] += hits
+            self._pending[(alias, CACHE_MISS)] += misses
+
+    def count_lookup(self, alias, cached):
+        """Count lookup of a value in the cache alias, missing if None."""
+        if cached is None:
+            self.count(alias, misses=1)
+        else:
+            self.count(alias, hits=1)
+
+    def flush(self, force=False):
+        """Add counters of this process to the totals in the cache."""
+        with self._lock:
+            elapsed = time.monotonic() - self._flushed_at
+            if not force and elapsed < LOOKUP_STATS_FLUSH_INTERVAL:
+                return
+            pending = self._pending
+            self._pending = Counter()
+            self._flushed_at = time.monotonic()
+        for (alias, outcome), lookups in pending.items():
+            if lookups:
+                _add_lookups(_lookups_key(alias, outcome), lookups)
+
+
+def make_key(*parts):
+    """Return cache key joined from the parts."""
+    return KEY_SEPARATOR.join(str(part) for part in parts)
+
+
+def _lookups_key(alias, outcome):
+    """Return cache key of total lookups of the alias by outcome."""
+    return make_key("lookups", alias, outcome)
+
+
+def _add_lookups(key, lookups):
+    """Add lookups to the total, setting it up if missing."""
+    try:
+        cache.incr(key, lookups)
+    except ValueError:
+        if not cache.add(key, lookups, timeout=None):
+            cache.incr(key, lookups)
+
+
+def get_lookup_totals(alias):
+    """Return hits and misses of the alias counted by all processes."""
+    keys = [_lookups_key(alias, CACHE_HIT), _lookups_key(alias, CACHE_MISS)]
+    totals = cache.get_many(keys)
+    return tuple(totals.get(key, 0) for key in keys)
+
+
+lookup_stats = LookupStats()
+
+
+def _version_key(namespace):
+    """Return cache key of namespace version."""
+    return make_key("namespace_version", namespace)
+
+
+def _initial_version():
+    """
+    Return version of a namespace missing from cache.
+
+    Version is based on current time, so that a namespace whose version
+    was evicted from cache never gets back an old version.
+    """
+    return time.time_ns() // 1000
+
+
+def get_namespace_version(namespace):
+    """Return current version of the namespace."""
+    version = cache.get(_version_key(namespace))
+    lookup_stats.count_lookup(DEFAULT_CACHE_ALIAS, version)
+    if version is None:
+        version = _initial_version()
+        cache.add(_version_key(namespace), version, timeout=None)
+        version = cache.get(_version_key(namespace), version)
+    return version
+
+
+def bump_namespace_version(namespace):
+    """Invalidate all values cached under the namespace."""
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), _initial_version(), timeout=None)
+
+
+def versioned_key(namespace, *parts):
+    """Return cache key for current version of the namespace and language."""
+    return make_key(
+        namespace,
+        get_namespace_version(namespace),
+        translation.get_language() or "",
+        *parts,
+    )
+
+
+def get_or_set_versioned(namespace, parts, default):
+    """Return value cached under the namespace, computing it if missing."""
+    choices_cache = caches[CHOICES_ALIAS]
+    key = versioned_key(namespace, *parts)
+    cached = choices_cache.get(key)
+    lookup_stats.count_lookup(CHOICES_ALIAS, cached)
+    if cached is None:
+        cached = default() if callable(default) else default
+        choices_cache.set(key, cached, timeout=VERSIONED_CACHE_TIMEOUT)
+    return cached
+
+
+def _model_label(model):
+    """Return lower-cased label of the model, unique in the project."""
+    return model._meta.label_lower  # noqa: WPS437
+
+
+def _object_version_key(model, pk):
+    """Return cache key of object version."""
+    return make_key("object_version", _model_label(model), pk)
+
+
+def get_object_versions(instances):
+    """Return current versions of model instances, in the same order."""
+    keys = [
+        _object_version_key(type(instance), instance.pk)
+        for instance in instances
+    ]
+    versions = cache.get_many(keys)
+    missing = {
+        key: _initial_version() for key in keys if key not in versions
+    }
+    lookup_stats.count(
+        DEFAULT_CACHE_ALIAS,
+        hits=len(keys) - len(missing),
+        misses=len(missing),
+    )
+    if missing:
+        # Set in one batch: a version set concurrently by another process
+        # is replaced by a newer one, costing only a miss of its fragments
+        cache.set_many(missing, timeout=OBJECT_VERSION_TIMEOUT)
+        versions.update(missing)
+    return [versions.get(key) for key in keys]
+
+
+def bump_object_versions(model, pks):
+    """
+    Invalidate values cached for the objects of the model.
+
+    Versions are set to the current time, so they never go back to
+    a version the values were cached for.
+    """
+    version = _initial_version()
+    cache.set_many(
+        {_object_version_key(model, pk): version for pk in pks},
+        timeout=OBJECT_VERSION_TIMEOUT,
+    )
+
+
+def forget_object_versions(model, pks):
+    """Drop versions of deleted objects of the model."""
+    cache.delete_many([_object_version_key(model, pk) for pk in pks])
+
+
+def fragment_key(fragment_name, vary_on):
+    """
+    Return cache key of template fragment for current language.
+
+    Model instances in `vary_on` are keyed by their primary key and
+    version, other values as they are.
+    """
+    instances = [part for part in vary_on if isinstance(part, Model)]
+    versions = iter(get_object_versions(instances))
+    key_parts = [
+        translation.get_language() or "",
+        timezone.get_current_timezone_name(),
+    ]
+    for part in vary_on:
+        if isinstance(part, Model):
+            label = _model_label(type(part))
+            version = next(versions)
+            key_parts.append(f"{label}.{part.pk}.{version}")
+        else:
+            key_parts.append(str(part))
+    digest = md5(make_key(*key_parts).encode(), usedforsecurity=False)
+    return make_key("fragment", fragment_name, digest.hexdigest())
+
+
+def get_or_render_fragment(fragment_name, vary_on, render):
+    """
+    Return cached template fragment, rendering and caching it if missing.
+
+    Return the fragment and whether it was found in cache.
+    """
+    key = fragment_key(fragment_name, vary_on)
+    fragment_cache = caches[FRAGMENTS_ALIAS]
+    fragment = fragment_cache.get(key)
+    is_hit = fragment is not None
+    outcome = FRAGMENT_HIT if is_hit else FRAGMENT_MISS
+    fragment_stats[(fragment_name, outcome)] += 1
+    lookup_stats.count_lookup(FRAGMENTS_ALIAS, fragment)
+    if not is_hit:
+        fragment = render()
+        fragment_cache.set(key, fragment, timeout=VERSIONED_CACHE_TIMEOUT)
+    return fragment, is_hit
+
+
+def _user_tasks_key(field_name, user_pk):
+    """Return cache key of tasks list of the user by the task field."""
+    return make_key("user_tasks", field_name, user_pk)
+
+
+def get_user_tasks(field_name, user_pk, load):
+    """
+    Return cached keys of tasks of the user by the task field.
+
+    Keys are (created_on, id) of the newest USER_TASKS_LIMIT tasks, newest
+    first. Missing list is built from `load(limit)` returning keys from
+    the database. Return the keys and whether they are all tasks of the
+    user.
+    """
+    key = _user_tasks_key(field_name, user_pk)
+    cached = cache.get(key)
+    lookup_stats.count_lookup(DEFAULT_CACHE_ALIAS, cached)
+    if cached is None:
+        task_keys = list(load(USER_TASKS_LIMIT + 1))
+        cached = (
+            task_keys[:USER_TASKS_LIMIT],
+            len(task_keys) <= USER_TASKS_LIMIT,
+        )
+        cache.add(key, cached, timeout=USER_TASKS_TIMEOUT)
+    return cached
+
+
+def add_user_task(field_name, user_pk, task_key):
+    """Insert the task key into cached tasks list of the user."""
+    key = _user_tasks_key(field_name, user_pk)
+    cached = cache.get(key)
+    if cached is None:
+        return
+    task_keys, complete = cached
+    if task_key in task_keys:
+        return
+    position = count_greater_keys(task_keys, task_key)
+    # Lists of the newest tasks only can't tell where older tasks go
+    if position == len(task_keys) and not complete:
+        return
+    task_keys.insert(position, task_key)
+    if len(task_keys) > USER_TASKS_LIMIT:
+        task_keys.pop()
+        complete = False
+    cache.set(key, (task_keys, complete), timeout=USER_TASKS_TIMEOUT)
+
+
+def remove_user_task(field_name, user_pk, task_pk):
+    """Remove the task from cached tasks list of the user."""
+    key = _user_tasks_key(field_name, user_pk)
+    cached = cache.get(key)
+    if cached is None:
+        return
+    task_keys, complete = cached
+    remaining = [task_key for task_key in task_keys if task_key[-1] != task_pk]
+    if len(remaining) != len(task_keys):
+        cache.set(key, (remaining, complete), timeout=USER_TASKS_TIMEOUT)
+
+
+def forget_user_tasks(field_name, user_pks):
+    """Drop cached tasks lists of the users, i.e. after bulk changes."""
+    cache.delete_many(
+        [_user_tasks_key(field_name, user_pk) for user_pk in user_pks],
+    )
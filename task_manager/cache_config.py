@@ -0,0 +1,111 @@
+"""
+Configuration of cache aliases of task manager.
+
+Every alias uses the same backend, selected by name:
+
+- `locmem`: memory of the process, cached values are not shared
+  between worker processes, so it is allowed with DEBUG only
+  (development and tests);
+- `file`: files in a directory per alias, shared by processes on host;
+- `redis`: Redis server or a server speaking its protocol,
+  all aliases share the server and are told apart by key prefix.
+
+Keys of values rendered by the code (choices, fragments) are prefixed
+with the deploy id, so a new deploy never reads values rendered by
+the previous one. Versions of cached objects and sessions outlive
+deploys, so that old and new workers agree on them during a deploy.
+"""
+from pathlib import Path
+from types import MappingProxyType
+
+from django.core.exceptions import ImproperlyConfigured
+
+CACHE_BACKENDS = MappingProxyType(
+    {
+        "locmem": "django.core.cache.backends.locmem.LocMemCache",
+        "file": "django.core.cache.backends.filebased.FileBasedCache",
+        "redis": "django.core.cache.backends.redis.RedisCache",
+    },
+)
+# Backends sharing cached values between processes
+SHARED_BACKENDS = frozenset(("file", "redis"))
+REDIS_SCHEMES = ("redis://", "rediss://", "unix://")
+
+DEFAULT_ALIAS = "default"
+CHOICES_ALIAS = "choices"
+FRAGMENTS_ALIAS = "fragments"
+SESSIONS_ALIAS = "sessions"
+# Aliases holding values rendered by the code of a deploy
+DEPLOY_SCOPED_ALIASES = frozenset((CHOICES_ALIAS, FRAGMENTS_ALIAS))
+# Maximum numbers of entries of locmem and file caches per alias
+MAX_ENTRIES = {  # noqa: WPS407
+    DEFAULT_ALIAS: 10000,
+    CHOICES_ALIAS: 300,
+    FRAGMENTS_ALIAS: 10000,
+    SESSIONS_ALIAS: 10000,
+}
+KEY_PREFIX = "task_manager"
+
+
+def default_cache_backend(location, debug):
+    """
+    Return backend used when none is configured.
+
+    Processes of development server and tests share nothing, they use
+    local memory. Deployments use Redis server if location is its URL,
+    and a cache directory otherwise.
+    """
+    if debug:
+        return "locmem"
+    if location and location.startswith(REDIS_SCHEMES):
+        return "redis"
+    return "file"
+
+
+def check_cache_backend(backend, debug):
+    """Refuse per-process cache of deployments running several workers."""
+    if backend not in SHARED_BACKENDS and not debug:
+        raise ImproperlyConfigured(
+            "Cache backend {0} is not shared by worker processes, "
+            "it is allowed with DEBUG only; choose from: {1}".format(
+                backend,
+                ", ".join(sorted(SHARED_BACKENDS)),
+            ),
+        )
+
+
+def build_caches(backend, location, deploy_id, version=1):
+    """
+    Return CACHES setting with all aliases using the backend.
+
+    Location is a directory of `file` backend (aliases get their
+    subdirectories) or a server URL of `redis` backend, ignored by
+    `locmem` backend.
+    """
+    if backend not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            "Unknown cache backend {0}, choose from: {1}".format(
+                backend,
+                ", ".join(CACHE_BACKENDS),
+            ),
+        )
+    caches = {}
+    for alias, max_entries in MAX_ENTRIES.items():
+        key_prefix = f"{KEY_PREFIX}:{alias}"
+        if alias in DEPLOY_SCOPED_ALIASES:
+            key_prefix = f"{key_prefix}:{deploy_id}"
+        cache_settings = {
+            "BACKEND": CACHE_BACKENDS[backend],
+            "KEY_PREFIX": key_prefix,
+            "VERSION": version,
+        }
+        if backend == "redis":
+            cache_settings["LOCATION"] = location
+        else:
+            cache_settings["OPTIONS"] = {"MAX_ENTRIES": max_entries}
+            # Local memory caches with the same location share values
+            cache_settings["LOCATION"] = alias
+            if backend == "file":
+                cache_settings["LOCATION"] = str(Path(location) / alias)
+        caches[alias] = cache_settings
+    return caches
@@ -0,0 +1,141 @@
+"""
+PostgreSQL backend taking connections from an in-process pool.
+
+Django closes connections at the end of every request unless they are
+persistent, and persistent connections are bound to a thread, so
+threaded and async workers still connect for many requests. This
+backend keeps a psycopg2 ThreadedConnectionPool per database alias and
+process: closing a connection returns it to the pool, and the next
+request in any thread takes it from there without connecting again.
+
+Pool size is configured with POOL key of database settings:
+{"MIN_SIZE": 1, "MAX_SIZE": 10, "TIMEOUT": 10}. When all connections
+are in use, a request waits up to TIMEOUT seconds for one to be returned.
+"""
+import os
+import threading
+import time
+
+from django.db.backends.postgresql import base
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+from task_manager.db.metrics import connection_metrics
+
+DEFAULT_POOL_MIN_SIZE = 1
+DEFAULT_POOL_MAX_SIZE = 10
+DEFAULT_POOL_TIMEOUT = 10
+
+
+class MeteredConnectionPool(ThreadedConnectionPool):
+    """
+    Connection pool counting physical connections it makes.
+
+    Unlike psycopg2 pool, taking a connection from the exhausted pool
+    waits for a used connection to be returned.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        alias,
+        minconn,
+        maxconn,
+        *args,
+        timeout=DEFAULT_POOL_TIMEOUT,
+        **kwargs,
+    ):
+        """Create pool of connections to database with the alias."""
+        self.alias = alias
+        self.timeout = timeout
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        # Condition works as the lock of parent class
+        self._lock = threading.Condition()
+
+    def getconn(self, key=None):
+        """
+        Take connection, waiting up to timeout if the pool is exhausted.
+
+        Raises PoolError if no connection is returned in time.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._lock:
+            while self._is_exhausted(key):
+                remaining = max(deadline - time.monotonic(), 0)
+                if not self._lock.wait(remaining):
+                    raise PoolError(
+                        f"No connection to {self.alias} returned to the pool "
+                        f"in {self.timeout} seconds",
+                    )
+            return self._getconn(key)
+
+    def putconn(self, conn=None, key=None, close=False):
+        """Put connection back and wake up a waiting thread."""
+        with self._lock:
+            self._putconn(conn, key, close)
+            self._lock.notify()
+
+    def _is_exhausted(self, key):
+        """Return whether taking a connection would exceed pool size."""
+        if self.closed or key in self._used or self._pool:
+            return False
+        return len(self._used) >= self.maxconn
+
+    def _connect(self, key=None):
+        """Make new physical connection."""
+        connection_metrics.record_opened(self.alias)
+        return super()._connect(key)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL database wrapper using pooled connections."""
+
+    is_pooled = True
+
+    # Pools are keyed by alias and process id, as connections
+    # must not be shared with forked processes
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def get_pool(self, conn_params=None):
+        """Return connection pool of the database, creating it if needed."""
+        key = (self.alias, os.getpid())
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                if conn_params is None:
+                    conn_params = self.get_connection_params()
+                pool_settings = self.settings_dict.get("POOL", {})
+                pool = MeteredConnectionPool(
+                    self.alias,
+                    pool_settings.get("MIN_SIZE", DEFAULT_POOL_MIN_SIZE),
+                    pool_settings.get("MAX_SIZE", DEFAULT_POOL_MAX_SIZE),
+                    timeout=pool_settings.get("TIMEOUT", DEFAULT_POOL_TIMEOUT),
+                    **conn_params,
+                )
+                self._pools[key] = pool
+        return pool
+
+    def get_new_connection(self, conn_params):
+        """Take connection from the pool and set it up as Django does."""
+        pool = self.get_pool(conn_params)
+        connection = pool.getconn()
+        # psycopg2.connect() returns what connection_factory returns,
+        # so Django backend sets up the pooled connection as a new one
+        try:
+            return super().get_new_connection(
+                {**conn_params, "connection_factory": lambda dsn: connection},
+            )
+        except Exception:
+            pool.putconn(connection, close=True)
+            raise
+
+    def _close(self):
+        """Return connection to the pool instead of closing it."""
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            # Pool rolls back unfinished transactions and drops
+            # broken connections
+            self.get_pool().putconn(
+                self.connection,
+                close=bool(self.connection.closed),
+            )
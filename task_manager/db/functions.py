@@ -0,0 +1,97 @@
+"""
+Database functions folding case of any alphabet.
+
+SQLite UPPER() folds ASCII letters only, so case-insensitive search of
+Cyrillic names never matches there. Python str.upper() is registered
+on SQLite connections and used in place of UPPER(); other databases
+fold case of every alphabet themselves.
+
+Functional indexes of prefix search compare text by pattern operator
+class on PostgreSQL.
+"""
+from django.contrib.postgres.indexes import OpClass
+from django.db.backends.signals import connection_created
+from django.db.models import Func
+from django.db.models.functions import Collate
+from django.db.models.indexes import IndexExpression
+
+SQLITE_UPPER_FUNCTION = "task_manager_upper"
+PATTERN_OPCLASS = "text_pattern_ops"
+
+
+class UnicodeUpper(Func):
+    """Upper-cased text, folding non-ASCII letters on SQLite too."""
+
+    function = "UPPER"
+    arity = 1
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        """Call Python function registered on the connection."""
+        return self.as_sql(
+            compiler,
+            connection,
+            function=SQLITE_UPPER_FUNCTION,
+            **extra_context,
+        )
+
+
+class PatternOpClass(OpClass):
+    """
+    Indexed expression compared with LIKE prefix patterns.
+
+    PostgreSQL uses indexes for LIKE prefix patterns only with pattern
+    operator class, unless the database uses C collation. Other
+    databases have no operator classes and index the expression as is.
+    """
+
+    def __init__(self, expression):
+        """Index the expression by pattern operator class."""
+        super().__init__(expression, name=PATTERN_OPCLASS)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        """Add operator class to the expression on PostgreSQL only."""
+        if connection.vendor == "postgresql":
+            return super().as_sql(compiler, connection, **extra_context)
+        return compiler.compile(self.get_source_expressions()[0])
+
+
+def upper(text):
+    """Return upper-cased text, None for NULL values."""
+    if text is None:
+        return None
+    return text.upper()
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """Register functions, used as connection_created signal receiver."""
+    if connection.vendor == "sqlite":
+        connection.connection.create_function(
+            SQLITE_UPPER_FUNCTION,
+            1,
+            upper,
+            deterministic=True,
+        )
+
+
+def register_index_wrappers():
+    """
+    Let PatternOpClass wrap indexed expressions, as OpClass does.
+
+    Expressions wrapped by operator class are put in parentheses, and
+    the operator class is put before collation, as in PostgreSQL syntax.
+    """
+    wrapper_classes = [
+        wrapper_class
+        for wrapper_class in IndexExpression.wrapper_classes
+        if wrapper_class is not PatternOpClass
+    ]
+    wrapper_classes.insert(wrapper_classes.index(Collate), PatternOpClass)
+    IndexExpression.register_wrappers(*wrapper_classes)
+
+
+def connect_signals():
+    """Connect receiver registering SQLite functions."""
+    connection_created.connect(
+        register_sqlite_functions,
+        dispatch_uid="task_manager_sqlite_functions",
+    )
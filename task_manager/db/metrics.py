@@ -0,0 +1,76 @@
+"""
+Metrics of database connection reuse.
+
+Every time Django sets up a connection for a thread it is counted as
+an acquired connection. Opened connections are the physical connections
+made to the database server. Without a pool they are the same, while
+the pooled backend reuses physical connections between acquisitions.
+Persistent connections (CONN_MAX_AGE) avoid acquiring a connection
+on every request altogether.
+"""
+import threading
+from collections import Counter
+
+from django.db.backends.signals import connection_created
+
+
+class ConnectionMetrics:
+    """Thread-safe counters of acquired and opened connections per alias."""
+
+    def __init__(self):
+        """Set up empty counters."""
+        self._lock = threading.Lock()
+        self.acquired = Counter()
+        self.opened = Counter()
+
+    def record_acquired(self, alias):
+        """Count connection set up by Django."""
+        with self._lock:
+            self.acquired[alias] += 1
+
+    def record_opened(self, alias):
+        """Count physical connection made to the database server."""
+        with self._lock:
+            self.opened[alias] += 1
+
+    def snapshot(self):
+        """Return counters of every database alias."""
+        with self._lock:
+            return {
+                alias: {
+                    "acquired": acquired,
+                    "opened": self.opened[alias],
+                    "reused": acquired - self.opened[alias],
+                }
+                for alias, acquired in self.acquired.items()
+            }
+
+    def total_acquired(self):
+        """Return number of connections acquired for all aliases."""
+        with self._lock:
+            return sum(self.acquired.values())
+
+    def reset(self):
+        """Reset all counters."""
+        with self._lock:
+            self.acquired.clear()
+            self.opened.clear()
+
+
+connection_metrics = ConnectionMetrics()
+
+
+def record_connection_created(sender, connection, **kwargs):
+    """Count connection, used as connection_created signal receiver."""
+    connection_metrics.record_acquired(connection.alias)
+    # Pooled backend counts physical connections itself
+    if not getattr(connection, "is_pooled", False):
+        connection_metrics.record_opened(connection.alias)
+
+
+def connect_signals():
+    """Connect connection metrics receiver."""
+    connection_created.connect(
+        record_connection_created,
+        dispatch_uid="task_manager_connection_metrics",
+    )
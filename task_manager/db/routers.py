@@ -0,0 +1,85 @@
+"""
+Routing of database reads to read replicas.
+
+Reads go to the primary database unless replica reads are allowed
+for the current context, so management commands, shell and tests are
+never affected by replication lag. ReplicaPinningMiddleware allows
+replica reads for safe requests to read-only views.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_replica_reads_allowed = ContextVar("replica_reads_allowed", default=False)
+# Spreads reads over replicas, not used for anything secret
+_replica_random = random.Random()
+
+
+def replica_reads_allowed():
+    """Check if reads of the current context may go to replicas."""
+    return _replica_reads_allowed.get()
+
+
+def allow_replica_reads(allowed=True):
+    """Allow or forbid replica reads, return token to restore the state."""
+    return _replica_reads_allowed.set(allowed)
+
+
+def restore_replica_reads(token):
+    """Restore replica reads state saved in the token."""
+    _replica_reads_allowed.reset(token)
+
+
+@contextmanager
+def use_replicas(allowed=True):
+    """Allow or forbid replica reads inside the block."""
+    token = allow_replica_reads(allowed)
+    try:
+        yield
+    finally:
+        restore_replica_reads(token)
+
+
+def get_replica_aliases():
+    """Return aliases of configured read replicas."""
+    return getattr(settings, "REPLICA_DATABASES", [])
+
+
+class ReplicaRouter:
+    """
+    Send reads to random replica when allowed, everything else to primary.
+
+    Reads inside a transaction on the primary stay on the primary,
+    so they see the writes of the transaction.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Return database to read model from."""
+        replicas = get_replica_aliases()
+        if not replicas or not replica_reads_allowed():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return _replica_random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        """Return database to write model to."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations between objects from primary and replicas."""
+        databases = {DEFAULT_DB_ALIAS, *get_replica_aliases()}
+        # Routers read the database of objects from their model state
+        object_databases = {obj1._state.db, obj2._state.db}  # noqa: WPS437
+        if object_databases <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Migrate only primary, replicas get schema by replication."""
+        if db in get_replica_aliases():
+            return False
+        return None
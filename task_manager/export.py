@@ -0,0 +1,103 @@
+"""
+Streaming export of tasks.
+
+Tasks are read as value tuples with a server-side cursor
+(`iterator(chunk_size=...)`) joining status, creator and performer.
+Labels are queried once per chunk of tasks, so the number of queries
+grows with the number of chunks, not tasks, and memory use stays
+bounded by the chunk size whatever the number of exported tasks.
+"""
+import csv
+import itertools
+import json
+from collections import defaultdict
+
+from task_manager.models import Task
+
+EXPORT_CHUNK_SIZE = 2000
+CREATED_ON_COLUMN = "created_on"
+# Exported column names and task field lookups
+EXPORT_FIELDS = (
+    ("id", "id"),
+    ("name", "name"),
+    ("description", "description"),
+    ("status", "status__name"),
+    ("creator", "creator__username"),
+    ("performer", "performer__username"),
+    (CREATED_ON_COLUMN, CREATED_ON_COLUMN),
+)
+EXPORT_COLUMNS = tuple(name for name, _ in EXPORT_FIELDS) + ("labels",)
+CSV_LABELS_SEPARATOR = ", "
+# Characters of label names quoted in CSV cells of labels
+CSV_QUOTED_CHARACTERS = frozenset(',"\r\n')
+
+
+def get_labels_by_task(task_ids):
+    """Return dict of task id to sorted label names of the tasks."""
+    labels = defaultdict(list)
+    task_labels = Task.label.through.objects.filter(task_id__in=task_ids)
+    ordered = task_labels.order_by("task_id", "label__name")
+    for task_id, label_name in ordered.values_list("task_id", "label__name"):
+        labels[task_id].append(label_name)
+    return labels
+
+
+def iter_task_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield exported tasks as dicts of column values."""
+    lookups = [lookup for _, lookup in EXPORT_FIELDS]
+    rows = queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        labels = get_labels_by_task([row[0] for row in chunk])
+        for row in chunk:
+            task = dict(zip(EXPORT_COLUMNS, row))
+            task["labels"] = labels.get(row[0], [])
+            yield task
+
+
+def quote_label_name(label_name):
+    """Quote the label name like a CSV field if it has separators."""
+    if CSV_QUOTED_CHARACTERS.isdisjoint(label_name):
+        return label_name
+    escaped = label_name.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def join_label_names(label_names):
+    """Return CSV cell of label names, split back by tasks import."""
+    return CSV_LABELS_SEPARATOR.join(
+        quote_label_name(label_name) for label_name in label_names
+    )
+
+
+class EchoBuffer:
+    """File-like object returning written value, used with csv.writer."""
+
+    def write(self, written):
+        """Return written value instead of storing it."""
+        return written
+
+
+def format_created_on(task):
+    """Replace creation time of the exported task with ISO string."""
+    task[CREATED_ON_COLUMN] = task[CREATED_ON_COLUMN].isoformat()
+
+
+def iter_csv_lines(tasks):
+    """Yield CSV lines of header and tasks."""
+    writer = csv.writer(EchoBuffer())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for task in tasks:
+        format_created_on(task)
+        task["labels"] = join_label_names(task["labels"])
+        yield writer.writerow([task[column] for column in EXPORT_COLUMNS])
+
+
+def iter_ndjson_lines(tasks):
+    """Yield a JSON object line per task."""
+    for task in tasks:
+        format_created_on(task)
+        line = json.dumps(task, ensure_ascii=False)
+        yield f"{line}\n"
@@ -1,27 +1,40 @@
 import django_filters
+from django import forms
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
-from task_manager.forms import TaskFilterForm
+from task_manager.cache import STATUSES_NAMESPACE
+from task_manager.forms import TaskFilterForm, ToggleOnlyOwnTasks
 from task_manager.models import Label, SiteUser, Status, Task
+from task_manager.search import SEARCH_RANK
+from task_manager.widgets import AutocompleteSelect, CachedSelect
 
 
 class TaskFilter(django_filters.FilterSet):
     """Task list filter."""
 
+    search = django_filters.CharFilter(
+        label="",
+        method="filter_search",
+        widget=forms.TextInput(attrs={"placeholder": _("Search")}),
+    )
     status = django_filters.ModelChoiceFilter(
         label="",
         empty_label=_("Select status"),
         queryset=Status.objects.all(),
+        widget=CachedSelect(STATUSES_NAMESPACE),
     )
     performer = django_filters.ModelChoiceFilter(
         label="",
         empty_label=_("Select performer"),
         queryset=SiteUser.objects.all(),
+        widget=AutocompleteSelect(reverse_lazy("user_autocomplete")),
     )
     label = django_filters.ModelChoiceFilter(
         label="",
         empty_label=_("Select label"),
         queryset=Label.objects.all(),
+        widget=AutocompleteSelect(reverse_lazy("label_autocomplete")),
     )
 
     class Meta:
@@ -29,7 +42,53 @@ class TaskFilter(django_filters.FilterSet):
         form = TaskFilterForm
 
         fields = [
+            "search",
             "status",
             "performer",
             "label",
         ]
+
+    def filter_search(self, queryset, name, search_text):
+        """Filter tasks by words of name and description."""
+        return queryset.search(search_text)
+
+
+class TaskListFilter:
+    """
+    Filtering pipeline of the tasks list.
+
+    Applies "only own tasks" toggle and TaskFilter to the tasks queryset.
+    Built once per request and shared by the list view, its paginator
+    and the template, so filter forms are bound and validated only once.
+    """
+
+    def __init__(self, query_params, user, queryset=None):
+        """Bind filter forms to request GET params, filter the queryset."""
+        if queryset is None:
+            queryset = Task.objects.for_list()
+        self.toggle_self_tasks = ToggleOnlyOwnTasks(query_params)
+        self.self_tasks = query_params.get("self_tasks", None) == "on"
+        if self.self_tasks:
+            queryset = queryset.filter(creator=user)
+        self.filterset = TaskFilter(query_params, queryset)
+
+    @property
+    def form(self):
+        """Return bound task filter form."""
+        return self.filterset.form
+
+    @property
+    def is_search(self):
+        """Check if tasks are searched, i.e. annotated with search rank."""
+        return SEARCH_RANK in self.queryset.query.annotations
+
+    def rank_ordering(self, ordering):
+        """Return the ordering preceded by relevance if tasks are searched."""
+        if self.is_search:
+            return (f"-{SEARCH_RANK}", *ordering)
+        return ordering
+
+    @property
+    def queryset(self):
+        """Return tasks queryset with all filters applied."""
+        return self.filterset.qs
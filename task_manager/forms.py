@@ -8,13 +8,75 @@ from django.contrib.auth.forms import (
     UserChangeForm,
     UserCreationForm,
 )
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.utils.html import format_html
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
-from task_manager.models import SiteUser, Task
+from task_manager.cache import STATUSES_NAMESPACE
+from task_manager.models import Label, SiteUser, Status, Task
+from task_manager.widgets import (
+    AutocompleteSelect,
+    AutocompleteSelectMultiple,
+    CachedSelect,
+)
+
+# Form helpers shared by forms of a class, keyed by class and language
+_form_helpers = {}
+
+
+def clear_form_helpers():
+    """Drop form helpers built so far."""
+    _form_helpers.clear()
+
+
+def _helper_owner(form_class):
+    """
+    Return the class defining `build_helper` of the form class.
+
+    Helpers are shared by subclasses created on the fly (i.e. form
+    classes of filtersets, created per filterset), so the cache doesn't
+    grow with every created class.
+    """
+    for klass in form_class.__mro__:
+        if "build_helper" in klass.__dict__:
+            return klass
+    raise TypeError(f"{form_class.__name__} doesn't define build_helper")
+
+
+class StaticHTML(HTML):
+    """
+    HTML snippet of a form layout rendered once, when the layout is built.
+
+    Unlike `HTML`, it is not compiled as a template on every render.
+    """
+
+    def render(self, *args, **kwargs):
+        """Return the snippet."""
+        return self.html
+
+
+class CachedHelperMixin:
+    """
+    Build helper and layout of the form once per class and language.
 
+    Form classes define classmethod `build_helper` returning the helper,
+    which is reused by all forms of the class and its subclasses, so only
+    fields of the form are rendered per request. Built helpers must not
+    depend on the form instance.
+    """
 
-class LoginForm(AuthenticationForm):
+    @property
+    def helper(self):
+        """Return form helper of the class for the current language."""
+        key = (_helper_owner(type(self)), get_language())
+        helper = _form_helpers.get(key)
+        if helper is None:
+            helper = _form_helpers.setdefault(key, self.build_helper())
+        return helper
+
+
+class LoginForm(CachedHelperMixin, AuthenticationForm):
     """Login form."""
 
     class Meta(UserCreationForm.Meta):
@@ -24,15 +86,15 @@ class LoginForm(AuthenticationForm):
             "password",
         ]
 
-    def __init__(self, *args, **kwargs):
-        """Set up form layout."""
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = "POST"
-        self.helper.form_class = "form-horizontal"
-        self.helper.field_class = "col-lg-4 col-md-6"
-        self.helper.form_show_labels = False
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        """Return form helper with layout of the form."""
+        helper = FormHelper()
+        helper.form_method = "POST"
+        helper.form_class = "form-horizontal"
+        helper.field_class = "col-lg-4 col-md-6"
+        helper.form_show_labels = False
+        helper.layout = Layout(
             Field("username", placeholder=_("Username")),
             Field("password", placeholder=_("Password")),
             Submit(
@@ -41,9 +103,10 @@ class LoginForm(AuthenticationForm):
                 css_class="btn btn-primary ml-0 mt-2",
             ),
         )
+        return helper
 
 
-class SiteUserCreationForm(UserCreationForm):
+class SiteUserCreationForm(CachedHelperMixin, UserCreationForm):
     """Signup form."""
 
     class Meta(UserCreationForm.Meta):
@@ -56,15 +119,15 @@ class SiteUserCreationForm(UserCreationForm):
             "password2",
         ]
 
-    def __init__(self, *args, **kwargs):
-        """Set up form layout."""
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = "POST"
-        self.helper.form_class = "form-horizontal"
-        self.helper.field_class = "col-lg-6 col-md-8"
-        self.helper.form_show_labels = False
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        """Return form helper with layout of the form."""
+        helper = FormHelper()
+        helper.form_method = "POST"
+        helper.form_class = "form-horizontal"
+        helper.field_class = "col-lg-6 col-md-8"
+        helper.form_show_labels = False
+        helper.layout = Layout(
             Field("username", placeholder=_("Username")),
             Field("first_name", placeholder=_("First name")),
             Field("last_name", placeholder=_("Last name")),
@@ -76,9 +139,10 @@ class SiteUserCreationForm(UserCreationForm):
                 css_class="btn btn-primary mt-2",
             ),
         )
+        return helper
 
 
-class SiteUserChangeForm(UserChangeForm):
+class SiteUserChangeForm(CachedHelperMixin, UserChangeForm):
     """User change form."""
 
     class Meta(UserChangeForm.Meta):
@@ -89,37 +153,38 @@ class SiteUserChangeForm(UserChangeForm):
             "last_name",
         ]
 
-    def __init__(self, *args, **kwargs):
-        """Set up form layout."""
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = "POST"
-        self.helper.form_class = "form-horizontal"
-        self.helper.field_class = "col-lg-4 col-md-6"
-        self.helper.label_class = "col-lg-2"
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        """Return form helper with layout of the form."""
+        helper = FormHelper()
+        helper.form_method = "POST"
+        helper.form_class = "form-horizontal"
+        helper.field_class = "col-lg-4 col-md-6"
+        helper.label_class = "col-lg-2"
+        helper.layout = Layout(
             Field("username", placeholder=_("Enter new username")),
             Field("first_name", placeholder=_("Enter new first name")),
             Field("last_name", placeholder=_("Enter new last name")),
         )
+        return helper
 
 
-class SitePasswordChangeForm(PasswordChangeForm):
+class SitePasswordChangeForm(CachedHelperMixin, PasswordChangeForm):
     """Password change form."""
 
     class Meta(PasswordChangeForm):
         model = SiteUser
         fields = ["old_password", "new_password1", "new_password2"]
 
-    def __init__(self, user, *args, **kwargs):
-        """Set up form layout."""
-        super().__init__(user, *args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = "POST"
-        self.helper.form_class = "form-horizontal"
-        self.helper.field_class = "col-lg-6 col-md-8"
-        self.helper.form_show_labels = False
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        """Return form helper with layout of the form."""
+        helper = FormHelper()
+        helper.form_method = "POST"
+        helper.form_class = "form-horizontal"
+        helper.field_class = "col-lg-6 col-md-8"
+        helper.form_show_labels = False
+        helper.layout = Layout(
             Field("old_password", placeholder=_("Old password")),
             Field("new_password1", placeholder=_("New password")),
             Field(
@@ -133,21 +198,29 @@ class SitePasswordChangeForm(PasswordChangeForm):
                 css_class="btn btn-primary",
             ),
         )
+        return helper
 
 
-class TaskEditForm(forms.ModelForm):
+class TaskEditForm(CachedHelperMixin, forms.ModelForm):
     """Form for creation or edit of the task."""
 
     class Meta:
         model = Task
         fields = ("name", "description", "status", "performer", "label")
+        widgets = {
+            "status": CachedSelect(STATUSES_NAMESPACE),
+            "performer": AutocompleteSelect(reverse_lazy("user_autocomplete")),
+            "label": AutocompleteSelectMultiple(
+                reverse_lazy("label_autocomplete"),
+            ),
+        }
 
-    def __init__(self, *args, **kwargs):
-        """Set up form layout."""
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = "POST"
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        """Return form helper with layout of the form."""
+        helper = FormHelper()
+        helper.form_method = "POST"
+        helper.layout = Layout(
             Field("name"),
             Field("description"),
             Row(
@@ -160,17 +233,18 @@ class TaskEditForm(forms.ModelForm):
                 required=False,
             ),
             Submit("submit", _("Save"), css_class="btn btn-primary"),
-            HTML(
-                f"""
-                <a class="btn btn-outline-primary" href="{reverse_lazy('tasks')}">
-                    {_('Return to tasks list')}
-                </a>
-                """,
+            StaticHTML(
+                format_html(
+                    '<a class="btn btn-outline-primary" href="{0}">{1}</a>',
+                    reverse("tasks"),
+                    _("Return to tasks list"),
+                ),
             ),
         )
+        return helper
 
 
-class TaskFilterForm(forms.ModelForm):
+class TaskFilterForm(CachedHelperMixin, forms.ModelForm):
     """Form for filtering tasks list."""
 
     class Meta:
@@ -181,15 +255,19 @@ class TaskFilterForm(forms.ModelForm):
             "label",
         ]
 
-    def __init__(self, *args, **kwargs):
-        """Control form attributes and its layout."""
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_class = "form-inline center"
-        self.helper.form_tag = False
-        self.helper.form_method = "GET"
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        """Return form helper with layout of the form."""
+        helper = FormHelper()
+        helper.form_class = "form-inline center"
+        helper.form_tag = False
+        helper.form_method = "GET"
+        helper.layout = Layout(
             Row(
+                InlineField(
+                    "search",
+                    css_class="mt-2 mr-2",
+                ),
                 InlineField(
                     "status",
                     css_class="mt-2 mr-2",
@@ -208,20 +286,22 @@ class TaskFilterForm(forms.ModelForm):
                         type="submit",
                         css_class="btn btn-primary mt-2 mr-2",
                     ),
-                    HTML(
-                        f"""
-                    <a class="btn btn-outline-primary mt-2 mr-2" href="{reverse_lazy('tasks')}">
-                        {_('Clear filters')}
-                    </a>
-                    """,
+                    StaticHTML(
+                        format_html(
+                            '<a class="btn btn-outline-primary mt-2 mr-2" '
+                            'href="{0}">{1}</a>',
+                            reverse("tasks"),
+                            _("Clear filters"),
+                        ),
                     ),
                 ),
                 css_class="row col-12",
             ),
         )
+        return helper
 
 
-class ToggleOnlyOwnTasks(forms.Form):
+class ToggleOnlyOwnTasks(CachedHelperMixin, forms.Form):
     """Checkbox for showing only own tasks in tasks list."""
 
     self_tasks = forms.BooleanField(
@@ -230,16 +310,126 @@ class ToggleOnlyOwnTasks(forms.Form):
         required=False,
     )
 
-    def __init__(self, *args, **kwargs):
-        """Control form attributes and its layout."""
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_class = "form-inline"
-        self.helper.form_tag = False
-        self.helper.form_method = "GET"
-        self.helper.layout = Layout(
+    @classmethod
+    def build_helper(cls):
+        """Return form helper with layout of the form."""
+        helper = FormHelper()
+        helper.form_class = "form-inline"
+        helper.form_tag = False
+        helper.form_method = "GET"
+        helper.layout = Layout(
             Row(
                 InlineField("self_tasks", css_class="form-group"),
                 css_class="mb-2 pl-3",
             ),
         )
+        return helper
+
+
+class IdListField(forms.Field):
+    """Field of integer ids submitted as multiple values."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        "invalid": _("Enter a list of ids."),
+    }
+
+    # Argument of Field.to_python() as named by Django
+    def to_python(self, value):  # noqa: WPS110
+        """Return list of ids as integers."""
+        if not value:
+            return []
+        try:
+            return [int(submitted_id) for submitted_id in value]
+        except (TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages["invalid"],
+                "invalid",
+            )
+
+
+class TaskBulkActionForm(CachedHelperMixin, forms.Form):
+    """
+    Form of an action applied to many tasks of the tasks list.
+
+    Tasks are selected by ids or, with `select_all`, are all tasks
+    matching the filters of the list.
+    """
+
+    # Fields are prefixed to not clash with the filters on the same page
+    prefix = "bulk"
+    # Actions setting a value are named after the field holding it
+    value_actions = ("status", "performer", "labels")
+
+    action = forms.ChoiceField(
+        label="",
+        choices=(
+            ("status", _("Change status")),
+            ("performer", _("Change performer")),
+            ("labels", _("Add labels")),
+            ("delete", _("Delete")),
+        ),
+    )
+    ids = IdListField(required=False)
+    select_all = forms.BooleanField(
+        label=_("All tasks matching the filters"),
+        required=False,
+    )
+    status = forms.ModelChoiceField(
+        label="",
+        empty_label=_("Select status"),
+        queryset=Status.objects.all(),
+        required=False,
+        widget=CachedSelect(STATUSES_NAMESPACE),
+    )
+    performer = forms.ModelChoiceField(
+        label="",
+        empty_label=_("Select performer"),
+        queryset=SiteUser.objects.all(),
+        required=False,
+        widget=AutocompleteSelect(reverse_lazy("user_autocomplete")),
+    )
+    labels = forms.ModelMultipleChoiceField(
+        label="",
+        queryset=Label.objects.all(),
+        required=False,
+        widget=AutocompleteSelectMultiple(
+            reverse_lazy("label_autocomplete"),
+        ),
+    )
+
+    @classmethod
+    def build_helper(cls):
+        """Return form helper with layout of the form."""
+        helper = FormHelper()
+        helper.form_class = "form-inline"
+        helper.form_tag = False
+        helper.form_method = "POST"
+        helper.layout = Layout(
+            Row(
+                InlineField("action", css_class="mt-2 mr-2"),
+                InlineField("status", css_class="mt-2 mr-2"),
+                InlineField("performer", css_class="mt-2 mr-2"),
+                InlineField("labels", css_class="mt-2 mr-2"),
+                InlineField("select_all", css_class="mt-2 mr-2"),
+                FormActions(
+                    StrictButton(
+                        _("Apply to selected"),
+                        type="submit",
+                        css_class="btn btn-outline-primary mt-2 mr-2",
+                    ),
+                ),
+                css_class="row col-12",
+            ),
+        )
+        return helper
+
+    def clean(self):
+        """Check that tasks are selected and the action value is set."""
+        cleaned_data = super().clean()
+        if not cleaned_data.get("ids") and not cleaned_data.get("select_all"):
+            self.add_error(None, _("Select tasks to apply the action to."))
+        action = cleaned_data.get("action")
+        if action in self.value_actions and not cleaned_data.get(action):
+            self.add_error(action, _("Choose the value to set."))
+        return cleaned_data
@@ -0,0 +1,115 @@
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.test import RequestFactory
+
+from task_manager.filters import TaskFilter
+from task_manager.forms import (
+    LoginForm,
+    SitePasswordChangeForm,
+    SiteUserChangeForm,
+    SiteUserCreationForm,
+    TaskBulkActionForm,
+    TaskEditForm,
+    ToggleOnlyOwnTasks,
+    clear_form_helpers,
+)
+from task_manager.management.commands.benchmark_views import (
+    get_benchmark_user,
+)
+from task_manager.models import Task
+from task_manager.utils.benchmark import benchmark_database, measure_form
+from task_manager.utils.seeding import create_pools
+
+# Number of constructed and rendered forms by default
+DEFAULT_ITERATIONS = 200
+FORM_TEMPLATE = "{% load crispy_forms_tags %}{% crispy form %}"
+# Forms of task manager built from request of the page showing them
+FORM_FACTORIES = {  # noqa: WPS407
+    "login": LoginForm,
+    "signup": lambda request: SiteUserCreationForm(),
+    "user_update": lambda request: SiteUserChangeForm(
+        instance=request.user,
+    ),
+    "password_change": lambda request: SitePasswordChangeForm(request.user),
+    "task_edit": lambda request: TaskEditForm(),
+    "task_filter": lambda request: TaskFilter(
+        request.GET,
+        Task.objects.none(),
+    ).form,
+    "toggle_self_tasks": lambda request: ToggleOnlyOwnTasks(request.GET),
+    "task_bulk": lambda request: TaskBulkActionForm(),
+}
+# Form name, build and render times with helpers built per form and cached
+TIMES_FORMAT = "{0}: build {1} -> {2}ms, render {3} -> {4}ms"
+
+
+class Command(BaseCommand):
+    """Benchmark forms with helpers built per form and cached."""
+
+    help = (
+        "Compares construction and render time of forms building "
+        "their helpers and layouts for every form and reusing helpers "
+        "built once per class and language"
+    )
+
+    def add_arguments(self, parser):
+        """Add measurement and database options."""
+        parser.add_argument(
+            "--iterations",
+            default=DEFAULT_ITERATIONS,
+            type=int,
+            help="Number of constructed and rendered forms (default=200)",
+        )
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help=(
+                "Render forms on the configured database instead of "
+                "a temporary test database"
+            ),
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Benchmark every form and write the comparison."""
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be positive")
+        with benchmark_database(options["use_current_db"]):
+            form_times = self.run_benchmarks(options["iterations"])
+        for form_name, (uncached, cached) in form_times.items():
+            self.stdout.write(
+                TIMES_FORMAT.format(
+                    form_name,
+                    uncached["build_ms"],
+                    cached["build_ms"],
+                    uncached["render_ms"],
+                    cached["render_ms"],
+                ),
+            )
+
+    def run_benchmarks(self, iterations):
+        """Measure every form with helpers built per form and cached."""
+        if not Task.objects.exists():
+            create_pools(num_users=10, num_statuses=5, num_labels=10)
+        page_request = RequestFactory().get("/")
+        page_request.user = get_benchmark_user()
+        template = engines["django"].from_string(FORM_TEMPLATE)
+
+        def render_form(form):  # noqa: WPS430
+            return template.render({"form": form}, page_request)
+
+        form_times = {}
+        for form_name, factory in FORM_FACTORIES.items():
+            build_form = partial(factory, page_request)
+            # Warm up querysets and templates used by the form
+            render_form(build_form())
+            uncached = measure_form(
+                build_form,
+                render_form,
+                iterations,
+                setup=clear_form_helpers,
+            )
+            cached = measure_form(build_form, render_form, iterations)
+            form_times[form_name] = (uncached, cached)
+        return form_times
@@ -0,0 +1,190 @@
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from task_manager.management.commands.benchmark_views import (
+    BENCHMARK_LABELS,
+    add_database_arguments,
+    get_benchmark_user,
+    get_environment_meta,
+)
+from task_manager.models import Task
+from task_manager.utils.benchmark import (
+    async_views,
+    benchmark_database,
+    route_url,
+    simulated_db_latency,
+)
+from task_manager.utils.seeding import TaskSeeder, create_pools
+from task_manager.utils.serving import run_asgi_load, run_wsgi_load
+
+# Read-heavy routes served by async views in async mode
+DEFAULT_ROUTES = "tasks,task_detail,users,statuses,labels"
+WSGI_MODE = "wsgi"
+ASGI_MODE = "asgi"
+DEFAULT_REQUESTS = 200
+DEFAULT_CONCURRENCY = 32
+DEFAULT_DB_LATENCY_MS = 20
+MS_PER_SECOND = 1000
+# Options of the load, written to the report
+LOAD_OPTIONS = ("requests", "concurrency", "workers")
+POSITIVE_OPTIONS = ("tasks", *LOAD_OPTIONS)
+
+
+def get_load_runner(mode, cookie, options):
+    """Return function serving requests to url by deployment of the mode."""
+    concurrency = options["concurrency"]
+    if mode == WSGI_MODE:
+        return partial(
+            run_wsgi_load,
+            concurrency=concurrency,
+            workers=options["workers"],
+            cookie=cookie,
+        )
+    return partial(run_asgi_load, concurrency=concurrency, cookie=cookie)
+
+
+def get_report_meta(options):
+    """Return description of the benchmark environment and load."""
+    return {
+        **get_environment_meta(),
+        "tasks": Task.objects.count(),
+        "db_latency_ms": options["db_latency"],
+        **{option: options[option] for option in LOAD_OPTIONS},
+    }
+
+
+class Command(BaseCommand):
+    """Compare serving of read-heavy views by WSGI and ASGI workers."""
+
+    help = (
+        "Compares throughput and tail latency of read-heavy views served "
+        "by sync WSGI workers and by an ASGI worker with async views, "
+        "under the same simulated database latency"
+    )
+
+    def add_arguments(self, parser):
+        """Add dataset, load and report options."""
+        parser.add_argument(
+            "--tasks",
+            default=1000,
+            type=int,
+            help="Number of tasks in benchmark dataset (default=1000)",
+        )
+        parser.add_argument(
+            "--requests",
+            default=DEFAULT_REQUESTS,
+            type=int,
+            help="Number of measured requests per route (default=200)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            default=DEFAULT_CONCURRENCY,
+            type=int,
+            help="Number of clients sending requests at once (default=32)",
+        )
+        parser.add_argument(
+            "--workers",
+            default=4,
+            type=int,
+            help="Number of sync WSGI workers (default=4)",
+        )
+        parser.add_argument(
+            "--db-latency",
+            default=DEFAULT_DB_LATENCY_MS,
+            type=float,
+            help="Delay added to every SQL query, in ms (default=20)",
+        )
+        parser.add_argument(
+            "--routes",
+            default=DEFAULT_ROUTES,
+            help=f"Comma-separated route names (default: {DEFAULT_ROUTES})",
+        )
+        parser.add_argument(
+            "--output",
+            default="serving_benchmark.json",
+            help="Path of JSON report (default=serving_benchmark.json)",
+        )
+        add_database_arguments(parser)
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Benchmark both modes, write the report and compare them."""
+        for option in POSITIVE_OPTIONS:
+            if options[option] < 1:
+                raise CommandError(f"--{option} must be positive")
+        with benchmark_database(options["use_current_db"], options["keepdb"]):
+            report = self.run_benchmarks(options)
+        with open(options["output"], "w") as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+        self.compare(report)
+        self.stdout.write(
+            self.style.SUCCESS(f"Report written to {options['output']}"),
+        )
+
+    def run_benchmarks(self, options):
+        """Seed the dataset and serve the routes in both modes."""
+        missing = options["tasks"] - Task.objects.count()
+        if missing > 0:
+            pools = create_pools(
+                num_users=100,
+                num_statuses=10,
+                num_labels=BENCHMARK_LABELS,
+            )
+            TaskSeeder(pools).seed_tasks(missing)
+        client = Client()
+        client.force_login(get_benchmark_user())
+        cookie = "{0}={1}".format(
+            settings.SESSION_COOKIE_NAME,
+            client.session.session_key,
+        )
+        task_pk = Task.objects.order_by("pk").values_list("pk", flat=True)[0]
+        urls = {
+            route_name: route_url(
+                route_name,
+                task_pk if route_name == "task_detail" else None,
+            )
+            for route_name in options["routes"].split(",")
+        }
+        report = {"meta": get_report_meta(options), "results": {}}
+        with simulated_db_latency(options["db_latency"] / MS_PER_SECOND):
+            for mode in (WSGI_MODE, ASGI_MODE):
+                with async_views(enabled=mode == ASGI_MODE):
+                    report["results"][mode] = self.serve_routes(
+                        get_load_runner(mode, cookie, options),
+                        urls,
+                        options["requests"],
+                    )
+        return report
+
+    def serve_routes(self, run_load, urls, num_requests):
+        """Serve every route with the load runner, return its results."""
+        route_results = {}
+        for route_name, url in urls.items():
+            # Warm up connections and caches of the mode
+            run_load(url, 1)
+            route_results[route_name] = run_load(url, num_requests)
+        return route_results
+
+    def compare(self, report):
+        """Write results of both modes side by side."""
+        wsgi_results = report["results"][WSGI_MODE]
+        asgi_results = report["results"][ASGI_MODE]
+        for route_name, wsgi_result in wsgi_results.items():
+            asgi_result = asgi_results[route_name]
+            self.stdout.write(
+                "{0}: {1} -> {2} rps, p95 {3} -> {4}ms, "
+                "p99 {5} -> {6}ms, errors {7} -> {8}".format(
+                    route_name,
+                    wsgi_result["throughput_rps"],
+                    asgi_result["throughput_rps"],
+                    wsgi_result["p95_ms"],
+                    asgi_result["p95_ms"],
+                    wsgi_result["p99_ms"],
+                    asgi_result["p99_ms"],
+                    wsgi_result["errors"],
+                    asgi_result["errors"],
+                ),
+            )
@@ -0,0 +1,285 @@
+import json
+import platform
+from datetime import datetime, timezone
+from functools import partial
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from task_manager.models import Label, SiteUser, Status, Task
+from task_manager.utils.benchmark import (
+    BENCHMARK_USERNAME,
+    REGRESSION_THRESHOLD,
+    benchmark_database,
+    compare_reports,
+    discover_routes,
+    measure_url,
+    route_url,
+)
+from task_manager.utils.seeding import TaskSeeder, create_pools
+
+# Number of measured requests per route by default
+DEFAULT_ITERATIONS = 20
+# Number of labels referenced by benchmark tasks
+BENCHMARK_LABELS = 50
+MEASUREMENTS_FORMAT = (
+    "p50={p50_ms}ms p95={p95_ms}ms p99={p99_ms}ms "
+    "queries={queries} connects={connects} peak={peak_memory_kib}KiB"
+)
+# Dataset size, route name, metric, baseline and current values
+REGRESSION_FORMAT = "{0} tasks {1}: {2} {3} -> {4}"
+
+
+def add_dataset_arguments(parser):
+    """Add options of benchmark datasets."""
+    parser.add_argument(
+        "--sizes",
+        default="1000,100000,1000000",
+        help="Comma-separated numbers of tasks in benchmark datasets",
+    )
+    parser.add_argument(
+        "--workers",
+        default=1,
+        type=int,
+        help="Number of processes seeding the datasets",
+    )
+    add_database_arguments(parser)
+
+
+def add_database_arguments(parser):
+    """Add options of the database benchmarks run on."""
+    parser.add_argument(
+        "--use-current-db",
+        action="store_true",
+        help=(
+            "Seed and benchmark the configured database instead of "
+            "a temporary test database"
+        ),
+    )
+    parser.add_argument(
+        "--keepdb",
+        action="store_true",
+        help="Keep temporary test database between runs",
+    )
+
+
+def add_report_arguments(parser):
+    """Add options of JSON report and comparison with a baseline."""
+    parser.add_argument(
+        "--output",
+        default="benchmark.json",
+        help="Path of JSON report (default=benchmark.json)",
+    )
+    parser.add_argument(
+        "--compare",
+        required=False,
+        help="Path of baseline JSON report to compare results with",
+    )
+    parser.add_argument(
+        "--threshold",
+        default=REGRESSION_THRESHOLD,
+        type=float,
+        help="p95 growth ratio reported as regression (default=1.2)",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with error if regressions are found",
+    )
+
+
+def parse_sizes(sizes):
+    """Parse comma-separated dataset sizes."""
+    try:
+        parsed = sorted(int(size) for size in sizes.split(","))
+    except ValueError:
+        raise CommandError(f"Invalid dataset sizes: {sizes}")
+    if not parsed or parsed[0] < 1:
+        raise CommandError("Dataset sizes must be positive")
+    return parsed
+
+
+def get_benchmark_user():
+    """Return superuser used to access every page."""
+    user, _ = SiteUser.objects.get_or_create(
+        username=BENCHMARK_USERNAME,
+        defaults={"is_superuser": True, "is_staff": True},
+    )
+    return user
+
+
+def get_route_objects(user):
+    """
+    Return primary keys of objects passed to routes needing pk.
+
+    Task and label are created for the benchmark, so that deletion
+    pages are shown instead of redirecting with permission error.
+    """
+    label = Label.objects.filter(name=BENCHMARK_USERNAME).first()
+    if label is None:
+        label = Label.objects.create(name=BENCHMARK_USERNAME)
+    task = Task.objects.filter(creator=user).first()
+    if task is None:
+        task = Task.objects.create(
+            name=BENCHMARK_USERNAME,
+            description=BENCHMARK_USERNAME,
+            creator=user,
+            performer=user,
+            status=Status.objects.order_by("pk").first(),
+        )
+    return {
+        "task": task.pk,
+        "user": user.pk,
+        "status": Status.objects.order_by("pk").first().pk,
+        "label": label.pk,
+    }
+
+
+def route_model(route_name):
+    """Return model key of object passed to the route."""
+    if route_name == "password_change":
+        return "user"
+    return route_name.split("_")[0]
+
+
+def get_route_urls(routes, user):
+    """Return route names and urls of the routes, for objects of user."""
+    route_objects = get_route_objects(user)
+    route_urls = []
+    for route_name, needs_pk in routes:
+        pk = route_objects[route_model(route_name)] if needs_pk else None
+        route_urls.append((route_name, route_url(route_name, pk)))
+    return route_urls
+
+
+def get_environment_meta():
+    """Return description of the benchmark environment."""
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "django": django.get_version(),
+        "python": platform.python_version(),
+        "database": connection.vendor,
+    }
+
+
+def get_report_meta(options):
+    """Return description of the environment and measurements."""
+    return {
+        **get_environment_meta(),
+        "iterations": options["iterations"],
+        "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+        "pooled": getattr(connection, "is_pooled", False),
+    }
+
+
+class Command(BaseCommand):
+    """Benchmark every route on datasets of growing size."""
+
+    help = (
+        "Benchmarks every route of task manager on datasets of given sizes "
+        "and writes latency, query count and memory report as JSON"
+    )
+
+    def add_arguments(self, parser):
+        """Add dataset, measurement and report options."""
+        add_dataset_arguments(parser)
+        parser.add_argument(
+            "--iterations",
+            default=DEFAULT_ITERATIONS,
+            type=int,
+            help="Number of measured requests per route (default=20)",
+        )
+        parser.add_argument(
+            "--warmup",
+            default=2,
+            type=int,
+            help="Number of warm-up requests per route (default=2)",
+        )
+        parser.add_argument(
+            "--routes",
+            required=False,
+            help="Comma-separated route names to benchmark (default: all)",
+        )
+        add_report_arguments(parser)
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Benchmark routes, write the report and compare it if asked."""
+        sizes = parse_sizes(options["sizes"])
+        routes = discover_routes()
+        if options["routes"]:
+            selected = set(options["routes"].split(","))
+            routes = [route for route in routes if route[0] in selected]
+        with benchmark_database(options["use_current_db"], options["keepdb"]):
+            report = self.run_benchmarks(sizes, routes, options)
+        with open(options["output"], "w") as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+        self.stdout.write(
+            self.style.SUCCESS(f"Report written to {options['output']}"),
+        )
+        if options["compare"]:
+            self.compare(report, options)
+
+    def run_benchmarks(self, sizes, routes, options):
+        """Grow dataset to every size and benchmark routes on it."""
+        user = get_benchmark_user()
+        client = Client()
+        client.force_login(user)
+        pools = create_pools(
+            num_users=100,
+            num_statuses=10,
+            num_labels=BENCHMARK_LABELS,
+        )
+        seeder = TaskSeeder(
+            pools,
+            use_copy=connection.vendor == "postgresql",
+        )
+        measure = partial(
+            measure_url,
+            client,
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+        )
+        report = {"meta": get_report_meta(options), "results": {}}
+        for size in sizes:
+            self.seed_dataset(seeder, size, options["workers"])
+            report["results"][str(size)] = {
+                route_name: self.measure_route(measure, size, route_name, url)
+                for route_name, url in get_route_urls(routes, user)
+            }
+        return report
+
+    def seed_dataset(self, seeder, size, workers):
+        """Add tasks missing in the dataset of the size."""
+        missing = size - Task.objects.count()
+        if missing > 0:
+            seeded, elapsed = seeder.seed_tasks(missing, workers=workers)
+            seeding_time = f"{elapsed:.1f}s"
+            self.stdout.write(f"Seeded {seeded} tasks in {seeding_time}")
+
+    def measure_route(self, measure, size, route_name, url):
+        """Measure requests to the route url and show the measurements."""
+        measured = measure(url)
+        measurements = MEASUREMENTS_FORMAT.format(**measured)
+        self.stdout.write(f"{size} tasks {route_name}: {measurements}")
+        return measured
+
+    def compare(self, report, options):
+        """Report regressions against baseline report."""
+        with open(options["compare"]) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_reports(
+            baseline,
+            report,
+            threshold=options["threshold"],
+        )
+        for regression in regressions:
+            self.stdout.write(
+                self.style.WARNING(REGRESSION_FORMAT.format(*regression)),
+            )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regressions found"))
+        elif options["fail_on_regression"]:
+            regressions_count = len(regressions)
+            raise CommandError(f"{regressions_count} regressions found")
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.cache import lookup_stats
+from task_manager.utils.cache_stats import alias_stats
+
+STATS_FORMAT = (
+    "{0} ({1}): entries={2} memory={3} hits={4} misses={5} hit_ratio={6}"
+)
+BYTES_PER_KIB = 1024
+
+
+def format_count(count):
+    """Format count, dash for unknown count."""
+    return "-" if count is None else str(count)
+
+
+def format_size(size):
+    """Format size in KiB, dash for unknown size."""
+    if size is None:
+        return "-"
+    size_kib = size / BYTES_PER_KIB
+    return f"{size_kib:.1f}KiB"
+
+
+def format_ratio(ratio):
+    """Format ratio in percents, dash for unknown ratio."""
+    return "-" if ratio is None else f"{ratio:.1%}"
+
+
+class Command(BaseCommand):
+    """Report use and hit ratio of every cache alias."""
+
+    help = (
+        "Reports number of entries, memory use, hits and misses counted "
+        "by task manager and the largest keys of every cache alias"
+    )
+
+    def add_arguments(self, parser):
+        """Add alias selection and key sampling options."""
+        parser.add_argument(
+            "--aliases",
+            default="",
+            help="Comma-separated cache aliases (default: all aliases)",
+        )
+        parser.add_argument(
+            "--top",
+            default=10,
+            type=int,
+            help="Number of the largest keys shown per alias (default=10)",
+        )
+        parser.add_argument(
+            "--sample",
+            default=1000,
+            type=int,
+            help="Maximum number of Redis keys scanned (default=1000)",
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Write stats of the selected cache aliases."""
+        aliases = list(settings.CACHES)
+        if options["aliases"]:
+            aliases = options["aliases"].split(",")
+        unknown = set(aliases) - set(settings.CACHES)
+        if unknown:
+            unknown_aliases = ", ".join(sorted(unknown))
+            raise CommandError(f"Unknown cache aliases: {unknown_aliases}")
+        # Count lookups of this process too, the only ones seen by
+        # local memory caches
+        lookup_stats.flush(force=True)
+        for alias in aliases:
+            stats = alias_stats(alias, options["top"], options["sample"])
+            self.stdout.write(
+                STATS_FORMAT.format(
+                    alias,
+                    stats["backend"],
+                    format_count(stats["entries"]),
+                    format_size(stats["memory_bytes"]),
+                    stats["hits"],
+                    stats["misses"],
+                    format_ratio(stats["hit_ratio"]),
+                ),
+            )
+            for key, size in stats["top_keys"]:
+                size_text = format_size(size)
+                self.stdout.write(f"  {size_text:>10}  {key}")
+            if stats["backend"] == "locmem":
+                self.stdout.write(
+                    self.style.WARNING(
+                        "  Local memory cache of this process only",
+                    ),
+                )
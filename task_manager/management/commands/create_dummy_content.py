@@ -1,6 +1,15 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 
 from task_manager.utils.factories import TaskFactory
+from task_manager.utils.seeding import (
+    TASK_BATCH_SIZE,
+    TaskSeeder,
+    create_pools,
+)
+
+# Number of labels created in bulk mode by default
+DEFAULT_LABELS = 50
 
 
 class Command(BaseCommand):
@@ -14,13 +23,107 @@ class Command(BaseCommand):
             required=False,
             help="Number of tasks to be created (default=10)",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help=(
+                "High-throughput mode for load testing datasets: create "
+                "pools of users/statuses/labels and insert tasks in batches"
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            default=TASK_BATCH_SIZE,
+            type=int,
+            help="Number of tasks inserted per batch in bulk mode",
+        )
+        parser.add_argument(
+            "--users",
+            default=100,
+            type=int,
+            help="Number of users created in bulk mode (default=100)",
+        )
+        parser.add_argument(
+            "--statuses",
+            default=10,
+            type=int,
+            help="Number of statuses created in bulk mode (default=10)",
+        )
+        parser.add_argument(
+            "--labels",
+            default=DEFAULT_LABELS,
+            type=int,
+            help="Number of labels created in bulk mode (default=50)",
+        )
+        parser.add_argument(
+            "--workers",
+            default=1,
+            type=int,
+            help=(
+                "Number of processes inserting tasks in bulk mode "
+                "(PostgreSQL only, default=1)"
+            ),
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create instead of COPY on PostgreSQL",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            required=False,
+            help="Random seed for reproducible datasets",
+        )
 
     def handle(self, *args, **options):
+        num_tasks = options["num_tasks"]
+        if options["bulk"]:
+            self.create_bulk_content(num_tasks, options)
+            return
         # Create dummy tasks along with task creators, performers
         # statuses, labels
-        num_tasks = options["num_tasks"]
         TaskFactory.create_batch(num_tasks)
         self.stdout.write(
             self.style.SUCCESS("Dummy content created successfully"),
         )
         self.stdout.write(f"{num_tasks} dummy tasks created")
+
+    def create_bulk_content(self, num_tasks, options):
+        positive_options = ("batch_size", "users", "statuses", "labels")
+        for option in (*positive_options, "workers"):
+            if options[option] < 1:
+                option_name = option.replace("_", "-")
+                raise CommandError(f"--{option_name} must be at least 1")
+        pools = create_pools(
+            options["users"],
+            options["statuses"],
+            options["labels"],
+        )
+        use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+        seeder = TaskSeeder(
+            pools,
+            batch_size=options["batch_size"],
+            use_copy=use_copy,
+            seed=options["seed"],
+        )
+        created, elapsed = seeder.seed_tasks(
+            num_tasks,
+            workers=options["workers"],
+        )
+        rate = created / elapsed if elapsed else created
+        self.stdout.write(
+            self.style.SUCCESS("Dummy content created successfully"),
+        )
+        self.stdout.write(
+            "{0} users, {1} statuses, {2} labels created".format(
+                len(pools.user_ids),
+                len(pools.status_ids),
+                len(pools.label_ids),
+            ),
+        )
+        insert_method = "COPY" if use_copy else "bulk_create"
+        self.stdout.write(
+            f"{created} dummy tasks created in {elapsed:.2f}s "
+            f"({rate:.0f} tasks/s, {insert_method})",
+        )
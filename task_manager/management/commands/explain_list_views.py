@@ -0,0 +1,174 @@
+from types import MappingProxyType
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from task_manager.models import Label, SiteUser, Status
+from task_manager.views.labels import LabelListView
+from task_manager.views.statuses import StatusListView
+from task_manager.views.tasks import TaskListView
+from task_manager.views.users import SiteUserListView
+
+# Plan fragments marking a full table scan or a sort that is not
+# covered by an index, per database vendor
+SEQ_SCAN_MARKERS = MappingProxyType(
+    {
+        "postgresql": ("Seq Scan",),
+        "sqlite": ("SCAN ",),
+    },
+)
+SORT_MARKERS = MappingProxyType(
+    {
+        "postgresql": ("Sort Key",),
+        "sqlite": ("USE TEMP B-TREE",),
+    },
+)
+INDEX_MARKERS = ("USING INDEX", "USING COVERING INDEX", "USING INTEGER")
+
+
+def has_marker(line, markers):
+    """Check if plan line contains any of the markers."""
+    return any(marker in line for marker in markers)
+
+
+def analyze_plan(plan):
+    """Return plan lines with sequential scans and uncovered sorts."""
+    seq_scan_markers = SEQ_SCAN_MARKERS.get(connection.vendor, ())
+    sort_markers = SORT_MARKERS.get(connection.vendor, ())
+    seq_scans = []
+    sorts = []
+    for plan_line in plan.splitlines():
+        line = plan_line.strip()
+        is_index_scan = has_marker(line, INDEX_MARKERS)
+        if not is_index_scan and has_marker(line, seq_scan_markers):
+            seq_scans.append(line)
+        if has_marker(line, sort_markers):
+            sorts.append(line)
+    return seq_scans, sorts
+
+
+def get_page_url(url_name, query):
+    """Return URL of the page requested with the GET params."""
+    url = reverse(url_name)
+    if not query:
+        return url
+    query_string = urlencode(query)
+    return f"{url}?{query_string}"
+
+
+def get_view_queryset(view_class, query, user):
+    """Return the page query issued by the list view."""
+    request = RequestFactory().get("/", query)
+    request.user = user
+    view = view_class()
+    view.setup(request)
+    queryset = view.get_queryset()
+    page_size = view.get_paginate_by(queryset)
+    if page_size:
+        ordering = view.get_ordering() or queryset.query.order_by
+        queryset = queryset.order_by(*ordering)[: page_size + 1]
+    return queryset
+
+
+def get_cases(user):
+    """Return url name, view class and GET params of checked pages."""
+    cases = [("tasks", TaskListView, {})]
+    if user.is_authenticated:
+        cases.append(("tasks", TaskListView, {"self_tasks": "on"}))
+    filter_objects = (
+        ("status", Status.objects.first()),
+        ("performer", SiteUser.objects.first()),
+        ("label", Label.objects.first()),
+    )
+    cases.extend(
+        ("tasks", TaskListView, {filter_name: filter_object.pk})
+        for filter_name, filter_object in filter_objects
+        if filter_object is not None
+    )
+    cases.extend(
+        (
+            ("users", SiteUserListView, {}),
+            ("statuses", StatusListView, {}),
+            ("labels", LabelListView, {}),
+        ),
+    )
+    return cases
+
+
+class Command(BaseCommand):
+    """Report sequential scans and sorts of list views queries."""
+
+    help = (
+        "Runs EXPLAIN on the queries of list views and reports sequential "
+        "scans and sorts not covered by indexes"
+    )
+
+    def add_arguments(self, parser):
+        """Add user and report options."""
+        parser.add_argument(
+            "--username",
+            required=False,
+            help=(
+                "User to run the views as "
+                "(default: first superuser or first user)"
+            ),
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Output full query plans",
+        )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with error if any sequential scan is found",
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Explain queries of every list view, fail on scans if asked."""
+        user = self.get_user(options["username"])
+        found_seq_scans = False
+        for view_case in get_cases(user):
+            seq_scans = self.check_view(
+                view_case,
+                user,
+                verbose_plans=options["verbose_plans"],
+            )
+            found_seq_scans = found_seq_scans or bool(seq_scans)
+        if found_seq_scans and options["fail_on_seq_scan"]:
+            raise CommandError("Sequential scans found in list views queries")
+
+    def get_user(self, username):
+        """Return user to run the views as."""
+        if username:
+            try:
+                return SiteUser.objects.get(username=username)
+            except SiteUser.DoesNotExist:
+                raise CommandError(f"User {username} does not exist")
+        user = SiteUser.objects.order_by("-is_superuser", "pk").first()
+        return user or AnonymousUser()
+
+    def check_view(self, view_case, user, verbose_plans):
+        """Explain the page query of the view, return sequential scans."""
+        url_name, view_class, query = view_case
+        plan = get_view_queryset(view_class, query, user).explain()
+        seq_scans, sorts = analyze_plan(plan)
+        self.report_plan(get_page_url(url_name, query), seq_scans, sorts)
+        if verbose_plans:
+            self.stdout.write(plan)
+        return seq_scans
+
+    def report_plan(self, url, seq_scans, sorts):
+        """Show sequential scans and sorts found in the page query plan."""
+        if not seq_scans and not sorts:
+            self.stdout.write(self.style.SUCCESS(f"{url}: OK"))
+            return
+        self.stdout.write(self.style.WARNING(url))
+        for seq_scan in seq_scans:
+            self.stdout.write(f"  sequential scan: {seq_scan}")
+        for sort in sorts:
+            self.stdout.write(f"  sort: {sort}")
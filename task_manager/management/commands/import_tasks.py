@@ -0,0 +1,164 @@
+import csv
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from task_manager.models import SiteUser
+from task_manager.utils.importing import (
+    IMPORT_FORMATS,
+    Checkpoint,
+    detect_format,
+    import_batches,
+    read_rows,
+)
+from task_manager.utils.row_validation import TaskRowValidator
+
+# Number of rejected rows shown in the report
+SHOWN_REJECTS = 10
+
+
+class Command(BaseCommand):
+    """Import tasks in batches, resuming from checkpoints."""
+
+    help = (
+        "Imports tasks from CSV or NDJSON file with columns name, "
+        "description, status, performer, creator, labels, created_on "
+        "(as written by tasks export)"
+    )
+
+    def add_arguments(self, parser):
+        """Add import file and batch options."""
+        parser.add_argument("path", help="Path of the imported file")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            required=False,
+            help="File format (default: detected by file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            default=1000,
+            type=int,
+            help="Number of rows written per transaction (default=1000)",
+        )
+        parser.add_argument(
+            "--creator",
+            required=False,
+            help="Username of creator of tasks without creator column",
+        )
+        parser.add_argument(
+            "--rejects",
+            required=False,
+            help="Path of NDJSON file receiving rejected rows with errors",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            required=False,
+            help="Name of checkpoint (default: absolute path of the file)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue failed import from its checkpoint",
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Import the file, report imported and rejected rows."""
+        checkpoint = self.get_checkpoint(options)
+        validator = TaskRowValidator(
+            default_creator_id=self.get_creator_id(options["creator"]),
+        )
+        started_at = time.perf_counter()
+        rows_before = checkpoint.rows_done
+        try:
+            self.import_file(validator, checkpoint, options)
+        except (ValueError, csv.Error) as error:
+            raise CommandError(
+                f"Import failed after {checkpoint.rows_done} rows: "
+                f"{error!r}. Fix the file and run again with --resume",
+            )
+        except DatabaseError as error:
+            raise CommandError(
+                f"Import failed after {checkpoint.rows_done} rows: "
+                f"{error!r}. Run again with --resume",
+            )
+        elapsed = time.perf_counter() - started_at
+        checkpoint.remove()
+        processed = checkpoint.rows_done - rows_before
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Imported {0} tasks, rejected {1} rows, "
+                "{2:.0f} rows/s".format(
+                    checkpoint.imported,
+                    checkpoint.rejected,
+                    processed / elapsed if elapsed else processed,
+                ),
+            ),
+        )
+
+    def get_checkpoint(self, options):
+        """Return checkpoint of the import, loaded if resumed."""
+        checkpoint = Checkpoint(
+            options["checkpoint"] or os.path.abspath(options["path"]),
+        )
+        if not checkpoint.exists():
+            return checkpoint
+        if not options["resume"]:
+            raise CommandError(
+                f"Checkpoint {checkpoint.source} of unfinished import "
+                "exists, use --resume to continue the import",
+            )
+        checkpoint.load()
+        self.stdout.write(f"Resuming after {checkpoint.rows_done} rows")
+        return checkpoint
+
+    def get_creator_id(self, username):
+        """Return id of default creator of tasks."""
+        if not username:
+            return None
+        try:
+            return SiteUser.objects.get(username=username).pk
+        except SiteUser.DoesNotExist:
+            raise CommandError(f"User {username} does not exist")
+
+    def import_file(self, validator, checkpoint, options):
+        """Import rows of the file, reporting rejected rows."""
+        import_format = options["format"] or detect_format(options["path"])
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError(f"Unknown import format: {import_format}")
+        if options["batch_size"] < 1:
+            raise CommandError("Batch size must be positive")
+        # Rejected rows are only shown without the rejects file
+        rejects_path = options["rejects"] or os.devnull
+        with open(options["path"], newline="", encoding="utf-8") as source:
+            with open(rejects_path, "a", encoding="utf-8") as rejects_file:
+                batches = import_batches(
+                    read_rows(source, import_format),
+                    validator,
+                    checkpoint,
+                    options["batch_size"],
+                )
+                for rejected in batches:
+                    self.report_rejects(rejected, checkpoint, rejects_file)
+                    self.report_progress(checkpoint, options["verbosity"])
+
+    def report_rejects(self, rejected, checkpoint, rejects_file):
+        """Show rejected rows of a batch and write them to rejects file."""
+        first_number = checkpoint.rejected - len(rejected) + 1
+        for number, reject in enumerate(rejected, start=first_number):
+            if number <= SHOWN_REJECTS:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Row {reject['row']}: {reject['errors']}",
+                    ),
+                )
+            rejects_file.write(json.dumps(reject, ensure_ascii=False))
+            rejects_file.write("\n")
+
+    def report_progress(self, checkpoint, verbosity):
+        """Show number of processed rows in verbose mode."""
+        if verbosity > 1:
+            self.stdout.write(f"{checkpoint.rows_done} rows done")
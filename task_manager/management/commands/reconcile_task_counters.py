@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.models import TaskCounter
+
+# Number of drifted counters listed in the report
+MAX_REPORTED = 20
+
+
+class Command(BaseCommand):
+    """Reconcile task counters with tasks."""
+
+    help = (
+        "Recomputes task counters from tasks, reports counters that "
+        "drifted and fixes them"
+    )
+
+    def add_arguments(self, parser):
+        """Add dry run and failure options."""
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted counters, don't fix them",
+        )
+        parser.add_argument(
+            "--fail-on-drift",
+            action="store_true",
+            help="Exit with error if any counter drifted",
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Reconcile counters and report the drifted ones."""
+        drift = TaskCounter.objects.reconcile(dry_run=options["dry_run"])
+        reported = sorted(drift.items())[:MAX_REPORTED]
+        for (dimension, object_id), (stored, actual) in reported:
+            self.stdout.write(
+                f"{dimension} {object_id}: stored {stored}, actual {actual}",
+            )
+        num_drifted = len(drift)
+        if num_drifted > MAX_REPORTED:
+            num_unreported = num_drifted - MAX_REPORTED
+            self.stdout.write(f"... and {num_unreported} more")
+        action = "found" if options["dry_run"] else "fixed"
+        self.stdout.write(f"Drifted counters {action}: {num_drifted}")
+        if drift and options["fail_on_drift"]:
+            raise CommandError("Task counters drifted")
@@ -0,0 +1,153 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from task_manager.management.commands.benchmark_views import (
+    get_benchmark_user,
+    get_route_urls,
+)
+from task_manager.models import Task
+from task_manager.utils.benchmark import (
+    benchmark_database,
+    discover_routes,
+    finish_request,
+)
+from task_manager.utils.seeding import TaskSeeder, create_pools
+from task_manager.utils.templates import (
+    compile_template,
+    reset_template_cache,
+    timed_template_renders,
+    warm_templates,
+    warmup_template_names,
+)
+
+# Number of users assigned to tasks of rendered pages
+DATASET_USERS = 20
+TIMES_FORMAT = "{0:<52} {1:>10} {2:>8} {3:>10} {4:>10}"
+
+
+def format_ms(duration):
+    """Format time in milliseconds, dash for missing time."""
+    if duration is None:
+        return "-"
+    return f"{duration:.3f}"
+
+
+class Command(BaseCommand):
+    """Report compile and render times of templates."""
+
+    help = (
+        "Reports compile time of every template warmed up at worker boot "
+        "and render time of templates on every page of task manager"
+    )
+
+    def add_arguments(self, parser):
+        """Add measurement and database options."""
+        parser.add_argument(
+            "--iterations",
+            default=10,
+            type=int,
+            help="Number of compiles and page requests (default=10)",
+        )
+        parser.add_argument(
+            "--tasks",
+            default=100,
+            type=int,
+            help="Number of tasks in dataset of rendered pages (default=100)",
+        )
+        parser.add_argument(
+            "--skip-render",
+            action="store_true",
+            help="Report compile time only, without requesting pages",
+        )
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help=(
+                "Render pages on the configured database instead of "
+                "a temporary test database"
+            ),
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep temporary test database between runs",
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Measure compile and render times and write the report."""
+        for option in ("iterations", "tasks"):
+            if options[option] < 1:
+                raise CommandError(f"--{option} must be positive")
+        compile_times = self.compile_templates(options["iterations"])
+        reset_template_cache()
+        num_templates, elapsed = warm_templates()
+        self.stdout.write(
+            f"Warm-up compiled {num_templates} templates in {elapsed:.1f}ms",
+        )
+        render_times = {}
+        if not options["skip_render"]:
+            with benchmark_database(
+                options["use_current_db"],
+                options["keepdb"],
+            ):
+                render_times = self.render_pages(options)
+        self.report(compile_times, render_times)
+
+    def compile_templates(self, iterations):
+        """Return mean compile time of every warmed up template."""
+        compile_times = {}
+        for name in warmup_template_names():
+            total = sum(compile_template(name) for _ in range(iterations))
+            compile_times[name] = total / iterations
+        return compile_times
+
+    def render_pages(self, options):
+        """Request every page, return render times of templates."""
+        missing = options["tasks"] - Task.objects.count()
+        if missing > 0:
+            pools = create_pools(
+                num_users=DATASET_USERS,
+                num_statuses=5,
+                num_labels=10,
+            )
+            TaskSeeder(pools).seed_tasks(missing)
+        user = get_benchmark_user()
+        client = Client()
+        client.force_login(user)
+        urls = [url for _, url in get_route_urls(discover_routes(), user)]
+        with timed_template_renders() as render_times:
+            for _ in range(options["iterations"]):
+                for url in urls:
+                    client.get(url)
+                    finish_request()
+            return render_times
+
+    def report(self, compile_times, render_times):
+        """Write compile and render times, slowest to compile first."""
+        self.stdout.write(
+            TIMES_FORMAT.format(
+                "template",
+                "compile_ms",
+                "renders",
+                "render_ms",
+                "max_ms",
+            ),
+        )
+        names = sorted(
+            set(compile_times) | set(render_times),
+            key=lambda name: compile_times.get(name, 0),
+            reverse=True,
+        )
+        for template_name in names:
+            timings = render_times.get(template_name, [])
+            self.stdout.write(
+                TIMES_FORMAT.format(
+                    template_name,
+                    format_ms(compile_times.get(template_name)),
+                    len(timings),
+                    format_ms(
+                        sum(timings) / len(timings) if timings else None,
+                    ),
+                    format_ms(max(timings, default=None)),
+                ),
+            )
@@ -0,0 +1,369 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.views.generic.edit import DeletionMixin, FormMixin
+
+from task_manager.db.routers import (
+    allow_replica_reads,
+    get_replica_aliases,
+    use_replicas,
+)
+
+logger = logging.getLogger("task_manager.requests")
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+# Cookie set after a write, so that following requests of the client
+# read from the primary database until replicas catch up
+PRIMARY_PIN_COOKIE = "pin_primary"
+# Views reading data to be changed, always read from primary database
+PRIMARY_VIEW_CLASSES = (FormMixin, DeletionMixin)
+
+
+class QueryMetrics:
+    """Timings and counts of SQL queries, used as execute wrapper."""
+
+    def __init__(self):
+        """Set up empty metrics."""
+        self.time = 0
+        self.queries = Counter()
+        self.similar_queries = Counter()
+
+    # Arguments of database connection execute wrappers
+    def __call__(  # noqa: WPS211
+        self,
+        execute,
+        sql,
+        query_params,
+        many,
+        context,
+    ):
+        """Time SQL query, used as database connection execute wrapper."""
+        with ExitStack() as stack:
+            stack.callback(
+                self.count_query,
+                sql,
+                query_params,
+                time.perf_counter(),
+            )
+            return execute(sql, query_params, many, context)
+
+    def count_query(self, sql, query_params, started_at):
+        """Count query executed since the start time."""
+        self.time += time.perf_counter() - started_at
+        self.similar_queries[sql] += 1
+        self.queries[(sql, repr(query_params))] += 1
+
+    @property
+    def query_count(self):
+        """Return number of executed queries."""
+        return sum(self.queries.values())
+
+    @property
+    def duplicate_count(self):
+        """Return number of queries repeating an earlier one exactly."""
+        return self.query_count - len(self.queries)
+
+    def repeated_queries(self, threshold):
+        """Return SQL executed with different params more than threshold."""
+        return [
+            sql
+            for sql, count in self.similar_queries.items()
+            if count > threshold
+        ]
+
+
+class RequestMetrics:
+    """Timings and SQL statistics collected while handling a request."""
+
+    def __init__(self):
+        """Set up empty metrics of a request starting now."""
+        self.started_at = time.perf_counter()
+        self.db = QueryMetrics()
+        self.template_time = 0
+        self.fragment_hits = 0
+        self.fragment_misses = 0
+        self.response_size = None
+
+    @property
+    def total_time(self):
+        """Return time elapsed since the request started."""
+        return time.perf_counter() - self.started_at
+
+    def add_template_time(self, started_at):
+        """Add time of template rendering since the start time."""
+        self.template_time += time.perf_counter() - started_at
+
+    def count_fragment(self, is_hit):
+        """Count lookup of a cached template fragment."""
+        if is_hit:
+            self.fragment_hits += 1
+        else:
+            self.fragment_misses += 1
+
+
+def track_queries(stack, query_metrics):
+    """Collect metrics of queries of the current thread in the stack."""
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(query_metrics))
+
+
+class MeasuredContent:
+    """
+    Content of streaming response counting its size.
+
+    Queries of the request are tracked until the response is closed,
+    after its content is streamed.
+    """
+
+    def __init__(self, chunks, metrics, tracking):
+        """Wrap streamed chunks, closing the tracking stack when closed."""
+        self.chunks = chunks
+        self.metrics = metrics
+        self.tracking = tracking
+        metrics.response_size = 0
+
+    def __iter__(self):
+        """Yield streamed chunks, counting their size."""
+        for chunk in self.chunks:
+            self.metrics.response_size += len(chunk)
+            yield chunk
+
+    def close(self):
+        """End tracking of the request when the response is closed."""
+        self.tracking.close()
+
+
+class AsyncMeasuredContent(MeasuredContent):
+    """Async content of streaming response counting its size."""
+
+    # Async iteration marks streaming responses async
+    async def __aiter__(self):  # noqa: WPS610
+        """Yield streamed chunks, counting their size."""
+        async for chunk in self.chunks:
+            self.metrics.response_size += len(chunk)
+            yield chunk
+
+
+class AsyncCapableMiddleware:
+    """
+    Middleware running in the mode of the handler it wraps.
+
+    Under ASGI the middleware is a coroutine wrapping async handlers, so
+    requests to async views are not passed to a thread and back around
+    it. Subclasses handle requests with `handle_request` and coroutine
+    `__acall__`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Set up the middleware in the mode of the wrapped handler."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Handle request in the mode of the wrapped handler."""
+        if iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.handle_request(request)
+
+    def handle_request(self, request):
+        """Handle request synchronously."""
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        """Handle request asynchronously."""
+        raise NotImplementedError
+
+
+class RequestMetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Record timings and SQL statistics of every request.
+
+    For each request logs view name, wall time, DB time, number of
+    queries and of exact duplicates, template render time, hits and
+    misses of cached template fragments and response size as a JSON line
+    to `task_manager.requests` logger, and adds the timings to
+    `Server-Timing` response header. Requests running the same SQL more
+    than REQUEST_METRICS_N_PLUS_ONE_THRESHOLD times are logged as
+    warnings about possible N+1 queries.
+
+    Enabled by REQUEST_METRICS_ENABLED setting. When disabled, the
+    middleware removes itself from the middleware chain at startup.
+    """
+
+    def __init__(self, get_response):
+        """Set up the middleware if request metrics are enabled."""
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.n_plus_one_threshold = getattr(
+            settings,
+            "REQUEST_METRICS_N_PLUS_ONE_THRESHOLD",
+            10,
+        )
+
+    def handle_request(self, request):
+        """Handle request collecting its metrics."""
+        request.metrics = RequestMetrics()
+        with ExitStack() as stack:
+            track_queries(stack, request.metrics.db)
+            response = self.get_response(request)
+            self.finish_metrics(request, response, stack)
+        return response
+
+    async def __acall__(self, request):
+        """Handle async request collecting its metrics."""
+        request.metrics = RequestMetrics()
+        with ExitStack() as stack:
+            # Async views and ORM run queries in the thread of the request
+            await sync_to_async(track_queries)(stack, request.metrics.db)
+            response = await self.get_response(request)
+            self.finish_metrics(request, response, stack)
+        return response
+
+    def finish_metrics(self, request, response, stack):
+        """
+        Report metrics in response header, log them when the request ends.
+
+        Streaming responses end when they are closed after streaming
+        their content, queries run while streaming are tracked till then.
+        """
+        metrics = request.metrics
+        self.add_server_timing(response, metrics)
+        stack.callback(self.log_metrics, request, response)
+        if not response.streaming:
+            metrics.response_size = len(response.content)
+            return
+        content_class = MeasuredContent
+        if getattr(response, "is_async", False):
+            content_class = AsyncMeasuredContent
+        response.streaming_content = content_class(
+            response.streaming_content,
+            metrics,
+            stack.pop_all(),
+        )
+
+    def process_template_response(self, request, response):
+        """Time rendering of template response."""
+        metrics = getattr(request, "metrics", None)
+        if metrics is None:
+            return response
+        render = response.render
+
+        def timed_render():  # noqa: WPS430
+            with ExitStack() as stack:
+                stack.callback(metrics.add_template_time, time.perf_counter())
+                return render()
+
+        response.render = timed_render
+        return response
+
+    def add_server_timing(self, response, metrics):
+        """Add timings of the request so far to Server-Timing header."""
+        timings = (
+            'db;dur={0:.1f};desc="{1} queries"'.format(
+                metrics.db.time * 1000,
+                metrics.db.query_count,
+            ),
+            "tpl;dur={0:.1f}".format(metrics.template_time * 1000),
+            "total;dur={0:.1f}".format(metrics.total_time * 1000),
+        )
+        response["Server-Timing"] = ", ".join(timings)
+
+    def log_metrics(self, request, response):
+        """Log request metrics as a JSON line."""
+        metrics = request.metrics
+        resolver_match = request.resolver_match
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": resolver_match.view_name if resolver_match else None,
+            "status": response.status_code,
+            "total_ms": round(metrics.total_time * 1000, 2),
+            "db_ms": round(metrics.db.time * 1000, 2),
+            "template_ms": round(metrics.template_time * 1000, 2),
+            "queries": metrics.db.query_count,
+            "duplicate_queries": metrics.db.duplicate_count,
+            "fragment_hits": metrics.fragment_hits,
+            "fragment_misses": metrics.fragment_misses,
+            "response_size": metrics.response_size,
+        }
+        logger.info(json.dumps(record), extra={"metrics": record})
+        repeated = metrics.db.repeated_queries(self.n_plus_one_threshold)
+        for sql in repeated:
+            logger.warning(
+                "Possible N+1 queries in %s: %s times %s",  # noqa: WPS323
+                record["view"],
+                metrics.db.similar_queries[sql],
+                sql,
+            )
+
+
+class ReplicaPinningMiddleware(AsyncCapableMiddleware):
+    """
+    Choose database to read from for every request.
+
+    Safe requests to read-only views (lists, details, pages) read from
+    replicas. Unsafe requests and form or deletion views read from
+    the primary database, and so do all requests of the client during
+    REPLICA_PIN_SECONDS after an unsafe request (read-your-writes).
+
+    Removed from the middleware chain when no replicas are configured.
+    """
+
+    def __init__(self, get_response):
+        """Set up the middleware if read replicas are configured."""
+        if not get_replica_aliases():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+    def handle_request(self, request):
+        """Handle request reading from replicas if possible."""
+        with use_replicas(self.may_read_replicas(request)):
+            response = self.get_response(request)
+        return self.pin_primary(request, response)
+
+    async def __acall__(self, request):
+        """Handle async request reading from replicas if possible."""
+        # Threads running sync code of the request copy the context
+        with use_replicas(self.may_read_replicas(request)):
+            response = await self.get_response(request)
+        return self.pin_primary(request, response)
+
+    def may_read_replicas(self, request):
+        """Check if the request may read from replicas."""
+        is_pinned = PRIMARY_PIN_COOKIE in request.COOKIES
+        return request.method in SAFE_METHODS and not is_pinned
+
+    def pin_primary(self, request, response):
+        """Pin client to primary database after unsafe request."""
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Read from primary database in form and deletion views."""
+        view_class = getattr(view_func, "view_class", None)
+        if view_class and issubclass(view_class, PRIMARY_VIEW_CLASSES):
+            allow_replica_reads(False)
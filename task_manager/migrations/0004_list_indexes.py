@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0003_alter_label_options_alter_siteuser_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="label",
+            index=models.Index(fields=["-created_on"], name="label_created_on_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="siteuser",
+            index=models.Index(
+                fields=["-signup_date"], name="siteuser_signup_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="status",
+            index=models.Index(fields=["-created_on"], name="status_created_on_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["-created_on", "-id"], name="task_created_on_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "-created_on", "-id"],
+                name="task_status_created_on_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["performer", "-created_on", "-id"],
+                name="task_performer_created_on_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["creator", "-created_on", "-id"],
+                name="task_creator_created_on_idx",
+            ),
+        ),
+        # Auto-created Task.label through table only has an index on each of
+        # its foreign keys. Filtering tasks by label joins the table by
+        # label_id and reads task_id, so (label_id, task_id) index makes
+        # the lookup index-only.
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX task_label_label_task_idx "
+                "ON task_manager_task_label (label_id, task_id);"
+            ),
+            reverse_sql="DROP INDEX task_label_label_task_idx;",
+        ),
+    ]
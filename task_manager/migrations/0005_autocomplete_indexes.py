@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:45
+
+from django.db import migrations
+
+# (index name, table, column) of case-insensitive prefix search
+AUTOCOMPLETE_INDEXES = (
+    ("siteuser_username_upper_idx", "task_manager_siteuser", "username"),
+    ("siteuser_first_name_upper_idx", "task_manager_siteuser", "first_name"),
+    ("siteuser_last_name_upper_idx", "task_manager_siteuser", "last_name"),
+    ("label_name_upper_idx", "task_manager_label", "name"),
+)
+
+
+def create_indexes(apps, schema_editor):
+    # PostgreSQL uses indexes for LIKE prefix patterns only with
+    # pattern operator class, unless the database uses C collation
+    if schema_editor.connection.vendor == "postgresql":
+        opclass = " text_pattern_ops"
+    else:
+        opclass = ""
+    for name, table, column in AUTOCOMPLETE_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX {name} ON {table} (UPPER({column}){opclass});"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    for name, _, _ in AUTOCOMPLETE_INDEXES:
+        schema_editor.execute(f"DROP INDEX {name};")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0004_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, reverse_code=drop_indexes),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:20
+
+from django.db import migrations
+
+# PostgreSQL: search vector generated from name and description,
+# matches in name weigh more
+POSTGRESQL_CREATE = (
+    """
+    ALTER TABLE task_manager_task ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED;
+    """,
+    """
+    CREATE INDEX task_search_vector_idx ON task_manager_task
+    USING GIN (search_vector);
+    """,
+)
+POSTGRESQL_DROP = (
+    "DROP INDEX task_search_vector_idx;",
+    "ALTER TABLE task_manager_task DROP COLUMN search_vector;",
+)
+
+# SQLite: FTS5 index over tasks table kept in sync by triggers.
+# Triggers are dropped when Django remakes the tasks table to alter it,
+# task_manager.search recreates them after migrations.
+SQLITE_CREATE = (
+    """
+    CREATE VIRTUAL TABLE task_manager_task_fts USING fts5(
+        name, description,
+        content='task_manager_task', content_rowid='id'
+    );
+    """,
+    """
+    CREATE TRIGGER task_manager_task_fts_insert
+    AFTER INSERT ON task_manager_task BEGIN
+        INSERT INTO task_manager_task_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER task_manager_task_fts_delete
+    AFTER DELETE ON task_manager_task BEGIN
+        INSERT INTO task_manager_task_fts
+            (task_manager_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER task_manager_task_fts_update
+    AFTER UPDATE OF name, description ON task_manager_task BEGIN
+        INSERT INTO task_manager_task_fts
+            (task_manager_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO task_manager_task_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END;
+    """,
+    "INSERT INTO task_manager_task_fts (task_manager_task_fts) "
+    + "VALUES ('rebuild');",
+)
+SQLITE_DROP = (
+    "DROP TRIGGER task_manager_task_fts_insert;",
+    "DROP TRIGGER task_manager_task_fts_delete;",
+    "DROP TRIGGER task_manager_task_fts_update;",
+    "DROP TABLE task_manager_task_fts;",
+)
+
+STATEMENTS = {
+    "postgresql": (POSTGRESQL_CREATE, POSTGRESQL_DROP),
+    "sqlite": (SQLITE_CREATE, SQLITE_DROP),
+}
+
+
+def create_search_index(apps, schema_editor):
+    # Other databases search by substring without an index
+    create, _ = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in create:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    _, drop = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in drop:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0005_autocomplete_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_search_index,
+            reverse_code=drop_search_index,
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:20
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_task_counters(apps, schema_editor):
+    # Counters of existing tasks, later kept up to date by the app
+    Task = apps.get_model("task_manager", "Task")
+    TaskCounter = apps.get_model("task_manager", "TaskCounter")
+    counters = [TaskCounter(dimension="total", object_id=0, count=Task.objects.count())]
+    for dimension in ("status", "performer"):
+        groups = Task.objects.values_list(dimension).annotate(Count("pk")).order_by()
+        counters.extend(
+            TaskCounter(dimension=dimension, object_id=object_id, count=count)
+            for object_id, count in groups
+        )
+    groups = Task.label.through.objects.values_list("label").annotate(Count("pk")).order_by()
+    counters.extend(
+        TaskCounter(dimension="label", object_id=object_id, count=count)
+        for object_id, count in groups
+    )
+    TaskCounter.objects.bulk_create(counters, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_manager', '0006_task_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('status', 'Status'), ('performer', 'Performer'), ('label', 'Label')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Task counter',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskcounter',
+            constraint=models.UniqueConstraint(fields=('dimension', 'object_id'), name='task_counter_unique'),
+        ),
+        migrations.RunPython(fill_task_counters, reverse_code=migrations.RunPython.noop),
+    ]
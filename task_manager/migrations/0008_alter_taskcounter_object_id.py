@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_manager', '0007_task_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskcounter',
+            name='object_id',
+            field=models.PositiveBigIntegerField(),
+        ),
+    ]
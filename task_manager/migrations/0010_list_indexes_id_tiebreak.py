@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0009_import_checkpoint"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="label",
+            name="label_created_on_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="siteuser",
+            name="siteuser_signup_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="status",
+            name="status_created_on_idx",
+        ),
+        migrations.AddIndex(
+            model_name="label",
+            index=models.Index(
+                fields=["-created_on", "-id"], name="label_created_on_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="siteuser",
+            index=models.Index(
+                fields=["-signup_date", "-id"], name="siteuser_signup_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="status",
+            index=models.Index(
+                fields=["-created_on", "-id"], name="status_created_on_idx"
+            ),
+        ),
+    ]
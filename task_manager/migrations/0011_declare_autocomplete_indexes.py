@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:02
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+import task_manager.db.functions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0010_list_indexes_id_tiebreak"),
+    ]
+
+    # Indexes were created by 0005 migration with the same definitions,
+    # operator class on PostgreSQL only, so only model state changes
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="label",
+                    index=models.Index(
+                        task_manager.db.functions.PatternOpClass(
+                            django.db.models.functions.text.Upper("name")
+                        ),
+                        name="label_name_upper_idx",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="siteuser",
+                    index=models.Index(
+                        task_manager.db.functions.PatternOpClass(
+                            django.db.models.functions.text.Upper("username")
+                        ),
+                        name="siteuser_username_upper_idx",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="siteuser",
+                    index=models.Index(
+                        task_manager.db.functions.PatternOpClass(
+                            django.db.models.functions.text.Upper("first_name")
+                        ),
+                        name="siteuser_first_name_upper_idx",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="siteuser",
+                    index=models.Index(
+                        task_manager.db.functions.PatternOpClass(
+                            django.db.models.functions.text.Upper("last_name")
+                        ),
+                        name="siteuser_last_name_upper_idx",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -1,7 +1,17 @@
+from collections import Counter
+from functools import partial, reduce
+from operator import or_
+from types import MappingProxyType
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import search
+from task_manager.cache import forget_object_versions, forget_user_tasks
+from task_manager.db.functions import PatternOpClass
+
 
 class SiteUser(AbstractUser):
     """Model representing Task manager user account."""
@@ -26,6 +36,26 @@ class SiteUser(AbstractUser):
 
     class Meta(object):
         verbose_name = _("User")
+        # Index matches users list ordering, id breaks ties of signup date;
+        # upper-cased names are indexed for case-insensitive prefix search
+        indexes = [
+            models.Index(
+                fields=["-signup_date", "-id"],
+                name="siteuser_signup_date_idx",
+            ),
+            models.Index(
+                PatternOpClass(Upper("username")),
+                name="siteuser_username_upper_idx",
+            ),
+            models.Index(
+                PatternOpClass(Upper("first_name")),
+                name="siteuser_first_name_upper_idx",
+            ),
+            models.Index(
+                PatternOpClass(Upper("last_name")),
+                name="siteuser_last_name_upper_idx",
+            ),
+        ]
 
     def __str__(self):
         """Represent an instance as a string."""
@@ -47,6 +77,18 @@ class Label(models.Model):
 
     class Meta(object):
         verbose_name = _("Label")
+        # Index matches labels list ordering (-created_on, -id);
+        # upper-cased name is indexed for case-insensitive prefix search
+        indexes = [
+            models.Index(
+                fields=["-created_on", "-id"],
+                name="label_created_on_idx",
+            ),
+            models.Index(
+                PatternOpClass(Upper("name")),
+                name="label_name_upper_idx",
+            ),
+        ]
 
     def __str__(self):
         """Represent an instance as a string."""
@@ -69,12 +111,251 @@ class Status(models.Model):
 
     class Meta(object):
         verbose_name = _("Status")
+        # Index matches statuses list ordering (-created_on, -id)
+        indexes = [
+            models.Index(
+                fields=["-created_on", "-id"],
+                name="status_created_on_idx",
+            ),
+        ]
 
     def __str__(self):
         """Represent an instance as a string."""
         return self.name
 
 
+# Number of tasks changed by a single statement of bulk operations
+BULK_BATCH_SIZE = 1000
+
+# Dimensions tasks are counted by
+CounterDimension = models.TextChoices(
+    "CounterDimension",
+    [
+        ("TOTAL", "total"),
+        ("STATUS", "status"),
+        ("PERFORMER", "performer"),
+        ("LABEL", "label"),
+    ],
+)
+
+# Object id of the counter of all tasks
+TOTAL_COUNTER_ID = 0
+
+# Counter dimensions of task relations changed in bulk
+RELATION_DIMENSIONS = MappingProxyType(
+    {
+        "status": CounterDimension.STATUS,
+        "performer": CounterDimension.PERFORMER,
+    },
+)
+
+# Relations shown on tasks list and task details pages
+TASK_RELATIONS = ("status", "creator", "performer")
+
+
+def counter_keys_of(status_id, performer_id):
+    """Return keys of counters a task with the relations counts in."""
+    return (
+        (CounterDimension.TOTAL, TOTAL_COUNTER_ID),
+        (CounterDimension.STATUS, status_id),
+        (CounterDimension.PERFORMER, performer_id),
+    )
+
+
+class TaskBulkChangesMixin:
+    """Changes of many tasks at once, adjusting task counters in bulk."""
+
+    def set_relation(self, field_name, related, batch_size=BULK_BATCH_SIZE):
+        """
+        Set status or performer of the tasks, return number of tasks.
+
+        Tasks are locked and read along with their current relation, so
+        counter deltas match the updated rows even if the tasks are
+        changed concurrently, then updated with one UPDATE statement per
+        batch_size tasks.
+        """
+        dimension = RELATION_DIMENSIONS[field_name]
+        deltas = Counter()
+        with transaction.atomic():
+            locked = self.order_by().select_for_update(of=("self",))
+            current_related = dict(locked.values_list("pk", field_name))
+            for related_id in current_related.values():
+                deltas[(dimension, related_id)] -= 1
+                deltas[(dimension, related.pk)] += 1
+            task_ids = list(current_related)
+            for start in range(0, len(task_ids), batch_size):
+                self.model.objects.filter(
+                    pk__in=task_ids[start:start + batch_size],
+                ).update(**{field_name: related})
+            TaskCounter.objects.adjust(deltas)
+            if field_name == "performer":
+                user_pks = {user_pk for _, user_pk in deltas}
+                transaction.on_commit(
+                    partial(forget_user_tasks, field_name, user_pks),
+                )
+        return len(task_ids)
+
+    def add_labels(self, labels, batch_size=BULK_BATCH_SIZE):
+        """
+        Add labels to the tasks, return number of tasks.
+
+        Links are inserted in bulk, links tasks already have are skipped
+        by the database.
+        """
+        through = self.model.label.through
+        num_tasks = 0
+        deltas = Counter()
+        with transaction.atomic():
+            for batch in self.id_batches(batch_size):
+                linked_labels = through.objects.filter(
+                    task_id__in=batch,
+                    label__in=labels,
+                ).values_list("label")
+                linked = dict(
+                    linked_labels.annotate(num_linked=models.Count("task")),
+                )
+                for label in labels:
+                    key = (CounterDimension.LABEL, label.pk)
+                    deltas[key] += len(batch) - linked.get(label.pk, 0)
+                through.objects.bulk_create(
+                    [
+                        through(task_id=task_id, label_id=added.pk)
+                        for task_id in batch
+                        for added in labels
+                    ],
+                    ignore_conflicts=True,
+                )
+                num_tasks += len(batch)
+            TaskCounter.objects.adjust(deltas)
+        return num_tasks
+
+    def bulk_delete(self, batch_size=BULK_BATCH_SIZE):
+        """
+        Delete the tasks, return number of deleted tasks.
+
+        Each batch of tasks is deleted with two DELETE statements, one for
+        label links and one for tasks, without loading the tasks as the
+        deletion collector does for models with many-to-many relations.
+        Task signals are not sent, task counters are adjusted in bulk,
+        cached task lists of creators and performers and versions of the
+        tasks are dropped.
+        """
+        through = self.model.label.through
+        num_deleted = 0
+        deltas = Counter()
+        # Creators are read along with ids, to drop their task lists
+        task_rows = list(
+            self.order_by().values_list("pk", "creator").distinct(),
+        )
+        task_ids = [task_id for task_id, _ in task_rows]
+        with transaction.atomic():
+            for start in range(0, len(task_ids), batch_size):
+                batch = task_ids[start:start + batch_size]
+                tasks = self.model.objects.filter(pk__in=batch)
+                deltas.update(tasks.counter_deltas(sign=-1))
+                through.objects.filter(task_id__in=batch).delete()
+                num_deleted += tasks._raw_delete(tasks.db)  # noqa: WPS437
+            TaskCounter.objects.adjust(deltas)
+            self._forget_deleted(task_rows, deltas)
+        return num_deleted
+
+    def _forget_deleted(self, task_rows, deltas):
+        """Drop cached lists and versions once deleted tasks are gone."""
+        creator_pks = {creator_pk for _, creator_pk in task_rows}
+        transaction.on_commit(
+            partial(forget_user_tasks, "creator", creator_pks),
+        )
+        performer_pks = {
+            user_pk
+            for dimension, user_pk in deltas
+            if dimension == CounterDimension.PERFORMER
+        }
+        transaction.on_commit(
+            partial(forget_user_tasks, "performer", performer_pks),
+        )
+        task_ids = [task_id for task_id, _ in task_rows]
+        transaction.on_commit(
+            partial(forget_object_versions, self.model, task_ids),
+        )
+
+
+class TaskQuerySet(TaskBulkChangesMixin, models.QuerySet):
+    """Task queryset with relation loading plans for the task views."""
+
+    list_fields = (
+        "name",
+        "created_on",
+        "status__name",
+        "creator__username",
+        "creator__first_name",
+        "creator__last_name",
+        "performer__username",
+        "performer__first_name",
+        "performer__last_name",
+    )
+    detail_fields = (
+        "name",
+        "description",
+        "created_on",
+        "status__name",
+        "creator__username",
+        "performer__username",
+    )
+
+    def for_list(self):
+        """Join task relations and load only columns shown in tasks list."""
+        return self.select_related(*TASK_RELATIONS).only(*self.list_fields)
+
+    def for_detail(self):
+        """Join task relations, prefetch labels for task details page."""
+        tasks = self.select_related(*TASK_RELATIONS).prefetch_related(
+            models.Prefetch("label", queryset=Label.objects.only("name")),
+        )
+        return tasks.only(*self.detail_fields)
+
+    def search(self, text):
+        """Return tasks matching search text, annotated with search rank."""
+        return search.search_tasks(self, text)
+
+    def deletable_by(self, user):
+        """Return tasks the user may delete: own ones, or all for superuser."""
+        if user.is_superuser:
+            return self
+        return self.filter(creator=user)
+
+    def id_batches(self, batch_size):
+        """Return ids of the tasks split in lists of batch_size ids."""
+        task_ids = self.order_by().values_list("pk", flat=True).distinct()
+        task_ids = list(task_ids)
+        return [
+            task_ids[start:start + batch_size]
+            for start in range(0, len(task_ids), batch_size)
+        ]
+
+    def counter_deltas(self, sign=1):
+        """
+        Return changes of task counters made by adding the tasks.
+
+        With sign -1 return changes made by removing the tasks.
+        """
+        deltas = Counter()
+        groups = self.order_by().values_list("status", "performer").annotate(
+            num_tasks=models.Count("pk", distinct=True),
+        )
+        for status_id, performer_id, num_tasks in groups:
+            for key in counter_keys_of(status_id, performer_id):
+                deltas[key] += sign * num_tasks
+        links = Task.label.through.objects.filter(
+            task_id__in=self.values("pk"),
+        )
+        label_groups = links.values_list("label").annotate(
+            num_labeled=models.Count("task", distinct=True),
+        )
+        for label_id, num_labeled in label_groups:
+            deltas[(CounterDimension.LABEL, label_id)] += sign * num_labeled
+        return deltas
+
+
 class Task(models.Model):
     """Model representing a task."""
 
@@ -113,9 +394,177 @@ class Task(models.Model):
         verbose_name=_("Label"),
     )
 
+    # Django looks tasks up with the default manager name
+    objects = TaskQuerySet.as_manager()  # noqa: WPS110
+
     class Meta(object):
         verbose_name = _("Task")
+        # Indexes match tasks list ordering (-created_on, -id), alone
+        # and combined with each of the foreign key filters
+        indexes = [
+            models.Index(
+                fields=["-created_on", "-id"],
+                name="task_created_on_idx",
+            ),
+            models.Index(
+                fields=["status", "-created_on", "-id"],
+                name="task_status_created_on_idx",
+            ),
+            models.Index(
+                fields=["performer", "-created_on", "-id"],
+                name="task_performer_created_on_idx",
+            ),
+            models.Index(
+                fields=["creator", "-created_on", "-id"],
+                name="task_creator_created_on_idx",
+            ),
+        ]
 
     def __str__(self):
         """Represent an instance as a string."""
         return self.name
+
+    def save(self, *args, **kwargs):
+        """Save the task along with its task counters changes."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def get_counter_keys(self):
+        """Return keys of counters the task counts in, None if deferred."""
+        if {"status_id", "performer_id"} & self.get_deferred_fields():
+            return None
+        return counter_keys_of(self.status_id, self.performer_id)
+
+
+class TaskCounterQuerySet(models.QuerySet):
+    """Queryset of task counters with atomic adjustment."""
+
+    def adjust(self, deltas, batch_size=BULK_BATCH_SIZE):
+        """
+        Add deltas, a mapping of (dimension, object id) to change, to counters.
+
+        Missing counters are created first, then each batch of counters is
+        changed by a single UPDATE statement, so concurrent adjustments
+        add up.
+        """
+        deltas = [(key, delta) for key, delta in deltas.items() if delta]
+        for start in range(0, len(deltas), batch_size):
+            self._adjust_batch(deltas[start:start + batch_size])
+
+    def counts(self, dimension, object_ids=None):
+        """Return mapping of object id to number of tasks."""
+        counters = self.filter(dimension=dimension)
+        if object_ids is not None:
+            counters = counters.filter(object_id__in=object_ids)
+        return dict(counters.values_list("object_id", "count"))
+
+    def reconcile(self, dry_run=False):
+        """
+        Recompute counters from tasks in bulk, fix and return the drift.
+
+        Drift maps (dimension, object id) of every wrong counter to its
+        (stored, actual) number of tasks.
+        """
+        actual = Task.objects.counter_deltas()
+        stored = {
+            (dimension, object_id): count
+            for dimension, object_id, count in self.values_list(
+                "dimension",
+                "object_id",
+                "count",
+            )
+        }
+        drift = {
+            key: (stored.get(key, 0), actual.get(key, 0))
+            for key in stored.keys() | actual.keys()
+            if stored.get(key, 0) != actual.get(key, 0)
+        }
+        if drift and not dry_run:
+            with transaction.atomic():
+                self.adjust(
+                    {
+                        key: actual_count - stored_count
+                        for key, (stored_count, actual_count) in drift.items()
+                    },
+                )
+                self.filter(count=0).delete()
+        return drift
+
+    def _adjust_batch(self, deltas):
+        """Add deltas, a list of (key, change), to counters."""
+        self.bulk_create(
+            [
+                TaskCounter(dimension=dimension, object_id=object_id)
+                for (dimension, object_id), _ in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        changes = [
+            (models.Q(dimension=dimension, object_id=object_id), delta)
+            for (dimension, object_id), delta in deltas
+        ]
+        counters = self.filter(
+            reduce(or_, (condition for condition, _ in changes)),
+        )
+        counters.update(
+            count=models.F("count") + models.Case(
+                *(
+                    models.When(condition, then=delta)
+                    for condition, delta in changes
+                ),
+                default=0,
+            ),
+        )
+
+
+class TaskCounter(models.Model):
+    """
+    Number of tasks per status, per performer and per label, and in total.
+
+    Counters are adjusted along with the changes of tasks, so that task
+    numbers are read without grouping the tasks table.
+    """
+
+    dimension = models.CharField(
+        max_length=20,
+        choices=CounterDimension.choices,
+    )
+    object_id = models.PositiveBigIntegerField()
+    count = models.IntegerField(default=0)
+
+    # Django looks counters up with the default manager name
+    objects = TaskCounterQuerySet.as_manager()  # noqa: WPS110
+
+    class Meta(object):
+        verbose_name = _("Task counter")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "object_id"],
+                name="task_counter_unique",
+            ),
+        ]
+
+    def __str__(self):
+        """Represent the counter as a string."""
+        return f"{self.dimension} {self.object_id}: {self.count}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of an unfinished tasks import.
+
+    Saved in the transaction writing every batch, so a resumed import
+    continues after the last committed batch and never writes it twice.
+    """
+
+    source = models.CharField(max_length=1024, unique=True)
+    rows_done = models.PositiveBigIntegerField(default=0)
+    imported = models.PositiveBigIntegerField(default=0)
+    rejected = models.PositiveBigIntegerField(default=0)
+
+    class Meta(object):
+        verbose_name = _("Import checkpoint")
+
+    def __str__(self):
+        """Represent the checkpoint as a string."""
+        return f"{self.source}: {self.rows_done} rows"
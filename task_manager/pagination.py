@@ -0,0 +1,423 @@
+import base64
+import datetime
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+# Directions of cursors: to the next and to the previous page
+FORWARD = "n"
+BACKWARD = "p"
+
+
+class InvalidCursorError(Exception):
+    """Pagination cursor can not be decoded or does not match ordering."""
+
+
+def field_name(field):
+    """Strip ordering direction from field name."""
+    return field.lstrip("-")
+
+
+def reverse_order(field):
+    """Reverse ordering direction of the field."""
+    if field.startswith("-"):
+        return field[1:]
+    return f"-{field}"
+
+
+def encode_cursor_value(cursor_value):
+    """Serialize cursor value without losing precision."""
+    if isinstance(cursor_value, (datetime.date, datetime.time)):
+        return cursor_value.isoformat()
+    return str(cursor_value)
+
+
+def is_foreign_datetime(cursor_value):
+    """
+    Check if the value is a datetime never encoded by the paginator.
+
+    Encoded datetimes are aware if time zone support is enabled and
+    naive otherwise; comparing the two kinds fails.
+    """
+    if not isinstance(cursor_value, datetime.datetime):
+        return False
+    return timezone.is_naive(cursor_value) == settings.USE_TZ
+
+
+def seek_filter(ordering, cursor_values, after):
+    """
+    Build condition selecting rows located after/before the cursor.
+
+    For ordering (a, b, c) rows after the cursor satisfy
+    `a > A OR (a = A AND b > B) OR (a = A AND b = B AND c > C)`,
+    with comparisons flipped for descending fields.
+    """
+    condition = models.Q()
+    equal_prefix = models.Q()
+    for field, cursor_value in zip(ordering, cursor_values):
+        name = field_name(field)
+        lookup = "lt" if field.startswith("-") == after else "gt"
+        condition |= equal_prefix & models.Q(
+            **{f"{name}__{lookup}": cursor_value},
+        )
+        equal_prefix &= models.Q(**{name: cursor_value})
+    return condition
+
+
+class CursorCodec:
+    """
+    Encoder of cursors pointing to rows of a queryset.
+
+    Cursors are opaque url-safe strings encoding the direction and the
+    ordering field values of the row.
+    """
+
+    def __init__(self, queryset, ordering):
+        """Set up codec of the queryset ordering fields."""
+        self.queryset = queryset
+        self.ordering = ordering
+
+    def encode(self, direction, instance):
+        """Encode cursor pointing from the instance in given direction."""
+        cursor_values = [
+            getattr(instance, field_name(field)) for field in self.ordering
+        ]
+        payload = json.dumps(
+            [direction, cursor_values],
+            default=encode_cursor_value,
+            separators=(",", ":"),
+        )
+        encoded = base64.urlsafe_b64encode(payload.encode())
+        return encoded.decode().rstrip("=")
+
+    def decode(self, cursor):
+        """Decode cursor into direction and ordering field values."""
+        try:
+            direction, raw_values = self._load(cursor)
+            cursor_values = self._to_python(raw_values)
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursorError(cursor)
+        if any(map(is_foreign_datetime, cursor_values)):
+            raise InvalidCursorError(cursor)
+        return direction, cursor_values
+
+    def _load(self, cursor):
+        """
+        Return direction and raw values of the cursor.
+
+        Raise ValueError if they don't match the ordering.
+        """
+        padding = "=" * (-len(cursor) % 4)
+        payload = base64.urlsafe_b64decode(cursor + padding)
+        direction, raw_values = json.loads(payload)
+        if direction not in {FORWARD, BACKWARD}:
+            raise ValueError(f"Unknown cursor direction: {direction}")
+        if len(raw_values) != len(self.ordering):
+            raise ValueError(f"Cursor doesn't match ordering: {raw_values}")
+        return direction, raw_values
+
+    def _to_python(self, raw_values):
+        """Convert raw values to values of the ordering fields."""
+        if not isinstance(raw_values, list):
+            raise TypeError(f"Expected list of values, got: {raw_values}")
+        return [
+            self._output_field(field).to_python(raw_value)
+            for field, raw_value in zip(self.ordering, raw_values)
+        ]
+
+    def _output_field(self, field):
+        """Return model field or annotation field used for ordering."""
+        name = field_name(field)
+        meta = self.queryset.model._meta  # noqa: WPS437
+        if name == "pk":
+            return meta.pk
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return meta.get_field(name)
+
+
+class KeysetPage:
+    """A page of objects returned by KeysetPaginator."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        """Store page objects and cursors pointing to adjacent pages."""
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        """Iterate over page objects."""
+        return iter(self.object_list)
+
+    def __len__(self):
+        """Return number of objects on the page."""
+        return len(self.object_list)
+
+    def has_next(self):
+        """Check if there is a page after the current one."""
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """Check if there is a page before the current one."""
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        """Check if there are pages besides the current one."""
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by the values of its ordering fields.
+
+    Instead of OFFSET, every page is fetched with a
+    `WHERE (ordering fields) < (cursor values)` condition, so retrieving
+    a page costs the same at any depth as long as the ordering fields are
+    covered by an index. Ordering must be unique (end it with the primary
+    key) and must not contain nullable fields.
+    """
+
+    def __init__(self, queryset, per_page, ordering=("-created_on", "-id")):
+        """Set up paginator for the queryset and ordering fields."""
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.codec = CursorCodec(queryset, self.ordering)
+
+    def page(self, cursor=None):
+        """Return the page pointed to by the cursor (first page if None)."""
+        direction, queryset = self._page_queryset(cursor)
+        return self._make_cursor_page(direction, list(queryset))
+
+    async def apage(self, cursor=None):
+        """Return the page pointed to by the cursor, fetched asynchronously."""
+        direction, queryset = self._page_queryset(cursor)
+        instances = [instance async for instance in queryset]
+        return self._make_cursor_page(direction, instances)
+
+    def _page_queryset(self, cursor):
+        """
+        Return direction of the cursor and queryset of its page.
+
+        Queryset fetches one object more than the page size to check
+        if more objects remain. Direction is None for the first page.
+        """
+        if not cursor:
+            return None, self._limit(self.queryset, self.ordering)
+        direction, cursor_values = self.codec.decode(cursor)
+        queryset = self.queryset.filter(
+            seek_filter(
+                self.ordering,
+                cursor_values,
+                after=direction == FORWARD,
+            ),
+        )
+        if direction == FORWARD:
+            return direction, self._limit(queryset, self.ordering)
+        reversed_ordering = [reverse_order(field) for field in self.ordering]
+        return direction, self._limit(queryset, reversed_ordering)
+
+    def _limit(self, queryset, ordering):
+        """Order queryset and limit it to one page plus one object."""
+        return queryset.order_by(*ordering)[: self.per_page + 1]
+
+    def _make_cursor_page(self, direction, instances):
+        """Build a page from objects fetched in the cursor direction."""
+        has_more = len(instances) > self.per_page
+        instances = instances[: self.per_page]
+        if direction is None:
+            return self._make_page(
+                instances,
+                has_next=has_more,
+                has_previous=False,
+            )
+        if direction == FORWARD:
+            return self._make_page(
+                instances,
+                has_next=has_more,
+                has_previous=True,
+            )
+        instances.reverse()
+        return self._make_page(
+            instances,
+            has_next=True,
+            has_previous=has_more,
+        )
+
+    def _make_page(self, instances, has_next, has_previous):
+        """Build a page with cursors to the neighbouring pages."""
+        if not instances:
+            return KeysetPage(instances)
+        next_cursor = None
+        previous_cursor = None
+        if has_next:
+            next_cursor = self.codec.encode(FORWARD, instances[-1])
+        if has_previous:
+            previous_cursor = self.codec.encode(BACKWARD, instances[0])
+        return KeysetPage(instances, next_cursor, previous_cursor)
+
+
+def count_greater_keys(keys, key, inclusive=False):
+    """
+    Return number of keys greater than the key in descending keys.
+
+    With `inclusive` keys equal to the key are counted too.
+    """
+    low = 0
+    high = len(keys)
+    while low < high:
+        middle = (low + high) // 2
+        current = keys[middle]
+        if current > key or (inclusive and current == key):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class CachedKeysPaginator(KeysetPaginator):
+    """
+    Keyset paginator finding pages in a list of ordering keys.
+
+    Keys are tuples of ordering field values of the newest objects of the
+    queryset, ordered as the queryset, ending with the primary key.
+    All ordering fields must be descending. Pages found in the keys are
+    fetched by primary keys, so a page costs O(page size) whatever the
+    number of objects. Pages beyond incomplete keys are fetched from the
+    queryset as KeysetPaginator does. Objects missing from the queryset
+    are left out of their page.
+    """
+
+    def __init__(self, queryset, per_page, cached_keys, **kwargs):
+        """Set up paginator of cached keys and whether they are all keys."""
+        super().__init__(queryset, per_page, **kwargs)
+        keys, complete = cached_keys
+        self.keys = keys
+        self.complete = complete
+
+    def page(self, cursor=None):
+        """Return the page pointed to by the cursor (first page if None)."""
+        direction = None
+        cursor_key = None
+        if cursor:
+            direction, cursor_values = self.codec.decode(cursor)
+            cursor_key = tuple(cursor_values)
+        page_keys = self._seek_keys(direction, cursor_key)
+        if page_keys is None:
+            return super().page(cursor)
+        page_pks = [key[-1] for key in page_keys]
+        found = self.queryset.in_bulk(page_pks)
+        return self._make_cursor_page(
+            direction,
+            [found[pk] for pk in page_pks if pk in found],
+        )
+
+    def _seek_keys(self, direction, cursor_key):
+        """
+        Return keys of the page plus one in the cursor direction.
+
+        Return None if the page is not known from the keys.
+        """
+        if direction == BACKWARD:
+            return self._seek_previous_keys(cursor_key)
+        start = 0
+        if direction == FORWARD:
+            start = count_greater_keys(self.keys, cursor_key, inclusive=True)
+        page_keys = self.keys[start:start + self.per_page + 1]
+        if len(page_keys) > self.per_page or self.complete:
+            return page_keys
+        return None
+
+    def _seek_previous_keys(self, cursor_key):
+        """Return keys of the previous page plus one, reversed."""
+        end = count_greater_keys(self.keys, cursor_key)
+        # Keys greater than the cursor are known if it is within the keys
+        if end == len(self.keys) and not self.complete:
+            return None
+        start = max(end - self.per_page - 1, 0)
+        page_keys = self.keys[start:end]
+        page_keys.reverse()
+        return page_keys
+
+
+class UncountedPage(Page):
+    """A page of UncountedPaginator, knowing only if a next page exists."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        """Store page objects and whether more objects follow."""
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        """Check if there is a page after the current one."""
+        return self._has_next
+
+    def start_index(self):
+        """Return 1-based index of the first object on the page."""
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        """Return 1-based index of the last object on the page."""
+        return self.start_index() + len(self.object_list) - 1
+
+
+class UncountedPaginator(Paginator):
+    """
+    Page-number paginator that never counts objects.
+
+    Every page is fetched with one more object than the page size to tell
+    if a next page exists, so the `COUNT(*)` query is skipped. Total
+    count and number of pages are unknown.
+    """
+
+    count = None
+    num_pages = None
+
+    def validate_number(self, number):
+        """Validate 1-based page number without checking the last page."""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        """Return the page with the 1-based number."""
+        number = self.validate_number(number)
+        return self._make_number_page(number, list(self._page_slice(number)))
+
+    async def apage(self, number):
+        """Return the page with the 1-based number, fetched asynchronously."""
+        number = self.validate_number(number)
+        instances = [
+            instance async for instance in self._page_slice(number)
+        ]
+        return self._make_number_page(number, instances)
+
+    def _page_slice(self, number):
+        """Return objects of the page plus one to check if more remain."""
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom:bottom + self.per_page + 1]
+
+    def _make_number_page(self, number, instances):
+        """Build the page from objects fetched for it."""
+        if not instances and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        return UncountedPage(
+            instances[: self.per_page],
+            number,
+            self,
+            has_next=len(instances) > self.per_page,
+        )
@@ -0,0 +1,191 @@
+"""
+Full-text search over task name and description.
+
+PostgreSQL matches the stored `search_vector` column of tasks (generated
+from name and description, GIN indexed), SQLite matches the FTS5 table
+`task_manager_task_fts` kept in sync by triggers; both are created by
+the 0006 migration. Other databases fall back to substring matching.
+
+SQLite drops triggers of a table when Django remakes it to alter its
+columns, so missing triggers are recreated after every migrate.
+
+Every word of the search text matches words starting with it, matches
+in task name rank higher than in description.
+"""
+import re
+from types import MappingProxyType
+
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+from django.db.models.signals import post_migrate
+
+# Name of the relevance annotation of search results, higher is better
+SEARCH_RANK = "search_rank"
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR_COLUMN = "search_vector"
+
+# FTS5 MATCH and bm25() have no ORM expressions, the match text is
+# always passed as a query parameter. Matches in name weigh twice as
+# much in ranking, bm25() is lower for better matches.
+FTS_MATCH_SQL = (
+    "SELECT rowid FROM task_manager_task_fts "  # noqa: WPS323
+    "WHERE task_manager_task_fts MATCH %s"
+)
+FTS_RANK_SQL = (
+    "SELECT -bm25(task_manager_task_fts, 2.0, 1.0) "  # noqa: WPS323
+    "FROM task_manager_task_fts "
+    "WHERE task_manager_task_fts MATCH %s "
+    "AND rowid = task_manager_task.id"
+)
+
+# Triggers keeping FTS5 table of tasks in sync, as created by the 0006
+# migration
+FTS_TRIGGERS = MappingProxyType(
+    {
+        "task_manager_task_fts_insert": (
+            "CREATE TRIGGER task_manager_task_fts_insert "
+            "AFTER INSERT ON task_manager_task BEGIN "
+            "INSERT INTO task_manager_task_fts (rowid, name, description) "
+            "VALUES (new.id, new.name, new.description); "
+            "END;"
+        ),
+        "task_manager_task_fts_delete": (
+            "CREATE TRIGGER task_manager_task_fts_delete "
+            "AFTER DELETE ON task_manager_task BEGIN "
+            "INSERT INTO task_manager_task_fts "
+            "(task_manager_task_fts, rowid, name, description) "
+            "VALUES ('delete', old.id, old.name, old.description); "
+            "END;"
+        ),
+        "task_manager_task_fts_update": (
+            "CREATE TRIGGER task_manager_task_fts_update "
+            "AFTER UPDATE OF name, description ON task_manager_task BEGIN "
+            "INSERT INTO task_manager_task_fts "
+            "(task_manager_task_fts, rowid, name, description) "
+            "VALUES ('delete', old.id, old.name, old.description); "
+            "INSERT INTO task_manager_task_fts (rowid, name, description) "
+            "VALUES (new.id, new.name, new.description); "
+            "END;"
+        ),
+    },
+)
+FTS_REBUILD_SQL = (
+    "INSERT INTO task_manager_task_fts (task_manager_task_fts) "
+    "VALUES ('rebuild')"
+)
+
+
+class TableColumn(models.Expression):
+    """Column of the queried table which is not a model field."""
+
+    def __init__(self, column, output_field):
+        """Set up the column read as the output field."""
+        super().__init__(output_field=output_field)
+        self.column = column
+
+    def as_sql(self, compiler, connection):
+        """Return the column qualified by alias of the queried table."""
+        table_alias = compiler.quote_name_unless_alias(
+            compiler.query.get_initial_alias(),
+        )
+        column = connection.ops.quote_name(self.column)
+        return f"{table_alias}.{column}", []
+
+
+def search_terms(text):
+    """Return words of the search text, dropping query syntax."""
+    return re.findall(r"\w+", text or "")
+
+
+def search_tasks(queryset, text):
+    """Return tasks matching the search text, annotated with rank."""
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        return _search_postgresql(queryset, terms)
+    if vendor == "sqlite":
+        return _search_sqlite(queryset, terms)
+    return _search_substring(queryset, terms)
+
+
+def _search_postgresql(queryset, terms):
+    """Match tasks search vector with prefix query, rank by ts_rank."""
+    # Imports psycopg2, which is installed along with PostgreSQL only
+    from django.contrib.postgres import search  # noqa: WPS433
+
+    vector = TableColumn(
+        SEARCH_VECTOR_COLUMN,
+        output_field=search.SearchVectorField(),
+    )
+    prefix_query = search.SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
+    matching = queryset.alias(**{SEARCH_VECTOR_COLUMN: vector}).filter(
+        **{SEARCH_VECTOR_COLUMN: prefix_query},
+    )
+    # Ranked in double precision, so that the rank passed in pagination
+    # cursors compares equal to the stored one
+    rank = Cast(search.SearchRank(vector, prefix_query), models.FloatField())
+    return matching.annotate(**{SEARCH_RANK: rank})
+
+
+def _search_sqlite(queryset, terms):
+    """Match tasks in FTS5 table with prefix query, rank by bm25."""
+    match = " ".join('"{0}"*'.format(term) for term in terms)
+    # Raw SQL of FTS5 queries is constant, see FTS_MATCH_SQL
+    matching = queryset.filter(
+        pk__in=RawSQL(FTS_MATCH_SQL, (match,)),  # noqa: S611
+    )
+    rank = RawSQL(FTS_RANK_SQL, (match,), models.FloatField())  # noqa: S611
+    return matching.annotate(**{SEARCH_RANK: rank})
+
+
+def _search_substring(queryset, terms):
+    """Match tasks containing every term, all ranked equally."""
+    condition = models.Q()
+    for term in terms:
+        condition &= models.Q(name__icontains=term) | models.Q(
+            description__icontains=term,
+        )
+    return queryset.filter(condition).annotate(
+        **{SEARCH_RANK: models.Value(0, output_field=models.FloatField())},
+    )
+
+
+def create_missing_fts_triggers(using, **kwargs):
+    """
+    Recreate dropped triggers of FTS5 table of tasks.
+
+    The table is rebuilt from tasks, which could change while triggers
+    were missing.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        table_names = connection.introspection.table_names(cursor)
+        if "task_manager_task_fts" not in table_names:
+            return
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'",
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = FTS_TRIGGERS.keys() - existing
+        for trigger_name in sorted(missing):
+            cursor.execute(FTS_TRIGGERS[trigger_name])
+        if missing:
+            cursor.execute(FTS_REBUILD_SQL)
+
+
+def connect_signals(sender):
+    """Connect receiver recreating FTS5 triggers after migrations."""
+    post_migrate.connect(
+        create_missing_fts_triggers,
+        sender=sender,
+        dispatch_uid="task_manager_create_missing_fts_triggers",
+    )
@@ -0,0 +1,350 @@
+"""
+Invalidation of cached choices and fragments, task counters upkeep.
+
+Cached task lists of users are changed once the transaction commits.
+Counters of cache lookups are written to the caches after requests.
+"""
+from collections import Counter
+from functools import partial
+from types import MappingProxyType
+
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+
+from task_manager import cache
+from task_manager.models import (
+    CounterDimension,
+    Label,
+    SiteUser,
+    Status,
+    Task,
+    TaskCounter,
+    counter_keys_of,
+)
+
+MODEL_NAMESPACES = MappingProxyType(
+    {
+        Status: cache.STATUSES_NAMESPACE,
+        Label: cache.LABELS_NAMESPACE,
+        SiteUser: cache.USERS_NAMESPACE,
+    },
+)
+
+# Fields shown neither in cached choices nor in fragments, i.e. saved
+# on every login
+UNSHOWN_FIELDS = frozenset(("last_login", "password"))
+
+# Models shown in cached template fragments
+FRAGMENT_MODELS = (Task, Status, Label, SiteUser)
+
+# Counters of the objects tasks are counted by
+MODEL_DIMENSIONS = MappingProxyType(
+    {
+        Status: CounterDimension.STATUS,
+        Label: CounterDimension.LABEL,
+        SiteUser: CounterDimension.PERFORMER,
+    },
+)
+
+
+def changes_shown_fields(update_fields):
+    """Check if a save of the fields changes values shown to users."""
+    return update_fields is None or not UNSHOWN_FIELDS.issuperset(
+        update_fields,
+    )
+
+
+def invalidate_model_namespace(sender, update_fields=None, **kwargs):
+    """Bump cache namespace version of the changed model."""
+    if changes_shown_fields(update_fields):
+        cache.bump_namespace_version(MODEL_NAMESPACES[sender])
+
+
+def invalidate_object_fragments(
+    sender,
+    instance,
+    update_fields=None,
+    **kwargs,
+):
+    """Bump version of the changed object shown in cached fragments."""
+    if changes_shown_fields(update_fields):
+        cache.bump_object_versions(sender, [instance.pk])
+
+
+def forget_object_fragments(sender, instance, **kwargs):
+    """Drop version of the deleted object shown in cached fragments."""
+    cache.forget_object_versions(sender, [instance.pk])
+
+
+def remember_task_counters(sender, instance, raw=False, **kwargs):
+    """
+    Find counters the saved task is counted in, unless known.
+
+    The stored row is locked, so that the counters don't change until
+    the save is committed.
+    """
+    if raw or instance.pk is None:
+        return
+    if getattr(instance, "counted_keys", None) is not None:
+        return
+    # Relations not loaded are not saved, so counters don't change
+    if instance.get_counter_keys() is None:
+        return
+    stored = Task.objects.select_for_update().filter(pk=instance.pk)
+    relations = stored.values_list("status_id", "performer_id").first()
+    instance.counted_keys = counter_keys_of(*relations) if relations else ()
+
+
+def count_saved_task(sender, instance, created, raw=False, **kwargs):
+    """Move the saved task between counters of its status and performer."""
+    counter_keys = instance.get_counter_keys()
+    if raw or counter_keys is None:
+        return
+    deltas = Counter(counter_keys)
+    if not created:
+        deltas.subtract(instance.counted_keys or ())
+    TaskCounter.objects.adjust(deltas)
+    instance.counted_keys = counter_keys
+
+
+def remember_task_labels(sender, instance, **kwargs):
+    """Find labels of the task before its label links are deleted."""
+    links = Task.label.through.objects.filter(task_id=instance.pk)
+    instance.counted_label_ids = list(
+        links.values_list("label_id", flat=True),
+    )
+
+
+def count_deleted_task(sender, instance, **kwargs):
+    """Remove the deleted task from its counters."""
+    counted_keys = getattr(instance, "counted_keys", None)
+    deltas = Counter()
+    deltas.subtract(counted_keys or instance.get_counter_keys() or ())
+    deltas.subtract(
+        (CounterDimension.LABEL, label_id)
+        for label_id in getattr(instance, "counted_label_ids", ())
+    )
+    TaskCounter.objects.adjust(deltas)
+
+
+def remember_removed_labels(sender, instance, action, **kwargs):
+    """
+    Find label links about to be removed from tasks.
+
+    Removal signals list requested, not existing, links, so existing
+    links are looked up before removal.
+    """
+    if action not in {"pre_remove", "pre_clear"}:
+        return
+    links = Task.label.through.objects.all()
+    if kwargs["reverse"]:
+        links = links.filter(label_id=instance.pk)
+        linked_field = "task_id"
+    else:
+        links = links.filter(task_id=instance.pk)
+        linked_field = "label_id"
+    if kwargs["pk_set"] is not None:
+        links = links.filter(**{f"{linked_field}__in": kwargs["pk_set"]})
+    instance.removed_label_ids = list(
+        links.values_list("label_id", flat=True),
+    )
+
+
+def count_task_labels(sender, instance, action, **kwargs):
+    """Count tasks per label once labels of tasks are changed."""
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+    deltas = Counter()
+    if action == "post_add" and kwargs["reverse"]:
+        # The label is added to every task of pk_set
+        deltas[(CounterDimension.LABEL, instance.pk)] = len(kwargs["pk_set"])
+    elif action == "post_add":
+        deltas.update(
+            (CounterDimension.LABEL, label_id) for label_id in kwargs["pk_set"]
+        )
+    else:
+        deltas.subtract(
+            (CounterDimension.LABEL, label_id)
+            for label_id in getattr(instance, "removed_label_ids", ())
+        )
+        instance.removed_label_ids = ()
+    TaskCounter.objects.adjust(deltas)
+
+
+def remember_task_performer(sender, instance, **kwargs):
+    """Find performer of the saved task before the change."""
+    counted_keys = getattr(instance, "counted_keys", None) or ()
+    instance.stored_performer_id = dict(counted_keys).get(
+        CounterDimension.PERFORMER,
+    )
+
+
+def cache_saved_user_task(sender, instance, created, raw=False, **kwargs):
+    """Add the saved task to cached task lists of its users."""
+    if raw:
+        return
+    if "created_on" in instance.get_deferred_fields():
+        transaction.on_commit(
+            partial(
+                cache.forget_user_tasks,
+                "performer",
+                [instance.performer_id],
+            ),
+        )
+        return
+    task_key = (instance.created_on, instance.pk)
+    if created:
+        transaction.on_commit(
+            partial(
+                cache.add_user_task,
+                "creator",
+                instance.creator_id,
+                task_key,
+            ),
+        )
+    elif instance.stored_performer_id in {None, instance.performer_id}:
+        return
+    else:
+        transaction.on_commit(
+            partial(
+                cache.remove_user_task,
+                "performer",
+                instance.stored_performer_id,
+                instance.pk,
+            ),
+        )
+    transaction.on_commit(
+        partial(
+            cache.add_user_task,
+            "performer",
+            instance.performer_id,
+            task_key,
+        ),
+    )
+
+
+def uncache_deleted_user_task(sender, instance, **kwargs):
+    """Remove the deleted task from cached task lists of its users."""
+    for field_name in ("creator", "performer"):
+        transaction.on_commit(
+            partial(
+                cache.remove_user_task,
+                field_name,
+                getattr(instance, f"{field_name}_id"),
+                instance.pk,
+            ),
+        )
+
+
+def drop_object_counter(sender, instance, **kwargs):
+    """Delete counter of the deleted status, label or user."""
+    TaskCounter.objects.filter(
+        dimension=MODEL_DIMENSIONS[sender],
+        object_id=instance.pk,
+    ).delete()
+
+
+def flush_lookup_stats(sender, **kwargs):
+    """Write counters of cache lookups of the process, if it is time."""
+    cache.lookup_stats.flush()
+
+
+def connect_cache_signals():
+    """Connect receivers invalidating cached choices and fragments."""
+    request_finished.connect(
+        flush_lookup_stats,
+        dispatch_uid="task_manager_flush_lookup_stats",
+    )
+    for choices_model, namespace in MODEL_NAMESPACES.items():
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_model_namespace,
+                sender=choices_model,
+                dispatch_uid=f"task_manager_invalidate_{namespace}",
+            )
+    for fragment_model in FRAGMENT_MODELS:
+        model_name = fragment_model.__name__.lower()
+        post_save.connect(
+            invalidate_object_fragments,
+            sender=fragment_model,
+            dispatch_uid=f"task_manager_invalidate_{model_name}_fragments",
+        )
+        post_delete.connect(
+            forget_object_fragments,
+            sender=fragment_model,
+            dispatch_uid=f"task_manager_forget_{model_name}_fragments",
+        )
+
+
+def connect_counter_signals():
+    """Connect receivers keeping task counters up to date."""
+    for counted_model, dimension in MODEL_DIMENSIONS.items():
+        post_delete.connect(
+            drop_object_counter,
+            sender=counted_model,
+            dispatch_uid=f"task_manager_drop_{dimension}_counter",
+        )
+    pre_save.connect(
+        remember_task_counters,
+        sender=Task,
+        dispatch_uid="task_manager_remember_task_counters",
+    )
+    post_save.connect(
+        count_saved_task,
+        sender=Task,
+        dispatch_uid="task_manager_count_saved_task",
+    )
+    pre_delete.connect(
+        remember_task_labels,
+        sender=Task,
+        dispatch_uid="task_manager_remember_task_labels",
+    )
+    post_delete.connect(
+        count_deleted_task,
+        sender=Task,
+        dispatch_uid="task_manager_count_deleted_task",
+    )
+    m2m_changed.connect(
+        remember_removed_labels,
+        sender=Task.label.through,
+        dispatch_uid="task_manager_remember_removed_labels",
+    )
+    m2m_changed.connect(
+        count_task_labels,
+        sender=Task.label.through,
+        dispatch_uid="task_manager_count_task_labels",
+    )
+
+
+def connect_user_tasks_signals():
+    """Connect receivers keeping cached task lists of users up to date."""
+    # Connected after remember_task_counters, which finds the performer
+    pre_save.connect(
+        remember_task_performer,
+        sender=Task,
+        dispatch_uid="task_manager_remember_task_performer",
+    )
+    post_save.connect(
+        cache_saved_user_task,
+        sender=Task,
+        dispatch_uid="task_manager_cache_saved_user_task",
+    )
+    post_delete.connect(
+        uncache_deleted_user_task,
+        sender=Task,
+        dispatch_uid="task_manager_uncache_deleted_user_task",
+    )
+
+
+def connect_signals():
+    """Connect cache invalidation and task counters receivers."""
+    connect_cache_signals()
+    connect_counter_signals()
+    connect_user_tasks_signals()
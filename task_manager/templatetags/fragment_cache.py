@@ -0,0 +1,60 @@
+"""Caching of template fragments by versions of the objects they show."""
+from django import template
+
+from task_manager.cache import get_or_render_fragment
+
+register = template.Library()
+
+
+class FragmentCacheNode(template.Node):
+    """Render enclosed nodes once per versions of the objects they show."""
+
+    def __init__(self, nodelist, fragment_name, vary_on):
+        """Store enclosed nodes, fragment name and values keying it."""
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        """Return cached fragment, rendering it on cache miss."""
+        vary_on = [
+            key_filter.resolve(context) for key_filter in self.vary_on
+        ]
+        fragment, is_hit = get_or_render_fragment(
+            self.fragment_name,
+            vary_on,
+            lambda: self.nodelist.render(context),
+        )
+        metrics = getattr(context.get("request"), "metrics", None)
+        if metrics is not None:
+            metrics.count_fragment(is_hit)
+        return fragment
+
+
+@register.tag
+def fragment_cache(parser, token):
+    """
+    Cache the enclosed fragment until any object it shows changes.
+
+    Usage::
+
+        {% fragment_cache "task_row" task task.status task.creator %}
+            ...
+        {% endfragment_cache %}
+
+    Model instances are keyed by their version, bumped when they are
+    saved or deleted, other values (i.e. numbers shown in the fragment)
+    are keyed as they are. Fragments are cached per language.
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"{bits[0]} tag requires fragment name and values keying it",
+        )
+    nodelist = parser.parse(("endfragment_cache",))
+    parser.delete_first_token()
+    return FragmentCacheNode(
+        nodelist,
+        bits[1].strip("\"'"),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
@@ -1,4 +1,7 @@
 import pytest
+from django.core.cache import caches
+
+from task_manager.cache import lookup_stats
 
 
 @pytest.fixture(autouse=True)
@@ -12,3 +15,11 @@ def whitenoise_autorefresh(settings):
         - https://github.com/evansd/whitenoise/commit/4204494d44213f7a51229de8bc224cf6d84c01eb
     """
     settings.WHITENOISE_AUTOREFRESH = True
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty caches, as database is rolled back."""
+    lookup_stats.flush(force=True)
+    for cache in caches.all():
+        cache.clear()
@@ -1,7 +1,9 @@
+import threading
 from random import randrange
 
 import pytest
 
+from task_manager.cache_config import build_caches
 from task_manager.models import Label, Status, Task
 
 
@@ -160,3 +162,25 @@ def create_tasks_set(db, create_task):
         return tasks
 
     return make_tasks_set
+
+
+@pytest.fixture
+def redis_caches(settings):
+    """
+    Fixture switching caches to Redis backend served by a local stand-in.
+
+    Skipped unless redis and fakeredis packages are installed.
+    """
+    pytest.importorskip("redis")
+    fakeredis = pytest.importorskip("fakeredis")
+    try:
+        server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+    except NotImplementedError as error:
+        pytest.skip(str(error))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    settings.CACHES = build_caches("redis", f"redis://{host}:{port}/0", "test")
+    yield
+    server.shutdown()
+    server.server_close()
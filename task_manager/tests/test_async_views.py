@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import QueryDict
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+from task_manager.utils.benchmark import async_views
+from task_manager.views.tasks import TaskListView
+
+ASYNC_ROUTES = ("tasks", "users", "statuses", "labels")
+
+
+def async_get(client, url, data=None):
+    """Send GET request with async client."""
+
+    async def send_request():
+        return await client.get(url, data)
+
+    return async_to_sync(send_request)()
+
+
+def page_ids(response, context_name):
+    """Return ids of objects listed on the page."""
+    assert response.status_code == 200
+    return [obj.pk for obj in response.context[context_name]]
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_views_mode_follows_setting(enabled):
+    """Test that read-heavy views are async only in async mode."""
+    with async_views(enabled=enabled):
+        for route_name in ASYNC_ROUTES:
+            view = resolve(reverse(route_name)).func
+            assert asyncio.iscoroutinefunction(view) is enabled
+        view = resolve(reverse("task_detail", kwargs={"pk": 1})).func
+        assert asyncio.iscoroutinefunction(view) is enabled
+        view = resolve(reverse("task_create")).func
+        assert not asyncio.iscoroutinefunction(view)
+
+
+def test_async_lists_match_sync_lists(
+    auto_login_user,
+    create_tasks_set,
+    monkeypatch,
+    settings,
+):
+    """Test that async views list the same pages as sync views."""
+    monkeypatch.setattr(TaskListView, "paginate_by", 2)
+    settings.LIST_PAGE_SIZE = 2
+    client, user = auto_login_user()
+    tasks = create_tasks_set(num_tasks=5, creator=user)
+    params = {"status": tasks[0].status.pk}
+    pages = {}
+    for enabled in (False, True):
+        with async_views(enabled=enabled):
+            response = client.get(reverse("tasks"))
+            next_response = client.get(
+                reverse("tasks"),
+                QueryDict(response.context["next_page_query"]),
+            )
+            pages[enabled] = (
+                page_ids(response, "task_list"),
+                page_ids(next_response, "task_list"),
+                page_ids(client.get(reverse("tasks"), params), "task_list"),
+                page_ids(
+                    client.get(reverse("statuses"), {"page": 2}),
+                    "status_list",
+                ),
+                page_ids(client.get(reverse("users")), "user_list"),
+            )
+    assert pages[True] == pages[False]
+    assert len(pages[True][0]) == 2
+
+
+def test_async_views_served_by_asgi_handler(auto_login_user, create_task):
+    """Test async views through the ASGI request handler."""
+    _, user = auto_login_user()
+    task = create_task(name="Served asynchronously")
+    client = AsyncClient()
+    with async_views():
+        response = async_get(client, reverse("tasks"))
+        # Permission checks load the user from session before the view
+        assert response.status_code == 302
+        client.force_login(user)
+        response = async_get(
+            client,
+            reverse("task_detail", kwargs={"pk": task.pk}),
+        )
+        assert response.status_code == 200
+        assert task.name in response.content.decode()
+        response = async_get(
+            client,
+            reverse("task_detail", kwargs={"pk": task.pk + 1}),
+        )
+        assert response.status_code == 404
+        response = async_get(client, reverse("statuses"), {"page": 100})
+        assert response.status_code == 404
+        response = async_get(client, reverse("labels"))
+        assert response.status_code == 200
@@ -0,0 +1,130 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from task_manager.models import Label, SiteUser
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+from task_manager.views.autocomplete import AUTOCOMPLETE_LIMIT
+
+
+def get_results(client, url_name, query):
+    """Return ids and texts found by autocomplete endpoint."""
+    response = client.get(reverse(url_name), {"q": query})
+    assert response.status_code == 200
+    return {
+        result["id"]: result["text"] for result in response.json()["results"]
+    }
+
+
+def test_user_autocomplete(auto_login_user, create_user):
+    """Test case-insensitive prefix search of users by names."""
+    client, _ = auto_login_user()
+    by_username = create_user(username="Johnny", first_name="A", last_name="B")
+    by_first_name = create_user(
+        username="user1",
+        first_name="john",
+        last_name="C",
+    )
+    by_last_name = create_user(
+        username="user2",
+        first_name="D",
+        last_name="JOHNSON",
+    )
+    create_user(username="user3", first_name="Ajohn", last_name="Bjohn")
+    results = get_results(client, "user_autocomplete", "joHN")
+    assert results == {
+        by_username.pk: "Johnny",
+        by_first_name.pk: "user1",
+        by_last_name.pk: "user2",
+    }
+
+
+@pytest.mark.django_db
+def test_autocomplete_non_ascii_prefix(auto_login_user, create_user):
+    """Test that prefixes are case-insensitive in any alphabet."""
+    client, _ = auto_login_user()
+    by_first_name = create_user(
+        username="user1",
+        first_name="Иван",
+        last_name="Петров",
+    )
+    label = Label.objects.create(name="Ошибка")
+    Label.objects.create(name="Задача")
+    assert get_results(client, "user_autocomplete", "иВ") == {
+        by_first_name.pk: "user1",
+    }
+    assert get_results(client, "label_autocomplete", "ОШИ") == {
+        label.pk: "Ошибка",
+    }
+
+
+@pytest.mark.django_db
+def test_label_autocomplete_limit(auto_login_user):
+    """Test that number of found labels is limited."""
+    client, _ = auto_login_user()
+    Label.objects.bulk_create(
+        Label(name=f"bug {index}") for index in range(AUTOCOMPLETE_LIMIT + 5)
+    )
+    Label.objects.create(name="feature")
+    results = get_results(client, "label_autocomplete", "BUG")
+    assert len(results) == AUTOCOMPLETE_LIMIT
+    assert all(text.startswith("bug") for text in results.values())
+    assert get_results(client, "label_autocomplete", "fea") != {}
+
+
+@pytest.mark.django_db
+def test_autocomplete_login_required(client):
+    """Test that anonymous users can't search objects."""
+    response = client.get(reverse("user_autocomplete"), {"q": "a"})
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_task_form_renders_selected_options_only(
+    auto_login_user,
+    create_task,
+):
+    """Test that task pages don't list all users and labels."""
+    client, user = auto_login_user()
+    task = create_task(creator=user)
+    SiteUser.objects.create(username="not_selected_user")
+    Label.objects.create(name="not_selected_label")
+    response = client.get(reverse("task_update", kwargs={"pk": task.pk}))
+    content = response.content.decode()
+    assert f'<option value="{task.performer.pk}" selected>' in content
+    for label in task.label.all():
+        assert f'<option value="{label.pk}" selected>' in content
+    assert "not_selected_user" not in content
+    assert "not_selected_label" not in content
+    assert reverse("user_autocomplete") in content
+    assert "task_manager/js/autocomplete.js" in content
+    response = client.get(reverse("tasks"), {"performer": task.performer.pk})
+    content = response.content.decode()
+    assert f'<option value="{task.performer.pk}" selected>' in content
+    assert "not_selected_user" not in content
+
+
+@pytest.mark.django_db
+def test_autocomplete_indexes_declared():
+    """Test that indexes of prefix search are declared by the models."""
+    call_command("makemigrations", "task_manager", "--check", "--dry-run")
+    with connection.cursor() as cursor:
+        for model in (SiteUser, Label):
+            constraints = connection.introspection.get_constraints(
+                cursor,
+                model._meta.db_table,
+            )
+            index_names = {index.name for index in model._meta.indexes}
+            assert {
+                name for name in index_names if name.endswith("_upper_idx")
+            }
+            assert index_names <= constraints.keys()
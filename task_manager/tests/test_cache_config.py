@@ -0,0 +1,126 @@
+import pytest
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+
+from task_manager import cache
+from task_manager.cache_config import (
+    CHOICES_ALIAS,
+    DEFAULT_ALIAS,
+    FRAGMENTS_ALIAS,
+    SESSIONS_ALIAS,
+    build_caches,
+    check_cache_backend,
+    default_cache_backend,
+)
+from task_manager.tests.fixtures import redis_caches
+from task_manager.utils.cache_stats import alias_stats
+
+
+def test_deploy_id_prefixes_rendered_values():
+    """Test that only values rendered by the code are keyed by deploy."""
+    caches_settings = build_caches("locmem", "", "abc123", version=2)
+    assert caches_settings[CHOICES_ALIAS]["KEY_PREFIX"] == (
+        "task_manager:choices:abc123"
+    )
+    assert caches_settings[FRAGMENTS_ALIAS]["KEY_PREFIX"] == (
+        "task_manager:fragments:abc123"
+    )
+    assert caches_settings[DEFAULT_ALIAS]["KEY_PREFIX"] == (
+        "task_manager:default"
+    )
+    assert caches_settings[SESSIONS_ALIAS]["KEY_PREFIX"] == (
+        "task_manager:sessions"
+    )
+    assert {
+        alias_settings["VERSION"]
+        for alias_settings in caches_settings.values()
+    } == {2}
+
+
+def test_backend_locations(tmp_path):
+    """Test that aliases don't share storage of local backends."""
+    locmem = build_caches("locmem", "", "deploy")
+    assert len({settings["LOCATION"] for settings in locmem.values()}) == 4
+    file_based = build_caches("file", tmp_path, "deploy")
+    assert file_based[FRAGMENTS_ALIAS]["LOCATION"] == str(
+        tmp_path / "fragments",
+    )
+    redis = build_caches("redis", "redis://redis:6379/1", "deploy")
+    assert {
+        settings["LOCATION"] for settings in redis.values()
+    } == {"redis://redis:6379/1"}
+    assert "OPTIONS" not in redis[DEFAULT_ALIAS]
+
+
+def test_unknown_backend():
+    """Test that unknown backend name is a configuration error."""
+    with pytest.raises(ImproperlyConfigured, match="memcached"):
+        build_caches("memcached", "", "deploy")
+
+
+def test_values_stored_in_own_aliases():
+    """Test that choices and fragments don't evict other cached values."""
+    cache.get_or_set_versioned("statuses", [], lambda: ["choice"])
+    cache.get_or_render_fragment("row", ["a"], lambda: "<tr></tr>")
+    assert caches[CHOICES_ALIAS].get(
+        cache.versioned_key("statuses"),
+    ) == ["choice"]
+    assert caches[FRAGMENTS_ALIAS].get(cache.fragment_key("row", ["a"]))
+    # Only the version of choices namespace
+    assert alias_stats(DEFAULT_ALIAS)["entries"] == 1
+
+
+def test_new_deploy_misses_fragments(settings):
+    """Test that a new deploy doesn't read fragments of the previous one."""
+    cache.get_or_render_fragment("row", ["a"], lambda: "<tr></tr>")
+    settings.CACHES = build_caches("locmem", "", "next")
+    _, is_hit = cache.get_or_render_fragment("row", ["a"], lambda: "")
+    assert not is_hit
+
+
+def test_lookups_counted_per_alias():
+    """Test that hits and misses are counted per alias by all processes."""
+    for _ in range(3):
+        cache.get_or_render_fragment("row", ["a"], lambda: "<tr></tr>")
+    cache.get_or_set_versioned("statuses", [], lambda: ["choice"])
+    cache.lookup_stats.flush(force=True)
+    assert cache.get_lookup_totals(FRAGMENTS_ALIAS) == (2, 1)
+    assert cache.get_lookup_totals(CHOICES_ALIAS) == (0, 1)
+    cache.get_or_render_fragment("row", ["a"], lambda: "<tr></tr>")
+    # Totals are written at most once per interval
+    cache.lookup_stats.flush()
+    assert cache.get_lookup_totals(FRAGMENTS_ALIAS) == (2, 1)
+    cache.lookup_stats.flush(force=True)
+    assert alias_stats(FRAGMENTS_ALIAS)["hit_ratio"] == 0.75
+
+
+def test_redis_backend(redis_caches, capsys):
+    """Test caching and reporting stats on a Redis protocol server."""
+    for _ in range(2):
+        cache.get_or_render_fragment("row", ["a"], lambda: "x" * 2048)
+    cache.get_or_render_fragment("cell", ["a"], lambda: "x")
+    cache.get_or_set_versioned("statuses", [], lambda: ["choice"])
+    call_command("cache_stats", "--aliases=fragments,choices", "--top=1")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("fragments (redis): entries=2 ")
+    assert "hits=1 misses=2" in lines[0]
+    size, key = lines[1].split()
+    assert size == "2.0KiB"
+    assert key.startswith("task_manager:fragments:test:1:fragment:row:")
+    assert lines[2].startswith("choices (redis): entries=1 ")
+    assert "hit_ratio=0.0%" in lines[2]
+
+
+def test_default_backend_is_shared_without_debug():
+    """Test that deployments default to caches shared by workers."""
+    assert default_cache_backend("", debug=True) == "locmem"
+    assert default_cache_backend("", debug=False) == "file"
+    assert default_cache_backend(
+        "redis://redis:6379/1",
+        debug=False,
+    ) == "redis"
+    check_cache_backend("locmem", debug=True)
+    check_cache_backend("file", debug=False)
+    with pytest.raises(ImproperlyConfigured, match="DEBUG"):
+        check_cache_backend("locmem", debug=False)
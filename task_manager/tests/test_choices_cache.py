@@ -0,0 +1,112 @@
+import pytest
+from django.urls import reverse
+
+from task_manager.cache import (
+    STATUSES_NAMESPACE,
+    USERS_NAMESPACE,
+    get_namespace_version,
+)
+from task_manager.forms import TaskEditForm
+from task_manager.models import Status
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+from task_manager.tests.test_query_counts import TASK_LIST_QUERIES
+
+# Query of status filter dropdown
+DROPDOWN_QUERIES = 1
+
+
+def test_tasks_list_dropdowns_cached(
+    auto_login_user,
+    create_tasks_set,
+    django_assert_num_queries,
+):
+    """Test that status dropdown is queried only on first render."""
+    client, _ = auto_login_user()
+    tasks = create_tasks_set(num_tasks=3)
+    with django_assert_num_queries(TASK_LIST_QUERIES):
+        client.get(reverse("tasks"))
+    with django_assert_num_queries(TASK_LIST_QUERIES - DROPDOWN_QUERIES):
+        response = client.get(reverse("tasks"))
+    content = response.content.decode()
+    for task in tasks:
+        assert f'<option value="{task.status.pk}">' in content
+
+
+def test_cached_choices_invalidated(auto_login_user, create_status):
+    """Test that changing a status shows up in cached dropdowns."""
+    client, _ = auto_login_user()
+    status = create_status()
+    version = get_namespace_version(STATUSES_NAMESPACE)
+    client.get(reverse("tasks"))
+    status.name = "Renamed status"
+    status.save()
+    assert get_namespace_version(STATUSES_NAMESPACE) != version
+    response = client.get(reverse("tasks"))
+    assert "Renamed status" in response.content.decode()
+    status.delete()
+    response = client.get(reverse("tasks"))
+    assert "Renamed status" not in response.content.decode()
+
+
+def test_login_keeps_cached_choices(
+    client,
+    create_user,
+    test_password,
+):
+    """Test that saving last login of a user keeps cached performers."""
+    user = create_user()
+    version = get_namespace_version(USERS_NAMESPACE)
+    client.post(
+        reverse("login"),
+        {"username": user.username, "password": test_password},
+    )
+    user.refresh_from_db()
+    assert user.last_login is not None
+    assert get_namespace_version(USERS_NAMESPACE) == version
+    user.first_name = "Renamed"
+    user.save(update_fields=["first_name"])
+    assert get_namespace_version(USERS_NAMESPACE) != version
+
+
+def test_cached_choices_selected_option(auto_login_user, create_status):
+    """Test that selected filter value is marked in cached options."""
+    client, _ = auto_login_user()
+    statuses = [create_status() for _ in range(3)]
+    client.get(reverse("tasks"))
+    response = client.get(reverse("tasks"), {"status": statuses[1].pk})
+    content = response.content.decode()
+    assert f'<option value="{statuses[1].pk}" selected>' in content
+    assert f'<option value="{statuses[0].pk}" selected>' not in content
+
+
+def test_cached_choices_per_language(auto_login_user, create_status):
+    """Test that options are cached separately for every language."""
+    client, _ = auto_login_user()
+    create_status()
+    response = client.get(reverse("tasks"))
+    assert "Select status" in response.content.decode()
+    client.cookies["django_language"] = "ru"
+    response = client.get(reverse("tasks"))
+    assert "Select status" not in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_task_edit_form_cached_choices(create_task):
+    """Test that edit form renders cached options with current values."""
+    task = create_task()
+    form = TaskEditForm(instance=task)
+    html = str(form["status"]) + str(form["label"])
+    assert f'<option value="{task.status.pk}" selected>' in html
+    for label in task.label.all():
+        assert f'<option value="{label.pk}" selected>' in html
+    Status.objects.create(name="New status")
+    assert "New status" in str(TaskEditForm(instance=task)["status"])
@@ -0,0 +1,395 @@
+import json
+import os
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection
+
+from task_manager.cache_config import build_caches
+from task_manager.export import (
+    iter_csv_lines,
+    iter_ndjson_lines,
+    iter_task_rows,
+)
+from task_manager.models import (
+    CounterDimension,
+    ImportCheckpoint,
+    Label,
+    SiteUser,
+    Status,
+    Task,
+    TaskCounter,
+)
+from task_manager.tests.fixtures import (
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+)
+from task_manager.utils import importing
+from task_manager.utils.benchmark import compare_reports
+
+
+def test_explain_list_views(create_tasks_set, capsys):
+    """
+    Test EXPLAIN report on list views queries.
+
+    Should report every list page including filtered tasks lists,
+    pages of users, statuses and labels are read in index order.
+    """
+    create_tasks_set(num_tasks=3)
+    call_command("explain_list_views", "--verbose-plans")
+    output = capsys.readouterr().out
+    for url in ("/tasks/", "/users/", "/statuses/", "/labels/"):
+        assert url in output
+    for task_filter in ("status=", "performer=", "label=", "self_tasks=on"):
+        assert task_filter in output
+    if connection.vendor == "sqlite":
+        # Indexes match list orderings including the id tiebreak
+        for url in ("/users/", "/statuses/", "/labels/"):
+            assert f"{url}: OK" in output
+
+
+def test_create_dummy_content_bulk(db, capsys):
+    """
+    Test bulk generation of dummy content.
+
+    Should create tasks referencing pools of users, statuses, labels,
+    each task having from 1 to 3 labels.
+    """
+    call_command(
+        "create_dummy_content",
+        "--bulk",
+        "--num-tasks=45",
+        "--batch-size=20",
+        "--users=5",
+        "--statuses=3",
+        "--labels=4",
+        "--seed=1",
+    )
+    assert Task.objects.count() == 45
+    assert SiteUser.objects.count() == 5
+    assert Status.objects.count() == 3
+    assert Label.objects.count() == 4
+    for task in Task.objects.prefetch_related("label"):
+        assert 1 <= len(task.label.all()) <= 3
+    assert "45 dummy tasks created" in capsys.readouterr().out
+    assert TaskCounter.objects.counts(CounterDimension.TOTAL) == {0: 45}
+
+
+def test_benchmark_views(db, tmp_path):
+    """
+    Test benchmarking views on a small dataset.
+
+    Should write JSON report with measurements of every route.
+    """
+    report_path = tmp_path / "benchmark.json"
+    call_command(
+        "benchmark_views",
+        "--use-current-db",
+        "--sizes=5,10",
+        "--iterations=2",
+        "--warmup=0",
+        f"--output={report_path}",
+    )
+    report = json.loads(report_path.read_text())
+    assert set(report["results"]) == {"5", "10"}
+    assert Task.objects.count() >= 10
+    routes = report["results"]["10"]
+    for route in ("index", "tasks", "task_detail", "users", "label_delete"):
+        assert routes[route]["status_code"] == 200
+        assert routes[route]["queries"] > 0 or route == "index"
+        assert routes[route]["p99_ms"] >= routes[route]["p50_ms"]
+        # Test transaction keeps the connection open
+        assert routes[route]["connects"] == 0
+    assert "logout" not in routes
+    assert "admin:index" not in routes
+
+
+def test_benchmark_serving(transactional_db, tmp_path, capsys):
+    """
+    Test comparing WSGI and ASGI serving on a small dataset.
+
+    Should serve every route without errors in both modes.
+    """
+    report_path = tmp_path / "serving.json"
+    call_command(
+        "benchmark_serving",
+        "--use-current-db",
+        "--tasks=5",
+        "--requests=4",
+        "--concurrency=2",
+        "--workers=1",
+        "--db-latency=1",
+        f"--output={report_path}",
+    )
+    report = json.loads(report_path.read_text())
+    for mode in ("wsgi", "asgi"):
+        routes = report["results"][mode]
+        assert set(routes) == {
+            "tasks",
+            "task_detail",
+            "users",
+            "statuses",
+            "labels",
+        }
+        for result in routes.values():
+            assert result["errors"] == 0
+            assert result["requests"] == 4
+    assert "task_detail: " in capsys.readouterr().out
+
+
+def test_benchmark_forms(db, capsys):
+    """Test comparing forms with helpers built per form and cached."""
+    call_command("benchmark_forms", "--use-current-db", "--iterations=2")
+    output = capsys.readouterr().out
+    for form_name in ("login", "task_edit", "task_filter", "task_bulk"):
+        assert f"{form_name}: build " in output
+
+
+def test_template_stats(db, capsys):
+    """Test reporting compile and render time of templates."""
+    call_command(
+        "template_stats",
+        "--use-current-db",
+        "--tasks=3",
+        "--iterations=1",
+    )
+    output = capsys.readouterr().out
+    assert "Warm-up compiled" in output
+    rows = {
+        line.split()[0]: line.split()[1:]
+        for line in output.splitlines()[2:]
+    }
+    compile_ms, renders, _, _ = rows["task_manager/base.html"]
+    assert float(compile_ms) > 0
+    assert int(renders) > 0
+    # Error pages are compiled but never rendered
+    assert rows["404.html"][1:] == ["0", "-", "-"]
+
+
+@pytest.mark.parametrize("backend", ["locmem", "file"])
+def test_cache_stats(backend, settings, tmp_path, capsys):
+    """Test reporting entries and the largest keys of cache aliases."""
+    settings.CACHES = build_caches(backend, tmp_path, "test")
+    caches["fragments"].set("large", os.urandom(4096))
+    caches["fragments"].set("small", "x")
+    call_command("cache_stats", "--aliases=fragments,default", "--top=1")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith(f"fragments ({backend}): entries=2 ")
+    assert "hit_ratio=-" in lines[0]
+    key_lines = [line for line in lines if line.endswith(("large", "small"))]
+    # Only the largest key, file backend shows hashes of keys instead
+    assert lines[1].split()[0] == "4.0KiB"
+    assert len(key_lines) == (1 if backend == "locmem" else 0)
+    assert any(line.startswith("default (") for line in lines)
+    with pytest.raises(CommandError, match="sessions2"):
+        call_command("cache_stats", "--aliases=sessions2")
+
+
+def test_benchmark_reports_comparison():
+    """Test detecting latency and query count regressions."""
+    baseline = {
+        "results": {
+            "1000": {
+                "tasks": {"p95_ms": 10, "queries": 6},
+                "users": {"p95_ms": 10, "queries": 3},
+            },
+        },
+    }
+    current = {
+        "results": {
+            "1000": {
+                "tasks": {"p95_ms": 11, "queries": 16},
+                "users": {"p95_ms": 30, "queries": 3},
+            },
+        },
+    }
+    assert compare_reports(baseline, current, threshold=1.2) == [
+        ("1000", "tasks", "queries", 6, 16),
+        ("1000", "users", "p95_ms", 10, 30),
+    ]
+
+
+def write_import_csv(path, rows):
+    """Write CSV file of imported tasks."""
+    columns = ("name", "description", "status", "performer", "labels")
+    lines = [",".join(columns)]
+    lines.extend(",".join(row) for row in rows)
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_import_tasks_csv(db, tmp_path, create_user, create_status, capsys):
+    """
+    Test importing tasks from CSV.
+
+    Valid rows should be written in batches, invalid rows reported.
+    """
+    creator = create_user(username="importer")
+    performer = create_user(username="performer")
+    status = create_status(name="open")
+    Label.objects.create(name="bug")
+    Label.objects.create(name="ui")
+    source = tmp_path / "tasks.csv"
+    write_import_csv(
+        source,
+        [
+            ("First", "Description", "open", "performer", '"bug, ui"'),
+            ("Second", "Description", "missing", "performer", "bug"),
+            ("", "Description", "open", "performer", "bug"),
+            ("Third", "Description", "open", "performer", "ui"),
+            ("Fourth", "Description", "open", "nobody", "other"),
+        ],
+    )
+    rejects = tmp_path / "rejects.ndjson"
+    call_command(
+        "import_tasks",
+        str(source),
+        "--creator=importer",
+        "--batch-size=2",
+        f"--rejects={rejects}",
+    )
+    tasks = Task.objects.order_by("name")
+    assert [task.name for task in tasks] == ["First", "Third"]
+    first = tasks[0]
+    assert first.creator == creator
+    assert first.performer == performer
+    assert first.status == status
+    assert sorted(first.label.values_list("name", flat=True)) == ["bug", "ui"]
+    rejected = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [reject["row"] for reject in rejected] == [2, 3, 5]
+    assert set(rejected[0]["errors"]) == {"status"}
+    assert set(rejected[1]["errors"]) == {"name"}
+    assert set(rejected[2]["errors"]) == {"performer", "label"}
+    assert "Imported 2 tasks, rejected 3 rows" in capsys.readouterr().out
+    assert not ImportCheckpoint.objects.exists()
+    assert TaskCounter.objects.reconcile(dry_run=True) == {}
+
+
+def test_import_tasks_resume(db, tmp_path, create_user, create_status):
+    """Test resuming import from checkpoint of a failed import."""
+    create_user(username="performer")
+    create_status(name="open")
+    Label.objects.create(name="bug")
+    source = tmp_path / "tasks.csv"
+    write_import_csv(
+        source,
+        [
+            (f"Task {index}", "Description", "open", "performer", "bug")
+            for index in range(5)
+        ],
+    )
+    ImportCheckpoint.objects.create(
+        source=str(source),
+        rows_done=3,
+        imported=3,
+    )
+    with pytest.raises(CommandError):
+        call_command("import_tasks", str(source), "--creator=performer")
+    call_command(
+        "import_tasks",
+        str(source),
+        "--creator=performer",
+        "--resume",
+    )
+    assert sorted(Task.objects.values_list("name", flat=True)) == [
+        "Task 3",
+        "Task 4",
+    ]
+    assert not ImportCheckpoint.objects.exists()
+
+
+def test_import_tasks_failed_batch(
+    db,
+    tmp_path,
+    create_user,
+    create_status,
+    monkeypatch,
+):
+    """
+    Test resuming import after a batch failed to be written.
+
+    Checkpoint is saved with the batch, so committed batches are not
+    imported again and the failed batch is.
+    """
+    create_user(username="performer")
+    create_status(name="open")
+    Label.objects.create(name="bug")
+    source = tmp_path / "tasks.csv"
+    write_import_csv(
+        source,
+        [
+            (f"Task {index}", "Description", "open", "performer", "bug")
+            for index in range(4)
+        ],
+    )
+    insert_tasks = importing.insert_tasks
+
+    def insert_first_batch(tasks_with_labels):
+        insert_tasks(tasks_with_labels)
+        if Task.objects.count() > 2:
+            raise DatabaseError("connection lost")
+
+    monkeypatch.setattr(importing, "insert_tasks", insert_first_batch)
+    with pytest.raises(CommandError, match="failed after 2 rows"):
+        call_command(
+            "import_tasks",
+            str(source),
+            "--creator=performer",
+            "--batch-size=2",
+        )
+    assert Task.objects.count() == 2
+    assert ImportCheckpoint.objects.get().rows_done == 2
+    monkeypatch.undo()
+    call_command(
+        "import_tasks",
+        str(source),
+        "--creator=performer",
+        "--batch-size=2",
+        "--resume",
+    )
+    assert sorted(Task.objects.values_list("name", flat=True)) == [
+        f"Task {index}" for index in range(4)
+    ]
+    assert TaskCounter.objects.reconcile(dry_run=True) == {}
+
+
+def test_import_exported_tasks(db, tmp_path, create_tasks_set):
+    """Test that tasks export can be imported back."""
+    expected = {
+        (task.name, task.creator_id, task.created_on, task.label.get().pk)
+        for task in create_tasks_set(num_tasks=5)
+    }
+    source = tmp_path / "tasks.ndjson"
+    source.write_text(
+        "".join(iter_ndjson_lines(iter_task_rows(Task.objects.all()))),
+    )
+    Task.objects.all().delete()
+    call_command("import_tasks", str(source))
+    imported = Task.objects.prefetch_related("label")
+    assert {
+        (task.name, task.creator_id, task.created_on, task.label.get().pk)
+        for task in imported
+    } == expected
+
+
+def test_import_exported_csv_labels(db, tmp_path, create_task):
+    """Test that labels with commas and quotes survive CSV round trip."""
+    label_names = ["bug, critical", 'say "hi"', "ui"]
+    create_task(
+        label=[Label.objects.create(name=name) for name in label_names],
+    )
+    source = tmp_path / "tasks.csv"
+    source.write_text(
+        "".join(iter_csv_lines(iter_task_rows(Task.objects.all()))),
+    )
+    Task.objects.all().delete()
+    call_command("import_tasks", str(source))
+    imported = Task.objects.get()
+    assert sorted(imported.label.values_list("name", flat=True)) == sorted(
+        label_names,
+    )
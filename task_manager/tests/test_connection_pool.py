@@ -0,0 +1,57 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE  # noqa: E402
+from psycopg2.pool import PoolError  # noqa: E402
+
+from task_manager.db.backends.postgresql_pool.base import (  # noqa: E402
+    MeteredConnectionPool,
+)
+
+
+class StandInConnection:
+    """Connection returned by psycopg2.connect() without a server."""
+
+    def __init__(self, dsn):
+        """Create open connection, idle outside of transactions."""
+        self.closed = 0
+        self.info = SimpleNamespace(transaction_status=TRANSACTION_STATUS_IDLE)
+
+    def close(self):
+        """Mark connection closed."""
+        self.closed = 1
+
+
+def create_pool(timeout):
+    """Create pool of one connection to the stand-in server."""
+    return MeteredConnectionPool(
+        "default",
+        1,
+        1,
+        timeout=timeout,
+        connection_factory=StandInConnection,
+    )
+
+
+def test_exhausted_pool_waits_for_returned_connection():
+    """Test that a request waits for connection used by another one."""
+    pool = create_pool(timeout=5)
+    used = pool.getconn()
+    returning = threading.Timer(0.05, pool.putconn, args=(used,))
+    returning.start()
+    assert pool.getconn() is used
+    returning.join()
+
+
+def test_exhausted_pool_timeout():
+    """Test that waiting for a connection is bounded by pool timeout."""
+    pool = create_pool(timeout=0.05)
+    used = pool.getconn()
+    with pytest.raises(PoolError, match="returned to the pool"):
+        pool.getconn()
+    pool.putconn(used)
+    assert pool.getconn() is used
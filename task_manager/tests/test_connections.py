@@ -0,0 +1,39 @@
+import pytest
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from task_manager.db.metrics import ConnectionMetrics, connection_metrics
+
+
+def test_persistent_connections_configured(settings):
+    """Test that every database gets persistent connections settings."""
+    for database_settings in settings.DATABASES.values():
+        assert database_settings["CONN_MAX_AGE"] == settings.CONN_MAX_AGE
+        assert database_settings["CONN_HEALTH_CHECKS"] == (
+            settings.CONN_HEALTH_CHECKS
+        )
+
+
+@pytest.mark.django_db
+def test_connection_metrics_count_created_connections():
+    """Test that connections set up by Django are counted."""
+    connection_metrics.reset()
+    connection_created.send(sender=connection.__class__, connection=connection)
+    connection_created.send(sender=connection.__class__, connection=connection)
+    assert connection_metrics.snapshot() == {
+        connection.alias: {"acquired": 2, "opened": 2, "reused": 0},
+    }
+    assert connection_metrics.total_acquired() == 2
+
+
+def test_connection_metrics_reused_connections():
+    """Test that pooled connections are counted as reused."""
+    metrics = ConnectionMetrics()
+    metrics.record_opened("default")
+    for _ in range(3):
+        metrics.record_acquired("default")
+    assert metrics.snapshot() == {
+        "default": {"acquired": 3, "opened": 1, "reused": 2},
+    }
+    metrics.reset()
+    assert metrics.snapshot() == {}
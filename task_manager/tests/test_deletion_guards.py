@@ -0,0 +1,95 @@
+import pytest
+from django.urls import reverse
+
+from task_manager.models import Label, SiteUser, Status
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+
+# Session, authenticated user, deleted object and the in use check
+CONFIRMATION_QUERIES = 4
+
+
+@pytest.mark.parametrize(
+    "url_name, model, message",
+    [
+        ("status_delete", Status, "Cannot delete the status assigned to task"),
+        (
+            "label_delete",
+            Label,
+            "Can not delete the label associated with a task",
+        ),
+    ],
+)
+def test_deletion_of_used_object_refused(
+    url_name,
+    model,
+    message,
+    auto_login_user,
+    create_task,
+    django_assert_num_queries,
+):
+    """
+    Test that statuses and labels used by tasks are not deleted.
+
+    Should warn on the confirmation page with a single check query
+    and keep the object when the form is submitted anyway.
+    """
+    client, _ = auto_login_user()
+    task = create_task()
+    if model is Label:
+        obj = Label.objects.create(name="used label")
+        task.label.add(obj)
+    else:
+        obj = task.status
+    url = reverse(url_name, kwargs={"pk": obj.pk})
+    with django_assert_num_queries(CONFIRMATION_QUERIES):
+        response = client.get(url)
+    assert response.context["in_use"]
+    assert message in response.content.decode()
+    assert "disabled" in response.content.decode()
+    response = client.post(url, follow=True)
+    assert message in response.content.decode()
+    assert model.objects.filter(pk=obj.pk).exists()
+
+
+def test_deletion_of_unused_object_allowed(
+    auto_login_user,
+    create_status,
+    django_assert_num_queries,
+):
+    """Test that confirmation page of unused status has no warning."""
+    client, _ = auto_login_user()
+    status = create_status()
+    url = reverse("status_delete", kwargs={"pk": status.pk})
+    with django_assert_num_queries(CONFIRMATION_QUERIES):
+        response = client.get(url)
+    assert not response.context["in_use"]
+    assert "disabled" not in response.content.decode()
+    client.post(url)
+    assert not Status.objects.filter(pk=status.pk).exists()
+
+
+@pytest.mark.parametrize("role", ["creator", "performer"])
+def test_deletion_of_user_with_tasks_refused(
+    role,
+    auto_login_user,
+    create_task,
+):
+    """Test that users who created or perform tasks are not deleted."""
+    client, user = auto_login_user()
+    create_task(**{role: user})
+    url = reverse("user_delete", kwargs={"pk": user.pk})
+    response = client.get(url)
+    assert response.context["in_use"]
+    response = client.post(url, follow=True)
+    assert "Cannot delete the user assigned to task" in (
+        response.content.decode()
+    )
+    assert SiteUser.objects.filter(pk=user.pk).exists()
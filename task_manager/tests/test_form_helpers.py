@@ -0,0 +1,75 @@
+from django.urls import reverse
+from django.utils import translation
+
+from task_manager.filters import TaskFilter
+from task_manager.forms import (
+    LoginForm,
+    TaskEditForm,
+    TaskFilterForm,
+    _form_helpers,
+    clear_form_helpers,
+)
+from task_manager.models import Task
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+
+
+def test_helpers_shared_per_class_and_language():
+    """Test that forms of a class reuse helper built for the language."""
+    clear_form_helpers()
+    with translation.override("en"):
+        helper = TaskEditForm().helper
+        assert TaskEditForm().helper is helper
+        assert LoginForm().helper is not helper
+    with translation.override("ru"):
+        assert TaskEditForm().helper is not helper
+
+
+def test_filterset_forms_share_helper(db):
+    """Test that form classes created per filterset reuse one helper."""
+    clear_form_helpers()
+    with translation.override("en"):
+        forms = [TaskFilter({}, Task.objects.none()).form for _ in range(5)]
+        assert type(forms[0]) is not type(forms[1])
+        assert isinstance(forms[0], TaskFilterForm)
+        assert forms[0].helper is forms[1].helper
+    assert len(_form_helpers) == 1
+
+
+def test_static_layout_html_translated(auto_login_user):
+    """Test that pre-rendered layout snippets follow the language."""
+    client, _ = auto_login_user()
+    clear_form_helpers()
+    content = client.get(reverse("tasks")).content.decode()
+    assert "Clear filters" in content
+    client.cookies["django_language"] = "ru"
+    content = client.get(reverse("tasks")).content.decode()
+    assert "Clear filters" not in content
+    assert 'href="{0}"'.format(reverse("tasks")) in content
+
+
+def test_forms_render_bound_values(auto_login_user, create_status):
+    """Test that forms sharing helpers render their own values and errors."""
+    client, _ = auto_login_user()
+    status = create_status()
+    response = client.post(
+        reverse("task_create"),
+        {"name": "", "description": "First", "status": status.pk},
+    )
+    assert "First" in response.content.decode()
+    assert "This field is required" in response.content.decode()
+    response = client.post(
+        reverse("task_create"),
+        {"name": "Name", "description": "Second"},
+    )
+    content = response.content.decode()
+    assert "Second" in content
+    assert "First" not in content
@@ -0,0 +1,202 @@
+import json
+import logging
+
+import pytest
+from django.core.cache import cache
+from django.template import Context, Template, TemplateSyntaxError
+from django.urls import reverse
+from freezegun import freeze_time
+
+from task_manager.cache import (
+    FRAGMENT_HIT,
+    FRAGMENT_MISS,
+    OBJECT_VERSION_TIMEOUT,
+    _object_version_key,
+    fragment_stats,
+    get_object_versions,
+)
+from task_manager.models import SiteUser, Task
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+
+
+def table_rows(response):
+    """Return HTML of the rows of the list table."""
+    content = response.content.decode()
+    return content[content.index("<tbody>") : content.index("</tbody>")]
+
+
+@pytest.fixture
+def row_stats():
+    """Return function counting row fragment lookups since the fixture."""
+    before = fragment_stats.copy()
+
+    def count(fragment_name, outcome):
+        key = (fragment_name, outcome)
+        return fragment_stats[key] - before[key]
+
+    return count
+
+
+def test_task_rows_cached(auto_login_user, create_tasks_set, row_stats):
+    """Test that task rows are rendered once and then read from cache."""
+    client, _ = auto_login_user()
+    tasks = create_tasks_set(num_tasks=3)
+    first = table_rows(client.get(reverse("tasks")))
+    assert row_stats("task_row", FRAGMENT_MISS) == len(tasks)
+    second = table_rows(client.get(reverse("tasks")))
+    assert row_stats("task_row", FRAGMENT_HIT) == len(tasks)
+    assert row_stats("task_row", FRAGMENT_MISS) == len(tasks)
+    assert first == second
+
+
+def test_task_rows_follow_changes(
+    auto_login_user,
+    create_task,
+    create_user,
+    row_stats,
+):
+    """Test that changed task, status and users show up in cached rows."""
+    client, _ = auto_login_user()
+    task = create_task(name="Old name")
+    other_task = create_task()
+    client.get(reverse("tasks"))
+    task = Task.objects.get(pk=task.pk)
+    task.name = "New name"
+    task.save()
+    task.status.name = "Renamed status"
+    task.status.save()
+    performer = SiteUser.objects.get(pk=task.performer_id)
+    performer.first_name = "Firstname"
+    performer.save()
+    content = client.get(reverse("tasks")).content.decode()
+    assert "New name" in content
+    assert "Old name" not in content
+    assert "Renamed status" in content
+    assert "Firstname" in content
+    # Row of the unchanged task is still cached
+    assert row_stats("task_row", FRAGMENT_HIT) == 1
+    # Bulk actions change relations keying the rows
+    new_performer = create_user(first_name="Bulk", last_name="Performer")
+    client.post(
+        reverse("task_bulk"),
+        {
+            "bulk-action": "performer",
+            "bulk-ids": [other_task.pk],
+            "bulk-performer": new_performer.pk,
+        },
+    )
+    content = client.get(reverse("tasks")).content.decode()
+    assert "Bulk Performer" in content
+
+
+def test_login_keeps_user_rows(client, create_user, row_stats):
+    """Test that saving last login of users keeps their cached rows."""
+    users = [create_user() for _ in range(2)]
+    for user in users:
+        client.force_login(user)
+        client.get(reverse("users"))
+    assert row_stats("user_row", FRAGMENT_MISS) == len(users)
+    assert row_stats("user_row", FRAGMENT_HIT) == len(users)
+
+
+def test_object_versions_expire(
+    create_task,
+    create_tasks_set,
+    django_capture_on_commit_callbacks,
+):
+    """Test that versions expire and are dropped with deleted objects."""
+    with freeze_time() as frozen:
+        task = create_task()
+        version = get_object_versions([task])[0]
+        assert get_object_versions([task]) == [version]
+        frozen.tick(OBJECT_VERSION_TIMEOUT + 1)
+        assert get_object_versions([task]) != [version]
+    task.delete()
+    assert cache.get(_object_version_key(Task, task.pk)) is None
+    tasks = create_tasks_set(num_tasks=2)
+    get_object_versions(tasks)
+    with django_capture_on_commit_callbacks(execute=True):
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).bulk_delete()
+    for deleted in tasks:
+        assert cache.get(_object_version_key(Task, deleted.pk)) is None
+
+
+def test_list_rows_follow_task_counts(
+    auto_login_user,
+    create_status,
+    create_task,
+    row_stats,
+):
+    """Test that numbers of tasks in cached rows are up to date."""
+    client, user = auto_login_user()
+    status = create_status()
+    response = client.get(reverse("statuses"))
+    assert response.context["status_list"][0].task_count == 0
+    create_task(status=status, performer=user)
+    content = client.get(reverse("statuses")).content.decode()
+    assert "<td>1</td>" in content
+    assert row_stats("status_row", FRAGMENT_MISS) == 2
+    client.get(reverse("users"))
+    client.get(reverse("labels"))
+    client.get(reverse("users"))
+    assert row_stats("user_row", FRAGMENT_HIT) > 0
+
+
+def test_rows_cached_per_language(auto_login_user, create_task):
+    """Test that rows are cached separately for every language."""
+    client, _ = auto_login_user()
+    create_task()
+    response = client.get(reverse("tasks"))
+    assert 'title="Edit"' in response.content.decode()
+    client.cookies["django_language"] = "ru"
+    response = client.get(reverse("tasks"))
+    assert 'title="Edit"' not in response.content.decode()
+
+
+def test_fragment_lookups_in_request_metrics(
+    settings,
+    caplog,
+    auto_login_user,
+    create_tasks_set,
+):
+    """Test that fragment hits and misses are logged with request metrics."""
+    settings.REQUEST_METRICS_ENABLED = True
+    client, _ = auto_login_user()
+    tasks = create_tasks_set(num_tasks=2)
+    with caplog.at_level(logging.INFO, logger="task_manager.requests"):
+        client.get(reverse("tasks"))
+        client.get(reverse("tasks"))
+    records = [
+        json.loads(record.getMessage())
+        for record in caplog.records
+        if record.name == "task_manager.requests"
+    ]
+    assert [record["fragment_misses"] for record in records] == [
+        len(tasks),
+        0,
+    ]
+    assert records[1]["fragment_hits"] == len(tasks)
+
+
+def test_fragment_cache_tag_requires_key():
+    """Test that fragment name and values keying it are required."""
+    with pytest.raises(TemplateSyntaxError):
+        Template(
+            "{% load fragment_cache %}"
+            "{% fragment_cache 'row' %}{% endfragment_cache %}",
+        )
+    template = Template(
+        "{% load fragment_cache %}"
+        "{% fragment_cache 'row' value %}{{ value }}{% endfragment_cache %}",
+    )
+    assert template.render(Context({"value": 1})) == "1"
+    assert template.render(Context({"value": 2})) == "2"
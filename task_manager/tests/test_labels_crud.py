@@ -130,13 +130,21 @@ def test_delete_label_with_associated_task(
     """
     Test deleting a label with a task associated with it.
 
-    Should redirect to labels list page and show flash message with error.
+    Should warn on the confirmation page, refuse deletion, redirect
+    to labels list page and show flash message with error.
     """
     client, _ = auto_login_user()
     label = create_label()
     task = create_task()
     task.label.set([label])
-    response = client.get(reverse("label_delete", kwargs={"pk": label.pk}))
+    url = reverse("label_delete", kwargs={"pk": label.pk})
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.context["in_use"]
+    assert "Can not delete the label associated with a task" in str(
+        response.content,
+    )
+    response = client.post(url)
     # Should redirect to labels list page
     assert response.status_code == 302
     assert response.url == reverse("labels")
@@ -145,3 +153,4 @@ def test_delete_label_with_associated_task(
     assert "Can not delete the label associated with a task" in str(
         redirect_response.content,
     )
+    assert Label.objects.filter(pk=label.pk).exists()
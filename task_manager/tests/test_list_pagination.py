@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.models import Label, SiteUser, Status
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+
+
+@pytest.fixture
+def small_pages(settings):
+    """Set list page size to 3 objects and maximum to 5."""
+    settings.LIST_PAGE_SIZE = 3
+    settings.LIST_MAX_PAGE_SIZE = 5
+
+
+def collect_pages(client, url_name, context_name):
+    """Follow `next` pages from the first page and collect objects."""
+    pages = []
+    response = client.get(reverse(url_name))
+    pages.append(list(response.context[context_name]))
+    while response.context["next_page_query"]:
+        response = client.get(
+            reverse(url_name),
+            QueryDict(response.context["next_page_query"]),
+        )
+        assert response.status_code == 200
+        pages.append(list(response.context[context_name]))
+    return pages
+
+
+@pytest.mark.django_db
+def test_users_list_paginated_without_count(client, small_pages):
+    """
+    Test that public users list is paginated without counting users.
+
+    Should show all users page by page, newest first.
+    """
+    users = [SiteUser.objects.create(username=f"user{i}") for i in range(7)]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("users"))
+    # Page of users and their task counters
+    assert len(queries) == 2
+    assert not any("COUNT(" in query["sql"].upper() for query in queries)
+    assert response.context["paginator"].num_pages is None
+    pages = collect_pages(client, "users", "user_list")
+    assert [len(page) for page in pages] == [3, 3, 1]
+    walked = [user for page in pages for user in page]
+    assert walked == sorted(
+        users,
+        key=lambda user: (user.signup_date, user.pk),
+        reverse=True,
+    )
+    assert client.get(reverse("users"), {"page": 4}).status_code == 404
+    assert client.get(reverse("users"), {"page": "x"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_list_page_size_parameter(client, small_pages):
+    """Test that page size is taken from request up to the maximum."""
+    for index in range(7):
+        SiteUser.objects.create(username=f"user{index}")
+    response = client.get(reverse("users"), {"page_size": 2})
+    assert len(response.context["user_list"]) == 2
+    response = client.get(reverse("users"), {"page_size": 1000})
+    assert len(response.context["user_list"]) == 5
+
+
+def test_statuses_list_with_total_count(
+    auto_login_user,
+    small_pages,
+    settings,
+):
+    """Test that total number of pages is shown if counting is on."""
+    settings.LIST_PAGINATION_COUNT = True
+    client, _ = auto_login_user()
+    Status.objects.bulk_create(
+        Status(name=f"status {index}") for index in range(7)
+    )
+    response = client.get(reverse("statuses"), {"page": 2})
+    assert response.context["paginator"].num_pages == 3
+    assert "Page 2 of 3" in response.content.decode()
+
+
+def test_labels_list_cursor_mode(auto_login_user, small_pages, settings):
+    """Test walking labels list with cursor pagination."""
+    settings.LIST_PAGINATION_MODE = "cursor"
+    client, _ = auto_login_user()
+    labels = [Label.objects.create(name=f"label {i}") for i in range(7)]
+    pages = collect_pages(client, "labels", "label_list")
+    assert [len(page) for page in pages] == [3, 3, 1]
+    walked = [label for page in pages for label in page]
+    assert walked == sorted(
+        labels,
+        key=lambda label: (label.created_on, label.pk),
+        reverse=True,
+    )
@@ -0,0 +1,121 @@
+import pytest
+from django.urls import reverse
+
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_labels_set,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+
+# Session, authenticated user, page of tasks and status filter dropdown.
+# Performer and label filters are autocompleted, so their dropdowns
+# don't query anything until a value is selected.
+TASK_LIST_QUERIES = 4
+# Session, authenticated user, task with its relations, task labels
+TASK_DETAIL_QUERIES = 4
+# Session, authenticated user and the object the permission is checked for
+PERMISSION_GATED_QUERIES = 3
+
+
+@pytest.mark.parametrize("num_tasks", [0, 1, 15])
+def test_tasks_list_query_count(
+    num_tasks,
+    client,
+    auto_login_user,
+    create_tasks_set,
+    django_assert_num_queries,
+):
+    """
+    Test number of SQL queries issued by the tasks list page.
+
+    Filter forms should be built once, so every dropdown
+    is queried exactly once. Task relations should be joined,
+    so the number of queries does not depend on the number of tasks.
+    """
+    client, _ = auto_login_user()
+    if num_tasks:
+        create_tasks_set(num_tasks=num_tasks)
+    with django_assert_num_queries(TASK_LIST_QUERIES):
+        response = client.get(reverse("tasks"))
+    assert response.status_code == 200
+    assert len(response.context["task_list"]) == num_tasks
+
+
+def test_tasks_list_with_filters_query_count(
+    client,
+    auto_login_user,
+    create_status,
+    django_assert_num_queries,
+):
+    """
+    Test number of SQL queries issued by the filtered tasks list page.
+
+    Validation of the status filter value costs two more queries:
+    fetching the status and its existence check by model validation
+    of TaskFilterForm.
+    """
+    client, _ = auto_login_user()
+    status = create_status()
+    with django_assert_num_queries(TASK_LIST_QUERIES + 2):
+        response = client.get(
+            reverse("tasks"),
+            {"status": status.pk, "self_tasks": "on"},
+        )
+    assert response.status_code == 200
+
+
+def test_task_detail_query_count(
+    client,
+    auto_login_user,
+    create_task,
+    create_labels_set,
+    django_assert_num_queries,
+):
+    """Test number of SQL queries issued by the task details page."""
+    client, _ = auto_login_user()
+    task = create_task(label=create_labels_set(min=3, max=6))
+    with django_assert_num_queries(TASK_DETAIL_QUERIES):
+        response = client.get(reverse("task_detail", kwargs={"pk": task.pk}))
+    assert response.status_code == 200
+    for label in task.label.all():
+        assert label.name in response.content.decode()
+
+
+def test_task_delete_page_query_count(
+    auto_login_user,
+    create_task,
+    django_assert_num_queries,
+):
+    """Test that task is fetched with its creator once for the page."""
+    client, user = auto_login_user()
+    task = create_task(creator=user)
+    with django_assert_num_queries(PERMISSION_GATED_QUERIES):
+        response = client.get(reverse("task_delete", kwargs={"pk": task.pk}))
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "url_name, num_queries",
+    [
+        ("user_update", PERMISSION_GATED_QUERIES),
+        # The deletion guard checks if tasks refer to the user
+        ("user_delete", PERMISSION_GATED_QUERIES + 1),
+    ],
+)
+def test_user_pages_query_count(
+    url_name,
+    num_queries,
+    auto_login_user,
+    django_assert_num_queries,
+):
+    """Test that target user is fetched once for the permission check."""
+    client, user = auto_login_user()
+    with django_assert_num_queries(num_queries):
+        response = client.get(reverse(url_name, kwargs={"pk": user.pk}))
+    assert response.status_code == 200
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from task_manager.db.routers import (
+    ReplicaRouter,
+    replica_reads_allowed,
+    use_replicas,
+)
+from task_manager.middleware import (
+    PRIMARY_PIN_COOKIE,
+    ReplicaPinningMiddleware,
+)
+from task_manager.models import Task
+from task_manager.views.tasks import (
+    TaskCreateView,
+    TaskDeleteView,
+    TaskDetailView,
+    TaskListView,
+)
+
+REPLICA = "replica_1"
+
+
+@pytest.fixture
+def with_replica(settings):
+    """Configure a read replica for the router."""
+    settings.REPLICA_DATABASES = [REPLICA]
+
+
+def make_middleware(view_class):
+    """Return middleware responding with database chosen for reads."""
+
+    def get_response(request):  # noqa: WPS430
+        # Emulate request handler calling view middleware
+        middleware.process_view(request, view_class.as_view(), (), {})
+        return HttpResponse(ReplicaRouter().db_for_read(Task))
+
+    middleware = ReplicaPinningMiddleware(get_response)
+    return middleware
+
+
+def test_router_reads_from_primary_by_default(with_replica):
+    """Test that replicas are used only when allowed."""
+    router = ReplicaRouter()
+    assert router.db_for_read(Task) == "default"
+    with use_replicas():
+        assert router.db_for_read(Task) == REPLICA
+        assert router.db_for_write(Task) == "default"
+    assert router.db_for_read(Task) == "default"
+
+
+def test_router_without_replicas(settings):
+    """Test that everything goes to primary without replicas."""
+    settings.REPLICA_DATABASES = []
+    with use_replicas():
+        assert ReplicaRouter().db_for_read(Task) == "default"
+    with pytest.raises(MiddlewareNotUsed):
+        ReplicaPinningMiddleware(lambda request: HttpResponse())
+
+
+def test_router_does_not_migrate_replicas(with_replica):
+    """Test that migrations are not applied to replicas."""
+    router = ReplicaRouter()
+    assert router.allow_migrate(REPLICA, "task_manager") is False
+    assert router.allow_migrate("default", "task_manager") is None
+
+
+@pytest.mark.parametrize("view_class", [TaskListView, TaskDetailView])
+def test_read_views_use_replica(with_replica, view_class):
+    """Test that safe requests to read-only views read from replica."""
+    response = make_middleware(view_class)(RequestFactory().get("/"))
+    assert response.content.decode() == REPLICA
+    assert PRIMARY_PIN_COOKIE not in response.cookies
+    assert not replica_reads_allowed()
+
+
+@pytest.mark.parametrize("view_class", [TaskCreateView, TaskDeleteView])
+def test_form_views_use_primary(with_replica, view_class):
+    """Test that form and deletion views read from primary."""
+    response = make_middleware(view_class)(RequestFactory().get("/"))
+    assert response.content.decode() == "default"
+
+
+def test_reads_after_write_use_primary(with_replica):
+    """Test that client reads from primary for a while after a write."""
+    middleware = make_middleware(TaskListView)
+    response = middleware(RequestFactory().post("/"))
+    assert response.content.decode() == "default"
+    pin_cookie = response.cookies[PRIMARY_PIN_COOKIE]
+    assert pin_cookie["max-age"] == 10
+    request = RequestFactory().get("/")
+    request.COOKIES[PRIMARY_PIN_COOKIE] = pin_cookie.value
+    assert middleware(request).content.decode() == "default"
+
+
+def test_async_requests_use_replica(with_replica):
+    """Test that async middleware chooses database like sync one."""
+
+    async def get_response(request):  # noqa: WPS430
+        return HttpResponse(ReplicaRouter().db_for_read(Task))
+
+    middleware = ReplicaPinningMiddleware(get_response)
+    assert asyncio.iscoroutinefunction(middleware)
+    response = async_to_sync(middleware)(RequestFactory().get("/"))
+    assert response.content.decode() == REPLICA
+    response = async_to_sync(middleware)(RequestFactory().post("/"))
+    assert response.content.decode() == "default"
+    assert PRIMARY_PIN_COOKIE in response.cookies
+    assert not replica_reads_allowed()
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from task_manager.middleware import RequestMetricsMiddleware
+from task_manager.models import Status
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+
+METRICS_LOGGER = "task_manager.requests"
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    """Enable request metrics middleware."""
+    settings.REQUEST_METRICS_ENABLED = True
+    settings.REQUEST_METRICS_N_PLUS_ONE_THRESHOLD = 3
+
+
+def get_metrics_records(caplog):
+    """Return request metrics logged as JSON lines."""
+    return [
+        json.loads(record.getMessage())
+        for record in caplog.records
+        if record.name == METRICS_LOGGER and record.levelno == logging.INFO
+    ]
+
+
+def test_request_metrics_disabled(settings):
+    """Test that disabled middleware is removed from middleware chain."""
+    settings.REQUEST_METRICS_ENABLED = False
+    with pytest.raises(MiddlewareNotUsed):
+        RequestMetricsMiddleware(lambda request: HttpResponse())
+
+
+def test_request_metrics_logged(
+    metrics_enabled,
+    caplog,
+    auto_login_user,
+    create_tasks_set,
+):
+    """Test that timings and SQL statistics of a request are logged."""
+    client, _ = auto_login_user()
+    create_tasks_set(num_tasks=3)
+    with caplog.at_level(logging.INFO, logger=METRICS_LOGGER):
+        response = client.get(reverse("tasks"))
+    assert response.status_code == 200
+    records = get_metrics_records(caplog)
+    assert len(records) == 1
+    metrics = records[0]
+    assert metrics["view"] == "tasks"
+    assert metrics["method"] == "GET"
+    assert metrics["status"] == 200
+    assert metrics["queries"] > 0
+    assert metrics["response_size"] == len(response.content)
+    assert metrics["template_ms"] > 0
+    assert metrics["total_ms"] >= metrics["template_ms"]
+    server_timing = response["Server-Timing"]
+    assert f'desc="{metrics["queries"]} queries"' in server_timing
+    assert "tpl;dur=" in server_timing
+    assert "total;dur=" in server_timing
+
+
+@pytest.mark.django_db
+def test_request_metrics_n_plus_one(metrics_enabled, caplog):
+    """Test that SQL repeated above threshold is reported as N+1."""
+    statuses = Status.objects.bulk_create(
+        Status(name=f"status {index}") for index in range(5)
+    )
+    status_ids = list(Status.objects.values_list("pk", flat=True))
+
+    def view_with_n_plus_one(request):  # noqa: WPS430
+        for status_id in status_ids:
+            Status.objects.get(pk=status_id)
+        Status.objects.get(pk=status_ids[0])
+        return HttpResponse("ok")
+
+    middleware = RequestMetricsMiddleware(view_with_n_plus_one)
+    with caplog.at_level(logging.INFO, logger=METRICS_LOGGER):
+        response = middleware(RequestFactory().get("/"))
+    metrics = get_metrics_records(caplog)[0]
+    assert metrics["queries"] == len(statuses) + 1
+    assert metrics["duplicate_queries"] == 1
+    assert metrics["view"] is None
+    warnings = [
+        record.getMessage()
+        for record in caplog.records
+        if record.levelno == logging.WARNING
+    ]
+    assert len(warnings) == 1
+    assert "Possible N+1 queries" in warnings[0]
+    assert "6 times" in warnings[0]
+    assert "Server-Timing" in response
+
+
+@pytest.mark.django_db
+def test_request_metrics_of_async_request(metrics_enabled, caplog):
+    """Test that async middleware collects queries of async views."""
+
+    async def async_view(request):  # noqa: WPS430
+        await Status.objects.acreate(name="created asynchronously")
+        return HttpResponse(str(await Status.objects.acount()))
+
+    middleware = RequestMetricsMiddleware(async_view)
+    assert asyncio.iscoroutinefunction(middleware)
+    with caplog.at_level(logging.INFO, logger=METRICS_LOGGER):
+        response = async_to_sync(middleware)(RequestFactory().get("/"))
+    assert response.content == b"1"
+    metrics = get_metrics_records(caplog)[0]
+    assert metrics["queries"] == 2
+    assert "Server-Timing" in response
+
+
+def test_request_metrics_of_streaming_response(
+    metrics_enabled,
+    caplog,
+    auto_login_user,
+    create_tasks_set,
+):
+    """Test that streaming response is logged once its content is sent."""
+    client, _ = auto_login_user()
+    create_tasks_set(num_tasks=3)
+    with caplog.at_level(logging.INFO, logger=METRICS_LOGGER):
+        response = client.get(reverse("task_export"), {"format": "ndjson"})
+        assert response.streaming
+        assert not get_metrics_records(caplog)
+        content = b"".join(response.streaming_content)
+    records = get_metrics_records(caplog)
+    assert len(records) == 1
+    metrics = records[0]
+    assert metrics["view"] == "task_export"
+    assert metrics["response_size"] == len(content)
+    # Tasks are fetched while the content is streamed
+    assert metrics["queries"] > 0
+    assert metrics["total_ms"] >= metrics["db_ms"]
@@ -0,0 +1,154 @@
+from django.contrib.messages import get_messages
+from django.urls import reverse
+
+from task_manager.models import Task
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_labels_set,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+
+# Session, authenticated user, status, savepoints of the action and of
+# the update, locked tasks with their status, UPDATE, counters INSERT
+# and UPDATE, releases of the savepoints
+STATUS_UPDATE_QUERIES = 11
+# Session, authenticated user, savepoint of the action, count of others'
+# tasks, ids of own tasks, savepoint of the deletion, tasks per status
+# and performer, tasks per label, DELETE of label links, DELETE of tasks,
+# counters INSERT and UPDATE, releases of the savepoints
+DELETE_QUERIES = 14
+
+
+def post_bulk_action(client, data, query=""):
+    """Post bulk action, return response and messages shown."""
+    url = reverse("task_bulk")
+    if query:
+        url = f"{url}?{query}"
+    data = {f"bulk-{name}": value for name, value in data.items()}
+    response = client.post(url, data)
+    shown = get_messages(response.wsgi_request)
+    return response, [str(message) for message in shown]
+
+
+def test_bulk_status_change(
+    auto_login_user,
+    create_tasks_set,
+    create_status,
+    django_assert_num_queries,
+):
+    """Test that status of selected tasks is changed by one UPDATE."""
+    client, _ = auto_login_user()
+    tasks = create_tasks_set(num_tasks=5)
+    selected = [task.pk for task in tasks[:3]]
+    status = create_status()
+    with django_assert_num_queries(STATUS_UPDATE_QUERIES):
+        response, _ = post_bulk_action(
+            client,
+            {"action": "status", "ids": selected, "status": status.pk},
+        )
+    assert response.status_code == 302
+    assert response.url == reverse("tasks")
+    updated = Task.objects.filter(status=status)
+    assert sorted(updated.values_list("pk", flat=True)) == sorted(selected)
+
+
+def test_bulk_actions_on_filtered_tasks(
+    auto_login_user,
+    create_tasks_set,
+    create_status,
+    create_user,
+    create_labels_set,
+):
+    """Test actions applied to all tasks matching the list filters."""
+    client, _ = auto_login_user()
+    status = create_status()
+    tasks = create_tasks_set(num_tasks=4, status=status)
+    other_tasks = create_tasks_set(num_tasks=2)
+    performer = create_user()
+    query = f"status={status.pk}"
+    response, _ = post_bulk_action(
+        client,
+        {"action": "performer", "select_all": "on", "performer": performer.pk},
+        query,
+    )
+    assert response.url == f"{reverse('tasks')}?{query}"
+    assert set(
+        Task.objects.filter(performer=performer).values_list("pk", flat=True),
+    ) == {task.pk for task in tasks}
+    labels = create_labels_set(min=2, max=3)
+    tasks[0].label.add(labels[0])
+    post_bulk_action(
+        client,
+        {
+            "action": "labels",
+            "select_all": "on",
+            "labels": [label.pk for label in labels],
+        },
+        query,
+    )
+    for task in tasks:
+        assert set(task.label.all()) >= set(labels)
+    for other_task in other_tasks:
+        assert not set(other_task.label.all()) & set(labels)
+
+
+def test_bulk_delete_own_tasks_only(
+    use_en_lang,
+    auto_login_user,
+    create_tasks_set,
+    create_user,
+    django_assert_num_queries,
+):
+    """Test that only own tasks are deleted by a regular user."""
+    client, user = auto_login_user()
+    own_tasks = create_tasks_set(num_tasks=3, creator=user)
+    other_tasks = create_tasks_set(num_tasks=2, creator=create_user())
+    selected = [task.pk for task in own_tasks + other_tasks]
+    with django_assert_num_queries(DELETE_QUERIES):
+        _, shown = post_bulk_action(
+            client,
+            {"action": "delete", "ids": selected},
+        )
+    assert set(Task.objects.values_list("pk", flat=True)) == {
+        task.pk for task in other_tasks
+    }
+    assert "Tasks of other users not deleted: 2" in shown
+    assert "Tasks deleted: 3" in shown
+    through = Task.label.through
+    assert not through.objects.filter(
+        task_id__in=[task.pk for task in own_tasks],
+    ).exists()
+
+
+def test_bulk_delete_by_superuser(
+    auto_login_user,
+    create_user,
+    create_tasks_set,
+):
+    """Test that superuser deletes tasks created by any user."""
+    client, _ = auto_login_user(user=create_user(is_superuser=True))
+    tasks = create_tasks_set(num_tasks=3)
+    post_bulk_action(
+        client,
+        {"action": "delete", "ids": [task.pk for task in tasks]},
+    )
+    assert not Task.objects.exists()
+
+
+def test_bulk_action_invalid(use_en_lang, auto_login_user, create_tasks_set):
+    """Test that invalid actions change nothing and show errors."""
+    client, _ = auto_login_user()
+    tasks = create_tasks_set(num_tasks=2)
+    response, shown = post_bulk_action(client, {"action": "status"})
+    assert response.status_code == 302
+    assert "Select tasks to apply the action to." in shown
+    assert "Choose the value to set." in shown
+    response = client.get(reverse("task_bulk"))
+    assert response.status_code == 405
+    assert Task.objects.count() == len(tasks)
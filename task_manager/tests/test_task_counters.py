@@ -0,0 +1,141 @@
+from django.core.management import call_command
+from django.urls import reverse
+
+from task_manager.models import CounterDimension, Task, TaskCounter
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_labels_set,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+
+STATUS = CounterDimension.STATUS
+PERFORMER = CounterDimension.PERFORMER
+LABEL = CounterDimension.LABEL
+
+
+def get_count(dimension, object_id):
+    """Return stored number of tasks of the object."""
+    return TaskCounter.objects.counts(dimension).get(object_id, 0)
+
+
+def assert_counters_exact():
+    """Check that counters match numbers of tasks in the database."""
+    assert TaskCounter.objects.reconcile(dry_run=True) == {}
+
+
+def test_counters_follow_task_changes(
+    create_task,
+    create_status,
+    create_user,
+    create_labels_set,
+):
+    """Test that saving and deleting tasks moves them between counters."""
+    first_label, second_label = create_labels_set(min=2, max=3)[:2]
+    task = create_task(label=[first_label])
+    old_status = task.status
+    assert get_count(STATUS, old_status.pk) == 1
+    assert get_count(LABEL, first_label.pk) == 1
+
+    task = Task.objects.get(pk=task.pk)
+    task.status = create_status()
+    task.performer = create_user()
+    task.save()
+    assert get_count(STATUS, old_status.pk) == 0
+    assert get_count(STATUS, task.status_id) == 1
+    assert get_count(PERFORMER, task.performer_id) == 1
+
+    task.label.set([second_label])
+    assert get_count(LABEL, first_label.pk) == 0
+    assert get_count(LABEL, second_label.pk) == 1
+    second_label.tasks.add(create_task())
+    assert get_count(LABEL, second_label.pk) == 2
+    second_label.tasks.remove(task, task)
+    task.label.clear()
+    assert get_count(LABEL, second_label.pk) == 1
+    assert_counters_exact()
+
+    Task.objects.for_list().get(pk=task.pk).save()
+    task.delete()
+    assert get_count(STATUS, task.status_id) == 0
+    assert_counters_exact()
+
+
+def test_counters_follow_bulk_actions(
+    auto_login_user,
+    create_tasks_set,
+    create_status,
+    create_labels_set,
+):
+    """Test that bulk actions adjust counters without drift."""
+    client, user = auto_login_user()
+    status = create_status()
+    tasks = create_tasks_set(num_tasks=4, creator=user)
+    ids = [task.pk for task in tasks]
+    url = reverse("task_bulk")
+    client.post(
+        url,
+        {"bulk-action": "status", "bulk-ids": ids, "bulk-status": status.pk},
+    )
+    assert get_count(STATUS, status.pk) == len(tasks)
+    labels = create_labels_set(min=2, max=3)
+    client.post(
+        url,
+        {
+            "bulk-action": "labels",
+            "bulk-ids": ids,
+            "bulk-labels": [label.pk for label in labels],
+        },
+    )
+    client.post(
+        url,
+        {
+            "bulk-action": "labels",
+            "bulk-ids": ids[:2],
+            "bulk-labels": [labels[0].pk],
+        },
+    )
+    assert get_count(LABEL, labels[0].pk) == len(tasks)
+    assert_counters_exact()
+    client.post(url, {"bulk-action": "delete", "bulk-ids": ids[:3]})
+    assert get_count(STATUS, status.pk) == 1
+    assert_counters_exact()
+
+
+def test_counters_shown_on_pages(auto_login_user, create_tasks_set):
+    """Test that lists and index page show numbers of tasks."""
+    client, user = auto_login_user()
+    tasks = create_tasks_set(num_tasks=3, performer=user)
+    response = client.get(reverse("users"))
+    listed = {obj.pk: obj.task_count for obj in response.context["user_list"]}
+    assert listed[user.pk] == len(tasks)
+    response = client.get(reverse("statuses"))
+    for status in response.context["status_list"]:
+        assert status.task_count == 1
+    response = client.get(reverse("index"))
+    assert response.context["total_tasks"] == len(tasks)
+    assert response.context["performer_counts"] == [(user, len(tasks))]
+
+
+def test_reconcile_task_counters(create_tasks_set, create_status, capsys):
+    """Test that drifted counters are reported and fixed."""
+    status = create_status()
+    create_tasks_set(num_tasks=3, status=status)
+    TaskCounter.objects.filter(dimension=STATUS, object_id=status.pk).update(
+        count=10,
+    )
+    TaskCounter.objects.filter(dimension=LABEL).delete()
+    call_command("reconcile_task_counters", "--dry-run")
+    output = capsys.readouterr().out
+    assert f"status {status.pk}: stored 10, actual 3" in output
+    assert "Drifted counters found: 4" in output
+    assert get_count(STATUS, status.pk) == 10
+    call_command("reconcile_task_counters")
+    assert "Drifted counters fixed: 4" in capsys.readouterr().out
+    assert get_count(STATUS, status.pk) == 3
+    assert_counters_exact()
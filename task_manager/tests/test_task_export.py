@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+
+from django.urls import reverse
+
+from task_manager.export import EXPORT_COLUMNS
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_labels_set,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+from task_manager.views.task_export import TaskExportView
+
+# Session, authenticated user, tasks
+EXPORT_QUERIES = 3
+
+
+def read_export(client, params):
+    """Return content of streamed export."""
+    response = client.get(reverse("task_export"), params)
+    assert response.status_code == 200
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+def test_tasks_csv_export(auto_login_user, create_task, create_labels_set):
+    """Test CSV export of filtered tasks with joined names."""
+    client, user = auto_login_user()
+    own_task = create_task(creator=user, label=create_labels_set(min=2, max=4))
+    create_task()
+    content = read_export(client, {"format": "csv", "self_tasks": "on"})
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["id"] == str(own_task.pk)
+    assert row["status"] == own_task.status.name
+    assert row["creator"] == user.username
+    assert row["performer"] == own_task.performer.username
+    assert row["created_on"] == own_task.created_on.isoformat()
+    assert row["labels"].split(", ") == sorted(
+        own_task.label.values_list("name", flat=True),
+    )
+
+
+def test_tasks_ndjson_export(auto_login_user, create_tasks_set, create_status):
+    """Test NDJSON export filtered by status, newest tasks first."""
+    client, _ = auto_login_user()
+    status = create_status()
+    tasks = create_tasks_set(num_tasks=4, status=status)
+    create_tasks_set(num_tasks=2)
+    content = read_export(client, {"format": "ndjson", "status": status.pk})
+    exported = [json.loads(line) for line in content.splitlines()]
+    expected = sorted(
+        tasks,
+        key=lambda task: (task.created_on, task.pk),
+        reverse=True,
+    )
+    assert [task["id"] for task in exported] == [task.pk for task in expected]
+    assert {task["status"] for task in exported} == {status.name}
+    assert all(len(task["labels"]) == 1 for task in exported)
+
+
+def test_tasks_export_query_count(
+    auto_login_user,
+    create_tasks_set,
+    django_assert_num_queries,
+    monkeypatch,
+):
+    """Test that labels are queried once per chunk of tasks."""
+    monkeypatch.setattr(TaskExportView, "chunk_size", 3)
+    client, _ = auto_login_user()
+    create_tasks_set(num_tasks=7)
+    # Three chunks of tasks, labels query for each of them
+    with django_assert_num_queries(EXPORT_QUERIES + 3):
+        content = read_export(client, {"format": "csv"})
+    assert len(content.splitlines()) == 8
+
+
+def test_tasks_export_unknown_format(auto_login_user):
+    """Test that unknown export format is rejected."""
+    client, _ = auto_login_user()
+    response = client.get(reverse("task_export"), {"format": "xml"})
+    assert response.status_code == 400
@@ -0,0 +1,136 @@
+import pytest
+from django.http import QueryDict
+from django.urls import reverse
+
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+from task_manager.views.tasks import TaskListView
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    """Set tasks list page size to 3 tasks."""
+    monkeypatch.setattr(TaskListView, "paginate_by", 3)
+
+
+def collect_pages(client, params):
+    """Follow `next` cursors from the first page and collect all pages."""
+    pages = []
+    response = client.get(reverse("tasks"), params)
+    pages.append(response)
+    while response.context["next_cursor"]:
+        response = client.get(
+            reverse("tasks"),
+            QueryDict(response.context["next_page_query"]),
+        )
+        pages.append(response)
+    return pages
+
+
+def test_tasks_pagination_walks_all_tasks_in_order(
+    client,
+    create_tasks_set,
+    auto_login_user,
+    small_pages,
+):
+    """
+    Test walking the tasks list page by page.
+
+    Should return every task exactly once, newest first.
+    """
+    tasks = create_tasks_set(num_tasks=10)
+    client, _ = auto_login_user()
+
+    pages = collect_pages(client, {})
+
+    assert [len(page.context["task_list"]) for page in pages] == [3, 3, 3, 1]
+    walked = [task for page in pages for task in page.context["task_list"]]
+    expected = sorted(
+        tasks,
+        key=lambda task: (task.created_on, task.pk),
+        reverse=True,
+    )
+    assert walked == expected
+    assert pages[0].context["previous_cursor"] is None
+    assert pages[-1].context["next_cursor"] is None
+
+
+def test_tasks_pagination_previous_page(
+    client,
+    create_tasks_set,
+    auto_login_user,
+    small_pages,
+):
+    """Test going back from the second page returns the first page."""
+    create_tasks_set(num_tasks=7)
+    client, _ = auto_login_user()
+
+    first_page = client.get(reverse("tasks"))
+    second_page = client.get(
+        reverse("tasks"),
+        QueryDict(first_page.context["next_page_query"]),
+    )
+    back_page = client.get(
+        reverse("tasks"),
+        QueryDict(second_page.context["previous_page_query"]),
+    )
+
+    assert list(back_page.context["task_list"]) == list(
+        first_page.context["task_list"],
+    )
+    assert back_page.context["previous_cursor"] is None
+    assert back_page.context["next_cursor"] is not None
+
+
+def test_tasks_pagination_same_creation_date(
+    client,
+    create_tasks_set,
+    auto_login_user,
+    faker,
+    small_pages,
+):
+    """Test tasks created at the same moment are neither lost nor repeated."""
+    created_on = faker.past_datetime()
+    tasks = create_tasks_set(num_tasks=8, created_on=created_on)
+    client, _ = auto_login_user()
+
+    pages = collect_pages(client, {})
+
+    walked = [task for page in pages for task in page.context["task_list"]]
+    assert walked == sorted(tasks, key=lambda task: task.pk, reverse=True)
+
+
+def test_tasks_pagination_keeps_filters(
+    client,
+    create_tasks_set,
+    create_status,
+    auto_login_user,
+    small_pages,
+):
+    """Test cursors combined with status filter and own tasks toggle."""
+    client, user = auto_login_user()
+    status = create_status()
+    target_tasks = create_tasks_set(num_tasks=5, creator=user, status=status)
+    create_tasks_set(num_tasks=4, status=status)
+    create_tasks_set(num_tasks=4, creator=user)
+
+    pages = collect_pages(client, {"status": status.pk, "self_tasks": "on"})
+
+    walked = [task for page in pages for task in page.context["task_list"]]
+    assert set(walked) == set(target_tasks)
+    assert len(walked) == len(target_tasks)
+
+
+def test_tasks_pagination_invalid_cursor(client, auto_login_user):
+    """Test requesting tasks list with malformed cursor returns 404."""
+    client, _ = auto_login_user()
+    response = client.get(reverse("tasks"), {"cursor": "not-a-cursor"})
+    assert response.status_code == 404
@@ -0,0 +1,141 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.http import QueryDict
+from django.urls import reverse
+
+from task_manager.models import Task
+from task_manager.search import search_terms
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+from task_manager.views.tasks import TaskListView
+
+
+def search_list(client, params):
+    """Return ids of tasks shown on the first page of tasks list."""
+    response = client.get(reverse("tasks"), params)
+    assert response.status_code == 200
+    return [task.pk for task in response.context["task_list"]]
+
+
+@pytest.mark.parametrize(
+    "text, terms",
+    [
+        ("deploy", ["deploy"]),
+        ('"fix" AND login* (NEAR', ["fix", "AND", "login", "NEAR"]),
+        ("Обновить  сервер", ["Обновить", "сервер"]),
+        (" -:* ", []),
+    ],
+)
+def test_search_terms(text, terms):
+    """Test that query syntax is dropped from search text."""
+    assert search_terms(text) == terms
+
+
+def test_task_search_by_name_and_description(auto_login_user, create_task):
+    """Test search by word prefixes, name matches ranked first."""
+    client, _ = auto_login_user()
+    in_description = create_task(
+        name="Write release notes",
+        description="Describe the deployment of the new server",
+    )
+    in_name = create_task(
+        name="Deploy server",
+        description="Use the usual checklist",
+    )
+    create_task(name="Unrelated", description="Nothing to see")
+    assert search_list(client, {"search": "deploy"}) == [
+        in_name.pk,
+        in_description.pk,
+    ]
+    assert search_list(client, {"search": "serv deploy"}) == [
+        in_name.pk,
+        in_description.pk,
+    ]
+    assert search_list(client, {"search": "checklist"}) == [in_name.pk]
+    assert search_list(client, {"search": '"deploy* ('}) == [
+        in_name.pk,
+        in_description.pk,
+    ]
+
+
+def test_task_search_combined_with_filters(
+    auto_login_user,
+    create_task,
+    create_status,
+):
+    """Test that search is combined with the other filters."""
+    client, user = auto_login_user()
+    status = create_status()
+    matching = create_task(name="Backup database", status=status)
+    create_task(name="Backup files")
+    create_task(name="Backup logs", status=status, creator=user)
+    params = {"search": "backup", "status": status.pk}
+    assert set(search_list(client, params)) == {
+        matching.pk,
+        Task.objects.get(name="Backup logs").pk,
+    }
+    params["self_tasks"] = "on"
+    assert search_list(client, params) == [
+        Task.objects.get(name="Backup logs").pk,
+    ]
+
+
+def test_task_search_index_follows_changes(auto_login_user, create_task):
+    """Test that updated and deleted tasks are searched correctly."""
+    client, _ = auto_login_user()
+    task = create_task(name="Rotate keys")
+    Task.objects.filter(pk=task.pk).update(name="Renew certificates")
+    assert search_list(client, {"search": "rotate"}) == []
+    assert search_list(client, {"search": "certificates"}) == [task.pk]
+    task.delete()
+    assert search_list(client, {"search": "certificates"}) == []
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite",
+    reason="FTS5 triggers are used on SQLite only",
+)
+def test_task_search_triggers_recreated(create_task):
+    """
+    Test that FTS5 triggers dropped by table changes are recreated.
+
+    Tasks changed while the triggers were missing are found too.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TRIGGER task_manager_task_fts_insert")
+    unindexed = create_task(name="Migrate storage")
+    call_command("migrate", verbosity=0)
+    indexed = create_task(name="Migrate queue")
+    found = Task.objects.search("migrate").values_list("pk", flat=True)
+    assert set(found) == {unindexed.pk, indexed.pk}
+
+
+def test_task_search_pagination(
+    auto_login_user,
+    create_tasks_set,
+    monkeypatch,
+):
+    """Test walking search results page by page."""
+    monkeypatch.setattr(TaskListView, "paginate_by", 2)
+    client, _ = auto_login_user()
+    tasks = create_tasks_set(num_tasks=5, name="Upgrade cluster")
+    create_tasks_set(num_tasks=2, name="Other")
+    seen = []
+    response = client.get(reverse("tasks"), {"search": "upgrade"})
+    seen.extend(task.pk for task in response.context["task_list"])
+    while response.context["next_cursor"]:
+        response = client.get(
+            reverse("tasks"),
+            QueryDict(response.context["next_page_query"]),
+        )
+        seen.extend(task.pk for task in response.context["task_list"])
+    assert sorted(seen) == sorted(task.pk for task in tasks)
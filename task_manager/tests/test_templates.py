@@ -0,0 +1,95 @@
+import importlib.util
+import logging
+
+from django.conf import settings
+from django.template import Engine, Template
+from django.template.loaders.cached import Loader as CachedLoader
+from django.urls import reverse
+
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+from task_manager.utils.templates import (
+    reset_template_cache,
+    timed_template_renders,
+    warm_templates,
+    warmup_template_names,
+)
+
+
+def cached_template_names():
+    """Return names of templates in cache of the cached loader."""
+    loader = Engine.get_default().template_loaders[0]
+    assert isinstance(loader, CachedLoader)
+    return {
+        template.name
+        for template in loader.get_template_cache.values()
+        if isinstance(template, Template)
+    }
+
+
+def load_gunicorn_config():
+    """Import gunicorn configuration module of the project."""
+    spec = importlib.util.spec_from_file_location(
+        "gunicorn_conf",
+        settings.BASE_DIR / "gunicorn.conf.py",
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_warmup_compiles_page_templates():
+    """Test that templates used by every page are compiled at warm-up."""
+    names = warmup_template_names()
+    for name in (
+        "task_manager/base.html",
+        "task_manager/bootstrap.html",
+        "task_manager/task_list.html",
+        "bootstrap4/bootstrap4.html",
+        "bootstrap5/whole_uni_form.html",
+    ):
+        assert name in names
+    reset_template_cache()
+    num_templates, _ = warm_templates()
+    assert num_templates == len(names)
+    assert cached_template_names() == set(names)
+
+
+def test_pages_use_warmed_templates(auto_login_user, create_task):
+    """Test that rendering pages after warm-up compiles no templates."""
+    client, _ = auto_login_user()
+    create_task()
+    reset_template_cache()
+    warm_templates()
+    warmed = cached_template_names()
+    with timed_template_renders() as render_times:
+        client.get(reverse("tasks"))
+        client.get(reverse("task_create"))
+    assert "task_manager/task_list.html" in render_times
+    assert cached_template_names() == warmed
+
+
+def test_gunicorn_worker_warms_templates(settings, caplog):
+    """Test that gunicorn worker hook compiles templates when enabled."""
+
+    class Worker(object):  # noqa: WPS431
+        log = logging.getLogger("gunicorn.error")
+
+    config = load_gunicorn_config()
+    settings.TEMPLATES_WARMUP = False
+    reset_template_cache()
+    config.post_worker_init(Worker())
+    assert not cached_template_names()
+    settings.TEMPLATES_WARMUP = True
+    with caplog.at_level(logging.INFO, logger="gunicorn.error"):
+        config.post_worker_init(Worker())
+    assert "Compiled" in caplog.text
+    assert "task_manager/base.html" in cached_template_names()
@@ -0,0 +1,194 @@
+import base64
+import json
+
+import pytest
+from django.http import QueryDict
+from django.urls import reverse
+
+from task_manager import cache
+from task_manager.models import Task
+from task_manager.tests.fixtures import (
+    auto_login_user,
+    create_label,
+    create_status,
+    create_task,
+    create_tasks_set,
+    create_user,
+    test_password,
+    use_en_lang,
+)
+from task_manager.views.user_tasks import UserTaskListView
+
+# Session, authenticated user and tasks of the page by primary keys
+CACHED_PAGE_QUERIES = 3
+
+
+def page_ids(response):
+    """Return ids of tasks listed on the page."""
+    assert response.status_code == 200
+    return [task.pk for task in response.context["task_list"]]
+
+
+def newest_first(tasks):
+    """Return ids of tasks ordered as the tasks lists."""
+    ordered = sorted(
+        tasks,
+        key=lambda task: (task.created_on, task.pk),
+        reverse=True,
+    )
+    return [task.pk for task in ordered]
+
+
+@pytest.mark.parametrize(
+    "role, field_name",
+    [("assigned", "performer"), ("created", "creator")],
+)
+def test_cached_first_page(
+    role,
+    field_name,
+    auto_login_user,
+    create_tasks_set,
+    django_assert_num_queries,
+):
+    """Test that first page is read from cached task list of the user."""
+    client, user = auto_login_user()
+    tasks = create_tasks_set(num_tasks=4, **{field_name: user})
+    create_tasks_set(num_tasks=2)
+    url = reverse("my_tasks")
+    with django_assert_num_queries(CACHED_PAGE_QUERIES + 1):
+        response = client.get(url, {"role": role})
+    assert page_ids(response) == newest_first(tasks)
+    assert response.context["role"] == role
+    with django_assert_num_queries(CACHED_PAGE_QUERIES):
+        response = client.get(url, {"role": role})
+    assert page_ids(response) == newest_first(tasks)
+
+
+def test_task_lists_follow_changes(
+    auto_login_user,
+    create_label,
+    create_status,
+    create_user,
+    django_capture_on_commit_callbacks,
+    django_assert_num_queries,
+):
+    """Test that cached lists change with created, updated, deleted tasks."""
+    client, user = auto_login_user()
+    other_user = create_user()
+    task_data = {
+        "name": "Mine",
+        "description": "Description",
+        "status": create_status().pk,
+        "performer": user.pk,
+        "label": [create_label().pk],
+    }
+    url = reverse("my_tasks")
+    assert page_ids(client.get(url, {"role": "created"})) == []
+    assert page_ids(client.get(url, {"role": "assigned"})) == []
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(reverse("task_create"), task_data)
+    task = Task.objects.get(name="Mine")
+    with django_assert_num_queries(CACHED_PAGE_QUERIES):
+        assert page_ids(client.get(url, {"role": "created"})) == [task.pk]
+    assert page_ids(client.get(url, {"role": "assigned"})) == [task.pk]
+    client.force_login(other_user)
+    assert page_ids(client.get(url)) == []
+    client.force_login(user)
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(
+            reverse("task_update", kwargs={"pk": task.pk}),
+            {**task_data, "performer": other_user.pk},
+        )
+    assert page_ids(client.get(url, {"role": "assigned"})) == []
+    client.force_login(other_user)
+    with django_assert_num_queries(CACHED_PAGE_QUERIES):
+        assert page_ids(client.get(url)) == [task.pk]
+    client.force_login(user)
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(reverse("task_delete", kwargs={"pk": task.pk}))
+    assert page_ids(client.get(url, {"role": "created"})) == []
+
+
+def test_task_lists_dropped_by_bulk_actions(
+    auto_login_user,
+    create_tasks_set,
+    create_user,
+    django_capture_on_commit_callbacks,
+):
+    """Test that bulk actions drop cached lists of the users involved."""
+    client, user = auto_login_user()
+    tasks = create_tasks_set(num_tasks=3, creator=user)
+    new_performer = create_user()
+    url = reverse("my_tasks")
+    assert page_ids(client.get(url, {"role": "created"})) == newest_first(
+        tasks,
+    )
+    client.force_login(new_performer)
+    assert page_ids(client.get(url)) == []
+    client.force_login(user)
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(
+            reverse("task_bulk"),
+            {
+                "bulk-action": "performer",
+                "bulk-ids": [tasks[0].pk],
+                "bulk-performer": new_performer.pk,
+            },
+        )
+    client.force_login(new_performer)
+    assert page_ids(client.get(url)) == [tasks[0].pk]
+    client.force_login(user)
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(
+            reverse("task_bulk"),
+            {"bulk-action": "delete", "bulk-ids": [tasks[1].pk]},
+        )
+    assert page_ids(client.get(url, {"role": "created"})) == newest_first(
+        [tasks[0], tasks[2]],
+    )
+
+
+@pytest.mark.parametrize("limit", [3, 100])
+def test_pages_beyond_cached_tasks(
+    limit,
+    auto_login_user,
+    create_tasks_set,
+    monkeypatch,
+):
+    """Test paging through tasks beyond the cached newest tasks."""
+    monkeypatch.setattr(cache, "USER_TASKS_LIMIT", limit)
+    monkeypatch.setattr(UserTaskListView, "paginate_by", 2)
+    client, user = auto_login_user()
+    tasks = create_tasks_set(num_tasks=7, performer=user)
+    url = reverse("my_tasks")
+    pages = []
+    response = client.get(url)
+    while True:
+        pages.append(page_ids(response))
+        next_query = response.context["next_page_query"]
+        if next_query is None:
+            break
+        response = client.get(url, QueryDict(next_query))
+    assert sum(pages, []) == newest_first(tasks)
+    # Back to the first page
+    for page in reversed(pages[:-1]):
+        response = client.get(
+            url,
+            QueryDict(response.context["previous_page_query"]),
+        )
+        assert page_ids(response) == page
+    assert response.context["previous_page_query"] is None
+
+
+@pytest.mark.parametrize(
+    "cursor_values",
+    [["2020-01-01T00:00:00", 4], ["2020-01-01T00:00:00+00:00", "x"]],
+)
+def test_tampered_cursor(cursor_values, auto_login_user, create_tasks_set):
+    """Test that cursors not encoded by the paginator are not found."""
+    client, user = auto_login_user()
+    create_tasks_set(num_tasks=3, performer=user)
+    payload = json.dumps(["n", cursor_values]).encode()
+    cursor = base64.urlsafe_b64encode(payload).decode()
+    response = client.get(reverse("my_tasks"), {"cursor": cursor})
+    assert response.status_code == 404
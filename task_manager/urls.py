@@ -31,6 +31,21 @@ urlpatterns = [
     ),
     # Tasks
     path("tasks/", views.tasks.TaskListView.as_view(), name="tasks"),
+    path(
+        "tasks/my/",
+        views.user_tasks.UserTaskListView.as_view(),
+        name="my_tasks",
+    ),
+    path(
+        "tasks/export/",
+        views.task_export.TaskExportView.as_view(),
+        name="task_export",
+    ),
+    path(
+        "tasks/bulk/",
+        views.task_bulk.TaskBulkActionView.as_view(),
+        name="task_bulk",
+    ),
     path(
         "tasks/create/",
         views.tasks.TaskCreateView.as_view(),
@@ -89,4 +104,15 @@ urlpatterns = [
         views.labels.LabelDeleteView.as_view(),
         name="label_delete",
     ),
+    # Autocomplete
+    path(
+        "autocomplete/users/",
+        views.autocomplete.UserAutocompleteView.as_view(),
+        name="user_autocomplete",
+    ),
+    path(
+        "autocomplete/labels/",
+        views.autocomplete.LabelAutocompleteView.as_view(),
+        name="label_autocomplete",
+    ),
 ]
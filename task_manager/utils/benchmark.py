@@ -0,0 +1,286 @@
+"""
+Helpers for benchmarking the views of task manager.
+
+Views are driven through Django test client, or through WSGI and ASGI
+handlers by task_manager.utils.serving, so that the whole request cycle
+(middleware, view, template rendering) is measured without network
+overhead.
+"""
+import importlib
+import math
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager, suppress
+
+from django.conf import settings
+from django.db import connection, connections, reset_queries
+from django.db.backends.signals import connection_created
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import URLPattern, clear_url_caches, get_resolver, reverse
+
+from task_manager.db.metrics import connection_metrics
+from task_manager.views.mixins import AsyncViewMixin
+
+# Routes changing state on GET request or not serving GET requests
+# are not benchmarked
+SKIPPED_ROUTES = frozenset(("logout", "task_bulk"))
+# Superuser making benchmarked requests
+BENCHMARK_USERNAME = "benchmark_user"
+# Percentiles of request latency reported by benchmarks
+LATENCY_PERCENTILES = (50, 95, 99)
+# Growth ratio of latency reported as regression
+REGRESSION_THRESHOLD = 1.2
+# Number of SQL queries per request in reports
+QUERIES_METRIC = "queries"
+
+
+@contextmanager
+def benchmark_database(use_current_db=False, keepdb=False):
+    """
+    Run benchmark on a temporary test database inside the block.
+
+    With `use_current_db` the configured database is used instead.
+    """
+    # Test environment may be already set up, i.e. when run from tests
+    with suppress(RuntimeError):
+        setup_test_environment()
+    if use_current_db:
+        yield
+        return
+    test_db_name = connection.creation.create_test_db(
+        verbosity=0,
+        autoclobber=True,
+        keepdb=keepdb,
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(
+            test_db_name,
+            verbosity=0,
+            keepdb=keepdb,
+        )
+
+
+def percentile(samples, pct):
+    """Return percentile of samples using nearest-rank method."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def latency_percentiles(timings):
+    """Return latency percentiles in milliseconds keyed as in reports."""
+    return {
+        f"p{pct}_ms": round(percentile(timings, pct), 3)
+        for pct in LATENCY_PERCENTILES
+    }
+
+
+def discover_routes(urlconf=None):
+    """
+    Return (name, needs_pk) of all named routes of task manager.
+
+    Included url configurations (admin, i18n) are skipped.
+    """
+    routes = []
+    for pattern in get_resolver(urlconf).url_patterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name:
+            continue
+        if pattern.name in SKIPPED_ROUTES:
+            continue
+        routes.append((pattern.name, "pk" in pattern.pattern.converters))
+    return routes
+
+
+def finish_request():
+    """
+    Release database connections as at the end of a real request.
+
+    Test client keeps connections open between requests, which would
+    hide the cost of connecting when persistent connections are off.
+    Connections inside a transaction (i.e. in tests) are left alone.
+    """
+    for db_connection in connections.all(initialized_only=True):
+        if not db_connection.in_atomic_block:
+            db_connection.close_if_unusable_or_obsolete()
+
+
+def measure_url(client, url, iterations=20, warmup=2):
+    """
+    Measure latency, SQL queries and peak memory of GET requests to url.
+
+    Latency percentiles are in milliseconds, peak memory is in KiB.
+    Connects are database connections acquired per request, which is 0
+    when connections are persistent or pooled.
+    Memory is traced during a separate request, as tracing slows down
+    the requests used for latency measurement.
+    """
+    for _ in range(warmup):
+        client.get(url)
+        finish_request()
+    # Capturing counts queries appended to the log, which is useless
+    # if the log has already reached its maximum length
+    reset_queries()
+    timings = []
+    acquired_before = connection_metrics.total_acquired()
+    with CaptureQueriesContext(connection) as captured:
+        for _ in range(iterations):
+            started_at = time.perf_counter()
+            response = client.get(url)
+            finish_request()
+            timings.append((time.perf_counter() - started_at) * 1000)
+        # Captured queries are read from the log cleared by the next
+        # request
+        num_queries = len(captured)
+    connects = connection_metrics.total_acquired() - acquired_before
+    with ExitStack() as tracing:
+        tracemalloc.start()
+        tracing.callback(tracemalloc.stop)
+        client.get(url)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    return {
+        "status_code": response.status_code,
+        "iterations": iterations,
+        **latency_percentiles(timings),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        QUERIES_METRIC: num_queries / iterations,
+        "connects": connects / iterations,
+        "peak_memory_kib": round(peak_memory / 1024, 1),
+    }
+
+
+def route_url(route_name, pk=None):
+    """Return url of the route."""
+    if pk is None:
+        return reverse(route_name)
+    return reverse(route_name, kwargs={"pk": pk})
+
+
+def measure_form(build_form, render_form, iterations=100, setup=None):
+    """
+    Measure construction and render time of a form.
+
+    Return mean construction and render times in milliseconds.
+    `setup` is called before every construction, i.e. to drop helpers
+    cached by previous forms.
+    """
+    build_time = 0
+    render_time = 0
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        started_at = time.perf_counter()
+        form = build_form()
+        built_at = time.perf_counter()
+        render_form(form)
+        build_time += built_at - started_at
+        render_time += time.perf_counter() - built_at
+    return {
+        "build_ms": round(build_time / iterations * 1000, 4),
+        "render_ms": round(render_time / iterations * 1000, 4),
+    }
+
+
+def paired_results(baseline, current):
+    """Yield dataset, route and results of routes found in both reports."""
+    for dataset, routes in current["results"].items():
+        baseline_routes = baseline["results"].get(dataset, {})
+        for route, measured in routes.items():
+            baseline_result = baseline_routes.get(route)
+            if baseline_result is not None:
+                yield dataset, route, baseline_result, measured
+
+
+def compare_reports(
+    baseline,
+    current,
+    threshold=REGRESSION_THRESHOLD,
+    metric="p95_ms",
+):
+    """
+    Compare two benchmark reports.
+
+    Return list of (dataset, route, metric, baseline value, current value)
+    for routes where the metric grew more than `threshold` times,
+    and for routes issuing more SQL queries than before.
+    """
+    regressions = []
+    for dataset, route, before, after in paired_results(baseline, current):
+        if after[metric] > before[metric] * threshold:
+            regressions.append(
+                (dataset, route, metric, before[metric], after[metric]),
+            )
+        before_queries = before[QUERIES_METRIC]
+        if after[QUERIES_METRIC] > before_queries:
+            regressions.append(
+                (
+                    dataset,
+                    route,
+                    QUERIES_METRIC,
+                    before_queries,
+                    after[QUERIES_METRIC],
+                ),
+            )
+    return regressions
+
+
+def reload_urlconf():
+    """Reload URL configuration, creating views anew."""
+    clear_url_caches()
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+
+
+@contextmanager
+def async_views(enabled=True):
+    """
+    Serve views in async or sync mode inside the block.
+
+    Views are made async or sync by a class attribute when URLs are
+    loaded, so URL configuration is reloaded on entering and on leaving
+    the block.
+    """
+    served_async = AsyncViewMixin.view_is_async
+    with ExitStack() as stack:
+        stack.callback(reload_urlconf)
+        stack.callback(setattr, AsyncViewMixin, "view_is_async", served_async)
+        AsyncViewMixin.view_is_async = enabled
+        reload_urlconf()
+        yield
+
+
+@contextmanager
+def simulated_db_latency(seconds):
+    """
+    Delay every SQL query by `seconds` inside the block.
+
+    Delay is added to connections opened by any thread, as async views
+    run queries in threads of their own.
+    """
+
+    def delay_query(  # noqa: WPS430
+        execute,
+        sql,
+        query_params,
+        many,
+        context,
+    ):
+        time.sleep(seconds)
+        return execute(sql, query_params, many, context)
+
+    def add_delay(sender, connection, **kwargs):  # noqa: WPS430, WPS442
+        if delay_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(delay_query)
+
+    with ExitStack() as delays:
+        for db_connection in connections.all(initialized_only=True):
+            add_delay(None, db_connection)
+            delays.callback(
+                db_connection.execute_wrappers.remove,
+                delay_query,
+            )
+        connection_created.connect(add_delay, weak=False)
+        delays.callback(connection_created.disconnect, add_delay)
+        yield
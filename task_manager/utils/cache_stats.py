@@ -0,0 +1,115 @@
+"""
+Statistics of cache aliases of task manager.
+
+Entries and sizes are read from the backend: local memory caches cover
+only the current process, file caches don't know key names (files are
+named by key hashes), Redis keys of the alias are scanned up to a limit.
+Hits and misses are counted by the app per alias (see cache.py) and
+cover lookups made by task manager code, not sessions.
+"""
+import itertools
+import os
+from contextlib import suppress
+from pathlib import Path
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from task_manager.cache import get_lookup_totals
+
+_BACKEND_NAMES = {  # noqa: WPS407
+    LocMemCache: "locmem",
+    FileBasedCache: "file",
+    RedisCache: "redis",
+}
+
+
+def alias_stats(alias, top=10, sample=1000):
+    """
+    Return entries, memory use, lookups and top keys of the alias.
+
+    Top keys are the largest `top` entries as (key, size in bytes).
+    Redis keys are scanned up to `sample` keys. Values unknown to the
+    backend are None.
+    """
+    cache = caches[alias]
+    if isinstance(cache, LocMemCache):
+        sizes = _locmem_sizes(cache)
+    elif isinstance(cache, FileBasedCache):
+        sizes = _file_sizes(cache)
+    elif isinstance(cache, RedisCache):
+        sizes = _redis_sizes(cache, sample)
+    else:
+        sizes = None
+    hits, misses = get_lookup_totals(alias)
+    lookups = hits + misses
+    stats = {
+        "backend": _BACKEND_NAMES.get(type(cache), type(cache).__name__),
+        "entries": None,
+        "memory_bytes": None,
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / lookups if lookups else None,
+        "top_keys": [],
+    }
+    if sizes is not None:
+        stats.update(_summarize(sizes, top))
+    return stats
+
+
+def _summarize(sizes, top):
+    """Build stats of the alias from sizes of its entries."""
+    known_sizes = [size for _, size in sizes if size is not None]
+    memory_bytes = None
+    if len(known_sizes) == len(sizes):
+        memory_bytes = sum(known_sizes)
+    return {
+        "entries": len(sizes),
+        "memory_bytes": memory_bytes,
+        "top_keys": sorted(
+            sizes,
+            key=lambda entry: entry[1] or 0,
+            reverse=True,
+        )[:top],
+    }
+
+
+def _locmem_sizes(cache):
+    """Return keys and sizes of pickled values in local memory cache."""
+    with cache._lock:  # noqa: WPS437
+        return [
+            (key, len(pickled))
+            for key, pickled in cache._cache.items()  # noqa: WPS437
+        ]
+
+
+def _file_sizes(cache):
+    """Return names and sizes of cache files."""
+    sizes = []
+    for file_name in cache._list_cache_files():  # noqa: WPS437
+        # Files are removed by other processes culling the cache
+        with suppress(FileNotFoundError):
+            sizes.append((Path(file_name).name, os.path.getsize(file_name)))
+    return sizes
+
+
+def _redis_sizes(cache, sample):
+    """Return up to `sample` Redis keys of the alias and their sizes."""
+    client = cache._cache.get_client()  # noqa: WPS437
+    keys = list(
+        itertools.islice(
+            client.scan_iter(match=f"{cache.key_prefix}:*", count=sample),
+            sample,
+        ),
+    )
+    pipeline = client.pipeline(transaction=False)
+    for scanned_key in keys:
+        pipeline.strlen(scanned_key)
+    # Values are pickled strings, except integers which are stored as is
+    sizes = pipeline.execute(raise_on_error=False)
+    return [
+        (key.decode(), size if isinstance(size, int) else None)
+        for key, size in zip(keys, sizes)
+    ]
@@ -0,0 +1,153 @@
+"""
+Bulk import of tasks from CSV or NDJSON files.
+
+Files are read row by row and processed in batches, validated by
+TaskRowValidator. Every batch is written in its own transaction along
+with a checkpoint of the number of processed rows, so a failed import
+is resumed after the last committed batch.
+"""
+import csv
+import itertools
+import json
+import os
+from collections import Counter
+from functools import partial
+
+from django.db import transaction
+from override_autonow import override_autonow
+
+from task_manager.cache import forget_user_tasks
+from task_manager.models import (
+    CounterDimension,
+    ImportCheckpoint,
+    Task,
+    TaskCounter,
+)
+from task_manager.utils.row_validation import validate_batch
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def detect_format(path):
+    """Return import format by file extension."""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension == "jsonl":
+        return "ndjson"
+    return extension
+
+
+def read_rows(source, import_format):
+    """Yield rows of the file object as dicts."""
+    if import_format == "csv":
+        yield from csv.DictReader(source)
+        return
+    for line in source:
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError(f"Expected JSON object, got: {line.strip()}")
+        yield row
+
+
+def insert_tasks(tasks_with_labels):
+    """Insert tasks and their labels, count them in one transaction."""
+    tasks = [task for task, _ in tasks_with_labels]
+    deltas = Counter()
+    for counted_task, counted_label_ids in tasks_with_labels:
+        deltas.update(counted_task.get_counter_keys())
+        deltas.update(
+            (CounterDimension.LABEL, label_id)
+            for label_id in counted_label_ids
+        )
+    with transaction.atomic():
+        with override_autonow():
+            Task.objects.bulk_create(tasks)
+        Task.label.through.objects.bulk_create(
+            [
+                Task.label.through(task_id=task.pk, label_id=label_id)
+                for task, label_ids in tasks_with_labels
+                for label_id in label_ids
+            ],
+        )
+        TaskCounter.objects.adjust(deltas)
+        for field_name in ("creator", "performer"):
+            user_pks = {getattr(task, f"{field_name}_id") for task in tasks}
+            transaction.on_commit(
+                partial(forget_user_tasks, field_name, user_pks),
+            )
+
+
+class Checkpoint:
+    """Progress of an import saved with every written batch."""
+
+    def __init__(self, source):
+        """Set up checkpoint of the import source."""
+        self.source = source
+        self.rows_done = 0
+        self.imported = 0
+        self.rejected = 0
+
+    def exists(self):
+        """Check if checkpoint of unfinished import exists."""
+        return ImportCheckpoint.objects.filter(source=self.source).exists()
+
+    def load(self):
+        """Load progress from the saved checkpoint."""
+        saved = ImportCheckpoint.objects.get(source=self.source)
+        self.rows_done = saved.rows_done
+        self.imported = saved.imported
+        self.rejected = saved.rejected
+
+    def advance(self, rows, imported, rejected):
+        """
+        Save progress of a batch.
+
+        Must be called in the transaction writing the batch.
+        """
+        self.rows_done += rows
+        self.imported += imported
+        self.rejected += rejected
+        ImportCheckpoint.objects.update_or_create(
+            source=self.source,
+            defaults={
+                "rows_done": self.rows_done,
+                "imported": self.imported,
+                "rejected": self.rejected,
+            },
+        )
+
+    def remove(self):
+        """Remove checkpoint of a finished import."""
+        ImportCheckpoint.objects.filter(source=self.source).delete()
+
+
+def iter_batches(rows, batch_size):
+    """Yield lists of rows of the batch size."""
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_batches(rows, validator, checkpoint, batch_size):
+    """
+    Validate and write rows batch by batch, saving the checkpoint.
+
+    Rows written before the checkpoint are skipped. Rejected rows of
+    every written batch are yielded.
+    """
+    rows = itertools.islice(rows, checkpoint.rows_done, None)
+    for batch in iter_batches(rows, batch_size):
+        valid, rejected = validate_batch(
+            validator,
+            batch,
+            first_row=checkpoint.rows_done + 1,
+        )
+        with transaction.atomic():
+            if valid:
+                insert_tasks(valid)
+            checkpoint.advance(len(batch), len(valid), len(rejected))
+        yield rejected
@@ -0,0 +1,192 @@
+"""
+Validation of imported task rows.
+
+Status, user and label names of a batch of rows are resolved to ids
+with one query per model, and resolved names are cached for the
+following batches. Rows are validated by the fields of TaskEditForm,
+so imported tasks follow the same rules as tasks created on the site.
+"""
+import csv
+
+from django import forms
+from django.utils import dateparse, timezone
+
+from task_manager.forms import TaskEditForm
+from task_manager.models import Label, SiteUser, Status, Task
+
+
+def split_label_names(labels):
+    """
+    Return label names of a row, given as list or CSV cell.
+
+    Names in CSV cells are separated by commas, names containing commas
+    are quoted as CSV fields.
+    """
+    if isinstance(labels, str):
+        labels = next(csv.reader([labels], skipinitialspace=True), [])
+    return [label.strip() for label in labels if label.strip()]
+
+
+def parse_created_on(row, errors):
+    """Return creation time from the row, current time if missing."""
+    created_on = row.get("created_on")
+    if not created_on:
+        return timezone.now()
+    try:
+        parsed = dateparse.parse_datetime(created_on)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        errors["created_on"] = [
+            str(forms.DateTimeField.default_error_messages["invalid"]),
+        ]
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class NameLookup:
+    """Cache of object ids by unique name."""
+
+    def __init__(self, model, field):
+        """Set up empty cache of the model field."""
+        self.model = model
+        self.field = field
+        self.ids = {}
+
+    def resolve(self, names):
+        """Query and cache ids of names not resolved before."""
+        missing = set(filter(None, names)) - self.ids.keys()
+        if not missing:
+            return
+        found = self.model.objects.filter(
+            **{f"{self.field}__in": missing},
+        ).values_list(self.field, "pk")
+        self.ids.update(found)
+        # Names which were not found are cached too
+        not_found = missing - self.ids.keys()
+        self.ids.update((name, None) for name in not_found)
+
+    def get(self, name):
+        """Return cached id of the name or None."""
+        return self.ids.get(name)
+
+
+class TaskRowValidator:
+    """Validate import rows by the rules of TaskEditForm fields."""
+
+    form_class = TaskEditForm
+
+    def __init__(self, default_creator_id=None):
+        """Set up lookups of related objects."""
+        self.fields = self.form_class.base_fields
+        self.statuses = NameLookup(Status, "name")
+        self.users = NameLookup(SiteUser, "username")
+        self.labels = NameLookup(Label, "name")
+        self.default_creator_id = default_creator_id
+
+    def prepare(self, rows):
+        """Resolve names referenced by a batch of rows."""
+        self.statuses.resolve(row.get("status") for row in rows)
+        self.users.resolve(
+            username
+            for row in rows
+            for username in (row.get("performer"), row.get("creator"))
+        )
+        self.labels.resolve(
+            label
+            for row in rows
+            for label in split_label_names(row.get("labels"))
+        )
+
+    def validate(self, row):
+        """
+        Return Task and ids of its labels built from the row.
+
+        Raise ValidationError with errors of every invalid field.
+        """
+        errors = {}
+        task_fields = {}
+        for name in ("name", "description"):
+            try:
+                task_fields[name] = self.fields[name].clean(row.get(name))
+            except forms.ValidationError as error:
+                errors[name] = error.messages
+        task_fields["status_id"] = self.resolve_choice(
+            "status",
+            self.statuses,
+            row,
+            errors,
+        )
+        task_fields["performer_id"] = self.resolve_choice(
+            "performer",
+            self.users,
+            row,
+            errors,
+        )
+        label_ids = self.resolve_labels(row, errors)
+        task_fields["creator_id"] = self.resolve_creator(row, errors)
+        task_fields["created_on"] = parse_created_on(row, errors)
+        if errors:
+            raise forms.ValidationError(errors)
+        return Task(**task_fields), label_ids
+
+    def resolve_choice(self, name, lookup, row, errors):
+        """Return id of the object named in the row."""
+        field = self.fields[name]
+        chosen_name = row.get(name)
+        if not chosen_name:
+            if field.required:
+                errors[name] = [str(field.error_messages["required"])]
+            return None
+        object_id = lookup.get(chosen_name)
+        if object_id is None:
+            errors[name] = [str(field.error_messages["invalid_choice"])]
+        return object_id
+
+    def resolve_labels(self, row, errors):
+        """Return ids of labels named in the row."""
+        field = self.fields["label"]
+        label_ids = []
+        for label_name in split_label_names(row.get("labels")):
+            label_id = self.labels.get(label_name)
+            if label_id is None:
+                errors["label"] = [
+                    str(field.error_messages["invalid_choice"])
+                    % {"value": label_name},
+                ]
+                return []
+            label_ids.append(label_id)
+        if not label_ids and field.required:
+            errors["label"] = [str(field.error_messages["required"])]
+        return label_ids
+
+    def resolve_creator(self, row, errors):
+        """Return id of creator named in the row or the default creator."""
+        # Creators are checked by the rules of the performer choice
+        error_messages = self.fields["performer"].error_messages
+        username = row.get("creator")
+        if not username:
+            if self.default_creator_id is None:
+                errors["creator"] = [str(error_messages["required"])]
+            return self.default_creator_id
+        creator_id = self.users.get(username)
+        if creator_id is None:
+            errors["creator"] = [str(error_messages["invalid_choice"])]
+        return creator_id
+
+
+def validate_batch(validator, batch, first_row):
+    """Return valid tasks with their labels and rejected rows."""
+    validator.prepare(batch)
+    valid = []
+    rejected = []
+    for index, row in enumerate(batch, start=first_row):
+        try:
+            valid.append(validator.validate(row))
+        except forms.ValidationError as error:
+            rejected.append(
+                {"row": index, "errors": error.message_dict, "data": row},
+            )
+    return valid, rejected
@@ -0,0 +1,311 @@
+"""
+High-throughput generation of dummy content for load testing.
+
+Users, statuses and labels are created first as fixed size pools.
+Tasks referencing random pool members are then written in batches:
+with `bulk_create` on any database, or with `COPY` on PostgreSQL.
+Large amounts of tasks can be split between several worker processes.
+"""
+import csv
+import io
+import itertools
+import multiprocessing
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection, connections, transaction
+from faker import Faker
+from override_autonow import override_autonow
+
+from task_manager import cache
+from task_manager.models import Label, SiteUser, Status, Task, TaskCounter
+
+# Number of distinct task names/descriptions generated by Faker.
+# Tasks pick random texts from these pools, as generating unique text
+# for every task would take longer than writing it to the database.
+TEXT_POOL_SIZE = 1000
+MAX_TASK_AGE_DAYS = 365
+# Number of tasks inserted per batch by default
+TASK_BATCH_SIZE = 5000
+MAX_TASK_AGE = timedelta(days=MAX_TASK_AGE_DAYS)
+# Lengths of generated texts, fitting into the model fields
+POOL_NAME_LENGTH = 20
+PERSON_NAME_LENGTH = 30
+TASK_NAME_LENGTH = 30
+# Namespaces of cached choices of pool objects
+POOL_NAMESPACES = (
+    cache.USERS_NAMESPACE,
+    cache.STATUSES_NAMESPACE,
+    cache.LABELS_NAMESPACE,
+)
+# Task fields in order of the values of generated rows
+TASK_FIELDS = (
+    "name",
+    "description",
+    "creator_id",
+    "performer_id",
+    "status_id",
+    "created_on",
+)
+# Model of links of tasks to their labels
+TaskLabel = Task.label.through
+# Columns of task and task label rows written with COPY
+TASK_COPY_COLUMNS = ("id", *TASK_FIELDS)
+LABEL_COPY_COLUMNS = ("task_id", "label_id")
+
+
+class SeedPools:
+    """Primary keys of users, statuses and labels referenced by tasks."""
+
+    def __init__(self, user_ids, status_ids, label_ids):
+        """Store primary keys of pool objects."""
+        self.user_ids = user_ids
+        self.status_ids = status_ids
+        self.label_ids = label_ids
+
+
+def random_past_datetime(rng, now):
+    """Return random datetime within MAX_TASK_AGE before now."""
+    age = rng.uniform(0, MAX_TASK_AGE.total_seconds())
+    return now - timedelta(seconds=age)
+
+
+def pool_name(name, suffix, index, separator=" "):
+    """Return name of a pool object, unique to the seeding run."""
+    short_name = name[:POOL_NAME_LENGTH]
+    return f"{short_name}{separator}{suffix}{index}"
+
+
+def pool_ids(model, pool, field):
+    """Return primary keys of bulk created pool objects by unique field."""
+    names = [getattr(pool_object, field) for pool_object in pool]
+    created = model.objects.filter(**{f"{field}__in": names})
+    return list(created.values_list("pk", flat=True))
+
+
+def create_pools(num_users, num_statuses, num_labels, batch_size=1000):
+    """Create pools of users, statuses and labels with bulk inserts."""
+    fake = Faker()
+    rng = random.Random()
+    now = datetime.now(timezone.utc)
+    # Pool objects get random suffix so that repeated runs don't clash
+    # with objects created before
+    suffix = fake.pystr(min_chars=4, max_chars=4).lower()
+    users = [
+        SiteUser(
+            username=pool_name(fake.user_name(), suffix, index, "_"),
+            first_name=fake.first_name()[:PERSON_NAME_LENGTH],
+            last_name=fake.last_name()[:PERSON_NAME_LENGTH],
+            signup_date=random_past_datetime(rng, now),
+        )
+        for index in range(num_users)
+    ]
+    for user in users:
+        user.set_unusable_password()
+    statuses = [
+        Status(
+            name=pool_name(fake.word(), suffix, index),
+            created_on=random_past_datetime(rng, now),
+        )
+        for index in range(num_statuses)
+    ]
+    labels = [
+        Label(
+            name=pool_name(fake.word(), suffix, index),
+            created_on=random_past_datetime(rng, now),
+        )
+        for index in range(num_labels)
+    ]
+    with override_autonow():
+        SiteUser.objects.bulk_create(users, batch_size=batch_size)
+        Status.objects.bulk_create(statuses, batch_size=batch_size)
+        Label.objects.bulk_create(labels, batch_size=batch_size)
+    # Bulk inserts don't send signals invalidating cached choices
+    for namespace in POOL_NAMESPACES:
+        cache.bump_namespace_version(namespace)
+    return SeedPools(
+        user_ids=pool_ids(SiteUser, users, "username"),
+        status_ids=pool_ids(Status, statuses, "name"),
+        label_ids=pool_ids(Label, labels, "name"),
+    )
+
+
+def generate_task_rows(num_tasks, pools, seed=None):
+    """
+    Yield rows of random tasks.
+
+    Each row is a tuple of task field values in order of TASK_FIELDS
+    followed by the list of task label ids.
+    """
+    rng = random.Random(seed)
+    fake = Faker()
+    if seed is not None:
+        fake.seed_instance(seed)
+    names = [
+        fake.text(max_nb_chars=TASK_NAME_LENGTH)
+        for _ in range(TEXT_POOL_SIZE)
+    ]
+    descriptions = [
+        fake.text(max_nb_chars=1000) for _ in range(TEXT_POOL_SIZE)
+    ]
+    max_labels = min(3, len(pools.label_ids))
+    now = datetime.now(timezone.utc)
+    yield from (
+        (
+            (
+                rng.choice(names),
+                rng.choice(descriptions),
+                rng.choice(pools.user_ids),
+                rng.choice(pools.user_ids),
+                rng.choice(pools.status_ids),
+                random_past_datetime(rng, now),
+            ),
+            rng.sample(pools.label_ids, rng.randint(1, max_labels)),
+        )
+        for _ in range(num_tasks)
+    )
+
+
+def insert_tasks_bulk(rows):
+    """Insert a batch of tasks and their labels with bulk_create."""
+    rows = list(rows)
+    tasks = [
+        Task(**dict(zip(TASK_FIELDS, task_values)))
+        for task_values, _ in rows
+    ]
+    with transaction.atomic():
+        with override_autonow():
+            Task.objects.bulk_create(tasks)
+        TaskLabel.objects.bulk_create(
+            [
+                TaskLabel(task_id=task.pk, label_id=label_id)
+                for task, (_, label_ids) in zip(tasks, rows)
+                for label_id in label_ids
+            ],
+        )
+    return len(tasks)
+
+
+def get_db_table(model):
+    """Return name of the model table."""
+    return model._meta.db_table  # noqa: WPS437
+
+
+def copy_csv_rows(cursor, model, columns, csv_rows):
+    """Write rows to the model table with PostgreSQL COPY."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(csv_rows)
+    buffer.seek(0)
+    # Cursor wrapper is unwrapped to reach psycopg2 copy_expert()
+    cursor.cursor.copy_expert(
+        "COPY {0} ({1}) FROM STDIN WITH (FORMAT csv)".format(
+            get_db_table(model),
+            ", ".join(columns),
+        ),
+        buffer,
+    )
+
+
+def insert_tasks_copy(rows):
+    """
+    Insert a batch of tasks and their labels with PostgreSQL COPY.
+
+    COPY does not return generated primary keys, so task ids are reserved
+    from the table sequence beforehand and written explicitly.
+    """
+    rows = list(rows)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+                "FROM generate_series(1, %s)",
+                [get_db_table(Task), len(rows)],
+            )
+            task_ids = [row[0] for row in cursor.fetchall()]
+            task_rows = (
+                (task_id, *task_values)
+                for task_id, (task_values, _) in zip(task_ids, rows)
+            )
+            label_rows = (
+                (task_id, label_id)
+                for task_id, (_, label_ids) in zip(task_ids, rows)
+                for label_id in label_ids
+            )
+            copy_csv_rows(cursor, Task, TASK_COPY_COLUMNS, task_rows)
+            copy_csv_rows(cursor, TaskLabel, LABEL_COPY_COLUMNS, label_rows)
+    return len(rows)
+
+
+class TaskSeeder:
+    """Writer of random tasks referencing pool objects, in batches."""
+
+    def __init__(
+        self,
+        pools,
+        batch_size=TASK_BATCH_SIZE,
+        use_copy=False,
+        seed=None,
+    ):
+        """Set up writing tasks with bulk_create, or with COPY if asked."""
+        self.pools = pools
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.seed = seed
+
+    def seed_tasks(self, num_tasks, workers=1):
+        """
+        Create tasks, return (tasks, elapsed seconds).
+
+        When workers > 1, tasks are split between worker processes each
+        inserting its own share. SQLite allows only one writer at a time,
+        so tasks are always inserted by a single process there.
+        Task counters are recomputed in bulk afterwards, which is not
+        included in elapsed time.
+        """
+        started_at = time.perf_counter()
+        if workers <= 1 or connection.vendor == "sqlite":
+            created = self.seed_chunk(num_tasks)
+        else:
+            created = self.seed_in_workers(num_tasks, workers)
+        elapsed = time.perf_counter() - started_at
+        TaskCounter.objects.reconcile()
+        return created, elapsed
+
+    def seed_chunk(self, num_tasks, chunk_index=0):
+        """Generate and insert tasks in batches, return number of tasks."""
+        insert_batch = insert_tasks_bulk
+        if self.use_copy:
+            insert_batch = insert_tasks_copy
+        seed = None
+        if self.seed is not None:
+            # Every chunk of tasks gets its own random sequence
+            seed = self.seed + chunk_index
+        rows = generate_task_rows(num_tasks, self.pools, seed=seed)
+        inserted = 0
+        while inserted < num_tasks:
+            batch_size = min(self.batch_size, num_tasks - inserted)
+            inserted += insert_batch(itertools.islice(rows, batch_size))
+        return inserted
+
+    def seed_in_workers(self, num_tasks, workers):
+        """Insert tasks split between worker processes."""
+        chunk_sizes = [num_tasks // workers for _ in range(workers)]
+        chunk_sizes[-1] += num_tasks % workers
+        # Connections must not be shared with forked worker processes
+        connections.close_all()
+        # Workers are forked to inherit configured Django
+        context = multiprocessing.get_context("fork")
+        with context.Pool(workers) as pool:
+            created = pool.starmap(
+                self._seed_in_worker,
+                [(size, index) for index, size in enumerate(chunk_sizes)],
+            )
+        return sum(created)
+
+    def _seed_in_worker(self, num_tasks, chunk_index):
+        """Insert tasks in a worker process using its own DB connection."""
+        created = self.seed_chunk(num_tasks, chunk_index)
+        # Workers are terminated once every chunk is done
+        connections.close_all()
+        return created
@@ -0,0 +1,150 @@
+"""
+Load runs of the views served by WSGI and ASGI handlers.
+
+Requests are passed to Django handlers directly, as by an application
+server, so that sync and async serving are compared on the same views
+without network overhead.
+"""
+import asyncio
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from http import HTTPStatus
+
+from django.core.handlers import asgi, wsgi
+
+from task_manager.utils.benchmark import latency_percentiles
+
+
+def wsgi_environ(url, cookie):
+    """Return WSGI environment of GET request to url."""
+    path, _, query = url.partition("?")
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_COOKIE": cookie,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+
+def serve_wsgi(wsgi_handler, url, cookie):
+    """Serve GET request with WSGI handler, return response status."""
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):  # noqa: WPS430
+        statuses.append(int(status.split()[0]))
+
+    response = wsgi_handler(wsgi_environ(url, cookie), start_response)
+    with closing(response):
+        b"".join(response)
+    return statuses[0]
+
+
+async def serve_asgi(asgi_handler, url, cookie):
+    """Serve GET request with ASGI handler, return response status."""
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    request_sent = asyncio.Event()
+    statuses = []
+
+    async def receive():  # noqa: WPS430
+        if request_sent.is_set():
+            # Client stays connected until the response is sent
+            await asyncio.Future()
+        request_sent.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):  # noqa: WPS430
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await asgi_handler(scope, receive, send)
+    return statuses[0]
+
+
+def summarize_load(responses, elapsed):
+    """Return throughput, latency percentiles and errors of a load run."""
+    timings = [timing for timing, _ in responses]
+    return {
+        "requests": len(responses),
+        "errors": sum(1 for _, status in responses if status != HTTPStatus.OK),
+        "throughput_rps": round(len(responses) / elapsed, 1),
+        **latency_percentiles(timings),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def run_wsgi_load(url, num_requests, concurrency, workers, cookie):
+    """
+    Serve requests to url by a WSGI deployment with `workers` workers.
+
+    `concurrency` clients send requests one after another. A client
+    waits while all workers are busy, as with sync gunicorn workers,
+    and the wait counts in the latency of the request.
+    """
+    wsgi_handler = wsgi.WSGIHandler()
+    worker_slots = threading.BoundedSemaphore(workers)
+
+    def serve(request_url):  # noqa: WPS430
+        started_at = time.perf_counter()
+        with worker_slots:
+            status = serve_wsgi(wsgi_handler, request_url, cookie)
+        return (time.perf_counter() - started_at) * 1000, status
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as clients:
+        responses = list(
+            clients.map(serve, (url for _ in range(num_requests))),
+        )
+    return summarize_load(responses, time.perf_counter() - started_at)
+
+
+def run_asgi_load(url, num_requests, concurrency, cookie):
+    """
+    Serve requests to url by a single ASGI worker (event loop).
+
+    `concurrency` clients send requests one after another.
+    """
+    asgi_handler = asgi.ASGIHandler()
+
+    async def serve(request_url, clients):  # noqa: WPS430
+        async with clients:
+            started_at = time.perf_counter()
+            status = await serve_asgi(asgi_handler, request_url, cookie)
+            return (time.perf_counter() - started_at) * 1000, status
+
+    async def serve_all():  # noqa: WPS430
+        clients = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *(serve(url, clients) for _ in range(num_requests)),
+        )
+
+    started_at = time.perf_counter()
+    responses = asyncio.run(serve_all())
+    return summarize_load(responses, time.perf_counter() - started_at)
@@ -0,0 +1,120 @@
+"""
+Compilation and warm-up of templates of task manager.
+
+Templates are compiled by the cached template loader on first use,
+so without warm-up the first request to every page of a fresh worker
+pays for parsing the page, `base.html`, `bootstrap.html` and templates
+of bootstrap4 and crispy forms with their tag libraries. Templates
+of form widgets are compiled by the separate engine of form renderer
+and are not warmed up.
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.apps import apps
+from django.template import Engine, TemplateDoesNotExist
+from django.template.base import Template
+from django.template.loaders.cached import Loader as CachedLoader
+
+TEMPLATE_SUFFIXES = frozenset((".html", ".txt"))
+# Applications whose templates are rendered on every page or form
+WARMUP_TEMPLATE_APPS = ("bootstrap4", "crispy_bootstrap5")
+
+
+def template_dirs():
+    """Return project template dirs and template dirs of warmed up apps."""
+    dirs = [Path(template_dir) for template_dir in Engine.get_default().dirs]
+    for app_label in WARMUP_TEMPLATE_APPS:
+        if apps.is_installed(app_label):
+            app_config = apps.get_app_config(app_label)
+            dirs.append(Path(app_config.path) / "templates")
+    return dirs
+
+
+def warmup_template_names():
+    """Return names of templates compiled at worker boot."""
+    names = set()
+    for template_dir in template_dirs():
+        for path in template_dir.rglob("*"):
+            if path.suffix in TEMPLATE_SUFFIXES and path.is_file():
+                names.add(path.relative_to(template_dir).as_posix())
+    return sorted(names)
+
+
+def uncached_loaders():
+    """Return template loaders of the engine unwrapped from cached loaders."""
+    loaders = []
+    for loader in Engine.get_default().template_loaders:
+        if isinstance(loader, CachedLoader):
+            loaders.extend(loader.loaders)
+        else:
+            loaders.append(loader)
+    return loaders
+
+
+def compile_template(name):
+    """
+    Compile template bypassing cached loaders.
+
+    Return compile time in milliseconds, reading of the template source
+    included.
+    """
+    started_at = time.perf_counter()
+    for loader in uncached_loaders():
+        try:
+            loader.get_template(name)
+        except TemplateDoesNotExist:
+            continue
+        return (time.perf_counter() - started_at) * 1000
+    raise TemplateDoesNotExist(name)
+
+
+def warm_templates():
+    """
+    Compile templates into cache of the cached template loader.
+
+    Return number of compiled templates and time spent in milliseconds.
+    """
+    engine = Engine.get_default()
+    names = warmup_template_names()
+    started_at = time.perf_counter()
+    for name in names:
+        engine.get_template(name)
+    return len(names), (time.perf_counter() - started_at) * 1000
+
+
+def reset_template_cache():
+    """Drop compiled templates from caches of cached loaders."""
+    for loader in Engine.get_default().template_loaders:
+        if isinstance(loader, CachedLoader):
+            loader.reset()
+
+
+@contextmanager
+def timed_template_renders():
+    """
+    Collect render times of templates inside the block.
+
+    Yield mapping of template names to lists of render times
+    in milliseconds. Times are inclusive, i.e. render time of a page
+    contains render times of templates it extends and includes.
+    """
+    timings = defaultdict(list)
+    original_render = Template._render  # noqa: WPS437
+
+    def timed_render(template, context):  # noqa: WPS430
+        started_at = time.perf_counter()
+        rendered = original_render(template, context)
+        if template.name:
+            timings[template.name].append(
+                (time.perf_counter() - started_at) * 1000,
+            )
+        return rendered
+
+    Template._render = timed_render  # noqa: WPS437
+    try:
+        yield timings
+    finally:
+        Template._render = original_render  # noqa: WPS437
@@ -1 +1,12 @@
-from . import auth, labels, pages, statuses, tasks, users
+from . import (
+    auth,
+    autocomplete,
+    labels,
+    pages,
+    statuses,
+    task_bulk,
+    task_export,
+    tasks,
+    user_tasks,
+    users,
+)
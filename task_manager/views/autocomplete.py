@@ -0,0 +1,83 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import connection, models
+from django.db.models.functions import Upper
+from django.http import JsonResponse
+from django.views import generic
+
+from task_manager.db.functions import UnicodeUpper
+from task_manager.models import Label, SiteUser
+
+AUTOCOMPLETE_LIMIT = 20
+# Greatest code point, upper bound of strings starting with a prefix
+MAX_CHARACTER = "\U0010ffff"
+
+
+def prefix_search(queryset, fields, prefix):
+    """
+    Filter queryset by case-insensitive prefix of any of the fields.
+
+    Fields are compared upper-cased, matching functional indexes
+    on UPPER() of the fields. PostgreSQL uses the indexes for LIKE
+    prefix patterns. SQLite doesn't use indexes for LIKE, so an equivalent
+    range condition is added there. SQLite UPPER() folds ASCII letters
+    only, so other prefixes are compared with fields upper-cased
+    by Python, without indexes.
+    """
+    is_sqlite = connection.vendor == "sqlite"
+    use_indexes = not is_sqlite or prefix.isascii()
+    upper = Upper if use_indexes else UnicodeUpper
+    prefix = prefix.upper()
+    annotations = {f"{field}_upper": upper(field) for field in fields}
+    condition = models.Q()
+    for annotation in annotations:
+        lookup = models.Q(**{f"{annotation}__startswith": prefix})
+        if is_sqlite and use_indexes:
+            lookup &= models.Q(
+                **{
+                    f"{annotation}__gte": prefix,
+                    f"{annotation}__lt": f"{prefix}{MAX_CHARACTER}",
+                },
+            )
+        condition |= lookup
+    return queryset.annotate(**annotations).filter(condition)
+
+
+class AutocompleteView(LoginRequiredMixin, generic.View):
+    """
+    JSON list of objects whose search fields start with `q` parameter.
+
+    Responds with {"results": [{"id": pk, "text": label}, ...]} of
+    at most `limit` objects ordered by the first search field.
+    """
+
+    model = None
+    search_fields = ()
+    limit = AUTOCOMPLETE_LIMIT
+    raise_exception = True
+
+    def get(self, request, *args, **kwargs):
+        """Return objects matching the search prefix."""
+        prefix = request.GET.get("q", "").strip()
+        queryset = self.model.objects.only("pk", *self.search_fields)
+        if prefix:
+            queryset = prefix_search(queryset, self.search_fields, prefix)
+        ordering = f"{self.search_fields[0]}_upper" if prefix else "pk"
+        matches = [
+            {"id": match.pk, "text": str(match)}
+            for match in queryset.order_by(ordering)[: self.limit]
+        ]
+        return JsonResponse({"results": matches})
+
+
+class UserAutocompleteView(AutocompleteView):
+    """Autocomplete of users by username, first or last name."""
+
+    model = SiteUser
+    search_fields = ("username", "first_name", "last_name")
+
+
+class LabelAutocompleteView(AutocompleteView):
+    """Autocomplete of labels by name."""
+
+    model = Label
+    search_fields = ("name",)
@@ -1,24 +1,35 @@
-from django.contrib import messages
-from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views import generic
 
-from task_manager.models import Label
-from task_manager.views.mixins import CustomLoginRequiredMixin
+from task_manager.models import CounterDimension, Label
+from task_manager.views.mixins import (
+    AsyncListViewMixin,
+    CustomLoginRequiredMixin,
+    DeletionGuardMixin,
+    ListPaginationMixin,
+    TaskCountsMixin,
+)
 
 
-class LabelListView(CustomLoginRequiredMixin, generic.ListView):
+class LabelListView(
+    AsyncListViewMixin,
+    CustomLoginRequiredMixin,
+    ListPaginationMixin,
+    TaskCountsMixin,
+    generic.ListView,
+):
     """Labels list page view."""
 
     template_name = "task_manager/label_list.html"
     context_object_name = "label_list"
+    task_counter_dimension = CounterDimension.LABEL
+    ordering = ("-created_on", "-id")
 
     def get_queryset(self):
         """Return the list of all labels."""
-        return Label.objects.order_by("-created_on")
+        return Label.objects.order_by(*self.get_ordering())
 
 
 class LabelCreateView(
@@ -51,8 +62,7 @@ class LabelUpdateView(
 
 class LabelDeleteView(
     CustomLoginRequiredMixin,
-    UserPassesTestMixin,
-    SuccessMessageMixin,
+    DeletionGuardMixin,
     generic.DeleteView,
 ):
     """Label deletion page view."""
@@ -61,23 +71,7 @@ class LabelDeleteView(
     model = Label
     success_url = reverse_lazy("labels")
     success_message = _("Label deleted successfully")
-
-    def test_func(self):
-        """Check if target label is associated with tasks."""
-        return not self.get_object().tasks.all()
-
-    def handle_no_permission(self):
-        """
-        Handle case when user has no permissions to delete the label.
-
-        If user is not authenticated: redirect to login and show error message.
-        If user is authenticated: show error message when deleting label
-        associated with a task.
-        """
-        if not self.request.user.is_authenticated:
-            return CustomLoginRequiredMixin.handle_no_permission(self)
-        messages.error(
-            self.request,
-            _("Can not delete the label associated with a task"),
-        )
-        return redirect(reverse_lazy("labels"))
+    protected_error_message = _(
+        "Can not delete the label associated with a task",
+    )
+    protecting_task_fields = ("label",)
@@ -1,8 +1,41 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models.deletion import ProtectedError
+from django.core.paginator import InvalidPage, Paginator
+from django.db import models
+from django.http import Http404, HttpResponseRedirect
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.models import Task, TaskCounter
+from task_manager.pagination import (
+    InvalidCursorError,
+    KeysetPaginator,
+    UncountedPaginator,
+)
+
+PAGE_NUMBER_MODE = "page"
+CURSOR_MODE = "cursor"
+# Message of DetailView for missing objects, gettext style placeholder
+NOT_FOUND_MESSAGE = _(
+    "No %(verbose_name)s found matching the query",  # noqa: WPS323
+)
+
+
+def replace_query_param(request, name, param_value):
+    """Return query string of the request with the parameter replaced."""
+    query = request.GET.copy()
+    query[name] = param_value
+    return query.urlencode()
+
+
+def load_user(request):
+    """Load the user of the request from the session."""
+    return request.user.is_authenticated
+
 
 class CustomLoginRequiredMixin(LoginRequiredMixin):
     """LoginRequiredMixin showing error message when not logged in."""
@@ -16,37 +49,362 @@ class CustomLoginRequiredMixin(LoginRequiredMixin):
         return super().handle_no_permission()
 
 
-class SuccessOrProtectedErrorMessageMixin:
+class CachedObjectMixin:
     """
-    Handle successful object deletion and ProtectedError for DeleteView.
+    Fetch the object of a detail view once per request.
 
-    If object can be deleted, show success message and redirect to success_url.
-    If object is protected, show protected_error_message and redirect.
-    to success_url.
+    Permission checks of UserPassesTestMixin run before the generic view
+    gets the object, so both are given the same instance. Relations
+    listed in `select_related_fields` are loaded in the same query.
     """
 
-    success_message = "Object has been successfully deleted"
-    protected_error_message = (
-        "Cannot delete object referenced by a ForeignKey."
-    )
-    success_url = None
+    select_related_fields = ()
+
+    def get_queryset(self):
+        """Return objects with relations needed by the view joined."""
+        queryset = super().get_queryset()
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        return queryset
+
+    def get_object(self, queryset=None):
+        """Return the object fetched earlier in this request, if any."""
+        if queryset is not None:
+            return super().get_object(queryset)
+        if "cached_object" not in self.__dict__:
+            self.cached_object = super().get_object()
+        return self.cached_object
 
-    def post(self, request, *args, **kwargs):
-        """
-        Handle deletion of the target object.
 
-        Delete the target object and show success message.
-        If object is protected, show error message and redirect.
-        """
+class AsyncViewMixin:
+    """
+    Serve GET requests of a read-only view as a coroutine.
+
+    The view is async when ASYNC_VIEWS setting is on at the time views
+    are imported, otherwise it stays synchronous, as under WSGI an async
+    view only adds the cost of an event loop per request. Async views fetch
+    their objects with async ORM, so under ASGI a slow query doesn't
+    hold a worker. Code without async API (loading the user from the
+    session, validation of filters, building the context) runs in a
+    thread. Put the mixin first, before the permission checks.
+
+    GET requests are handled by coroutine `async_get`, defined by the
+    mixins of list and detail views.
+    """
+
+    # Decided once for all views, replaces the check of handlers of View
+    view_is_async = settings.ASYNC_VIEWS
+
+    def dispatch(self, request, *args, **kwargs):
+        """Dispatch the request as a coroutine in async mode."""
+        if self.view_is_async:
+            return self.async_dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        """Load the user, then check permissions and handle the request."""
+        # Permission checks read the lazy request.user synchronously
+        await sync_to_async(load_user)(request)
+        # Dispatch of the view returns a coroutine of async handlers
+        response = super().dispatch(  # noqa: WPS613
+            request,
+            *args,
+            **kwargs,
+        )
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET request with async_get in async mode."""
+        if self.view_is_async:
+            return self.async_get(request, *args, **kwargs)
+        return super().get(request, *args, **kwargs)
+
+
+class AsyncListViewMixin(AsyncViewMixin):
+    """
+    Async mode of ListView fetching the page with `apaginate_queryset`.
+
+    The view is paginated by KeysetPaginationMixin or ListPaginationMixin.
+    """
+
+    async def async_get(self, request, *args, **kwargs):
+        """Fetch the page of objects with async ORM and render it."""
+        # Filters validate their values with database queries
+        self.object_list = await sync_to_async(self.get_queryset)()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.fetched_page = await self.apaginate_queryset(
+                self.object_list,
+                page_size,
+            )
+        context = await sync_to_async(self.get_context_data)()
+        return self.render_to_response(context)
+
+    def paginate_queryset(self, queryset, page_size):
+        """Return the page fetched asynchronously, if any."""
+        fetched_page = getattr(self, "fetched_page", None)
+        if fetched_page is not None:
+            return fetched_page
+        return super().paginate_queryset(queryset, page_size)
+
+
+class AsyncDetailViewMixin(AsyncViewMixin):
+    """Async mode of DetailView looking objects up by primary key."""
+
+    async def async_get(self, request, *args, **kwargs):
+        """Fetch the object with async ORM and render it."""
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        """Return the object by primary key from URL, fetched async."""
+        queryset = self.get_queryset()
         try:
-            messages.success(
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            verbose_name = queryset.model._meta.verbose_name  # noqa: WPS437
+            raise Http404(NOT_FOUND_MESSAGE % {"verbose_name": verbose_name})
+
+
+class TaskCountsMixin:
+    """
+    Set number of tasks on every listed object from task counters.
+
+    Numbers are read with one query for the page of objects and stored
+    in `task_count` attribute of the objects.
+    """
+
+    task_counter_dimension = None
+
+    def get_context_data(self, **kwargs):
+        """Set number of tasks on the listed objects."""
+        context = super().get_context_data(**kwargs)
+        listed = context["object_list"]
+        counts = TaskCounter.objects.counts(
+            self.task_counter_dimension,
+            [listed_object.pk for listed_object in listed],
+        )
+        # Evaluated queryset keeps the objects for the template
+        for listed_object in listed:
+            listed_object.task_count = counts.get(listed_object.pk, 0)
+        return context
+
+
+class DeletionGuardMixin:
+    """
+    Refuse deletion of objects used by tasks, for DeleteView.
+
+    Whether the object is used is checked once per request with a single
+    EXISTS query over the task fields listed in `protecting_task_fields`.
+    Confirmation page gets the answer as `in_use`, so it can tell the
+    user before the form is submitted. Deletion of a used object shows
+    protected_error_message and redirects to success_url.
+    """
+
+    protecting_task_fields = ()
+    success_message = ""
+    protected_error_message = ""
+
+    @cached_property
+    def in_use(self):
+        """Check if any task refers to the object."""
+        condition = models.Q()
+        for field in self.protecting_task_fields:
+            condition |= models.Q(**{field: self.object})
+        return Task.objects.filter(condition).exists()
+
+    def get_context_data(self, **kwargs):
+        """Tell the confirmation page if the object is used by tasks."""
+        context = super().get_context_data(**kwargs)
+        context["in_use"] = self.in_use
+        context["protected_error_message"] = self.protected_error_message
+        return context
+
+    def form_valid(self, form):
+        """Delete the object unless it is used by tasks."""
+        if self.in_use:
+            return self.refuse_deletion()
+        try:
+            self.object.delete()
+        except models.ProtectedError:
+            # A task started using the object after the check
+            return self.refuse_deletion()
+        messages.success(self.request, self.success_message)
+        return HttpResponseRedirect(self.get_success_url())
+
+    def refuse_deletion(self):
+        """Show protected error message and redirect."""
+        messages.error(self.request, self.protected_error_message)
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class KeysetPaginationMixin:
+    """
+    Cursor-based pagination for ListView.
+
+    Pages are fetched with KeysetPaginator by the values of `ordering`
+    fields, so the cost of a page does not depend on its depth.
+    Cursors of neighbouring pages are passed to the template as
+    `next_cursor`/`previous_cursor`, along with ready-made query strings
+    preserving the other GET parameters (i.e. filters).
+    """
+
+    paginate_by = 50
+    paginator_class = KeysetPaginator
+    cursor_kwarg = "cursor"
+    ordering = ("-created_on", "-id")
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Return keyset paginator ordered by view ordering fields."""
+        return self.paginator_class(
+            queryset,
+            per_page,
+            ordering=self.get_ordering(),
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """Return the page pointed to by the cursor from request."""
+        paginator = self.get_paginator(queryset, page_size)
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursorError:
+            raise Http404(_("Invalid page cursor"))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """Return the page pointed to by the cursor, fetched async."""
+        paginator = self.get_paginator(queryset, page_size)
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        try:
+            page = await paginator.apage(cursor)
+        except InvalidCursorError:
+            raise Http404(_("Invalid page cursor"))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        """Add cursors and query strings of neighbouring pages."""
+        context = super().get_context_data(**kwargs)
+        page = context.get("page_obj")
+        if page is not None:
+            context.update(self.get_page_links(page))
+        return context
+
+    def get_page_links(self, page):
+        """Return cursors and query strings of pages next to the page."""
+        return {
+            "next_cursor": page.next_cursor,
+            "previous_cursor": page.previous_cursor,
+            "next_page_query": self.get_page_query(page.next_cursor),
+            "previous_page_query": self.get_page_query(page.previous_cursor),
+        }
+
+    def get_page_query(self, cursor):
+        """Return current query string pointing to the cursor."""
+        if cursor is None:
+            return None
+        return replace_query_param(self.request, self.cursor_kwarg, cursor)
+
+
+class ListPaginationMixin(KeysetPaginationMixin):
+    """
+    Pagination for ListView in page-number or cursor mode.
+
+    Page-number mode shows pages by `page` parameter. Total count of
+    objects is queried only if `count_total` is set, otherwise pages
+    only know whether a next page exists. Cursor mode pages with
+    KeysetPaginator, keeping the cost of deep pages constant.
+    Mode, page size and counting default to LIST_PAGINATION_MODE,
+    LIST_PAGE_SIZE and LIST_PAGINATION_COUNT settings. Page size can be
+    changed with `page_size` parameter up to `max_paginate_by`.
+    """
+
+    paginate_by = None
+    pagination_mode = None
+    count_total = None
+    page_size_kwarg = "page_size"
+    max_paginate_by = None
+
+    def is_cursor_mode(self):
+        """Check if the view pages with cursors."""
+        mode = self.pagination_mode or settings.LIST_PAGINATION_MODE
+        return mode == CURSOR_MODE
+
+    def should_count_total(self):
+        """Check if total count of objects should be queried."""
+        if self.count_total is None:
+            return settings.LIST_PAGINATION_COUNT
+        return self.count_total
+
+    # Hook of MultipleObjectMixin
+    def get_paginate_by(self, queryset):  # noqa: WPS615
+        """Return page size from request, limited by maximum page size."""
+        default_size = self.paginate_by or settings.LIST_PAGE_SIZE
+        max_size = self.max_paginate_by or settings.LIST_MAX_PAGE_SIZE
+        try:
+            page_size = int(self.request.GET[self.page_size_kwarg])
+        except (KeyError, ValueError):
+            return default_size
+        return min(max(page_size, 1), max_size)
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Return paginator of the pagination mode."""
+        if self.is_cursor_mode():
+            return super().get_paginator(queryset, per_page, **kwargs)
+        paginator_class = UncountedPaginator
+        if self.should_count_total():
+            paginator_class = Paginator
+        return paginator_class(
+            queryset.order_by(*self.get_ordering()),
+            per_page,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """Return the page requested by page number or cursor."""
+        if self.is_cursor_mode():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.get_paginator(queryset, page_size)
+        page_number = self.request.GET.get(self.page_kwarg) or 1
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage:
+            raise Http404(_("Invalid page"))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """Return the page by page number or cursor, fetched async."""
+        if self.is_cursor_mode():
+            return await super().apaginate_queryset(queryset, page_size)
+        paginator = self.get_paginator(queryset, page_size)
+        page_number = self.request.GET.get(self.page_kwarg) or 1
+        # Counting paginator has no async API
+        fetch_page = getattr(paginator, "apage", None)
+        if fetch_page is None:
+            fetch_page = sync_to_async(paginator.page)
+        try:
+            page = await fetch_page(page_number)
+        except InvalidPage:
+            raise Http404(_("Invalid page"))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_page_links(self, page):
+        """Return query strings of pages next to the page."""
+        if self.is_cursor_mode():
+            return super().get_page_links(page)
+        links = {"next_page_query": None, "previous_page_query": None}
+        if page.has_next():
+            links["next_page_query"] = replace_query_param(
                 self.request,
-                self.success_message,
+                self.page_kwarg,
+                page.number + 1,
             )
-            return self.delete(request, *args, **kwargs)
-        except ProtectedError:
-            messages.error(
+        if page.has_previous():
+            links["previous_page_query"] = replace_query_param(
                 self.request,
-                self.protected_error_message,
+                self.page_kwarg,
+                page.number - 1,
             )
-            return self.success_url
+        return links
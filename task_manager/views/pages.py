@@ -1,7 +1,49 @@
 from django.views import generic
 
+from task_manager.models import (
+    TOTAL_COUNTER_ID,
+    CounterDimension,
+    SiteUser,
+    Status,
+    TaskCounter,
+)
+
 
 class IndexView(generic.TemplateView):
-    """Index page view."""
+    """Index page view, with task numbers for logged in users."""
 
     template_name = "task_manager/index.html"
+    # Number of statuses and performers with most tasks shown
+    top_size = 10
+
+    def get_context_data(self, **kwargs):
+        """Add task numbers from task counters."""
+        context = super().get_context_data(**kwargs)
+        if not self.request.user.is_authenticated:
+            return context
+        total = TaskCounter.objects.counts(CounterDimension.TOTAL)
+        context["total_tasks"] = total.get(TOTAL_COUNTER_ID, 0)
+        context["status_counts"] = self.get_top_counts(
+            Status,
+            CounterDimension.STATUS,
+        )
+        context["performer_counts"] = self.get_top_counts(
+            SiteUser,
+            CounterDimension.PERFORMER,
+        )
+        return context
+
+    def get_top_counts(self, model, dimension):
+        """Return (object, number of tasks) of objects with most tasks."""
+        counters = TaskCounter.objects.filter(
+            dimension=dimension,
+            count__gt=0,
+        ).order_by("-count", "object_id")
+        counts = counters.values_list("object_id", "count")
+        counts = list(counts[: self.top_size])
+        counted = model.objects.in_bulk([object_id for object_id, _ in counts])
+        return [
+            (counted[object_id], count)
+            for object_id, count in counts
+            if object_id in counted
+        ]
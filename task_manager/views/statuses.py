@@ -3,22 +3,33 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views import generic
 
-from task_manager.models import Status
+from task_manager.models import CounterDimension, Status
 from task_manager.views.mixins import (
+    AsyncListViewMixin,
     CustomLoginRequiredMixin,
-    SuccessOrProtectedErrorMessageMixin,
+    DeletionGuardMixin,
+    ListPaginationMixin,
+    TaskCountsMixin,
 )
 
 
-class StatusListView(CustomLoginRequiredMixin, generic.ListView):
+class StatusListView(
+    AsyncListViewMixin,
+    CustomLoginRequiredMixin,
+    ListPaginationMixin,
+    TaskCountsMixin,
+    generic.ListView,
+):
     """Statuses list page view."""
 
     template_name = "task_manager/status_list.html"
     context_object_name = "status_list"
+    task_counter_dimension = CounterDimension.STATUS
+    ordering = ("-created_on", "-id")
 
     def get_queryset(self):
         """Return the list of all statuses."""
-        return Status.objects.order_by("-created_on")
+        return Status.objects.order_by(*self.get_ordering())
 
 
 class StatusCreateView(
@@ -51,13 +62,14 @@ class StatusUpdateView(
 
 class StatusDeleteView(
     CustomLoginRequiredMixin,
-    SuccessOrProtectedErrorMessageMixin,
+    DeletionGuardMixin,
     generic.DeleteView,
 ):
     """Status deletion page view."""
 
     template_name = "task_manager/status_delete.html"
     model = Status
+    protecting_task_fields = ("status",)
     success_url = reverse_lazy("statuses")
     success_message = _("Status deleted successfully")
     protected_error_message = _("Cannot delete the status assigned to task")
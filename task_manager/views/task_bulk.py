@@ -0,0 +1,94 @@
+from django.contrib import messages
+from django.db import transaction
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from django.views import generic
+
+from task_manager.filters import TaskListFilter
+from task_manager.forms import TaskBulkActionForm
+from task_manager.models import Task
+from task_manager.views.mixins import CustomLoginRequiredMixin
+
+# Messages of bulk actions, with gettext style placeholders
+TASKS_UPDATED_MESSAGE = _("Tasks updated: %(count)d")  # noqa: WPS323
+TASKS_SKIPPED_MESSAGE = _(
+    "Tasks of other users not deleted: %(count)d",  # noqa: WPS323
+)
+TASKS_DELETED_MESSAGE = _("Tasks deleted: %(count)d")  # noqa: WPS323
+
+
+class TaskBulkActionView(CustomLoginRequiredMixin, generic.FormView):
+    """
+    Action applied to many tasks of the tasks list at once.
+
+    Tasks are selected by ids or as all tasks matching the list filters
+    passed in query string. Each action runs a fixed number of bulk
+    statements regardless of the number of tasks. Only own tasks are
+    deleted, unless the user is a superuser, as in TaskDeleteView.
+    """
+
+    form_class = TaskBulkActionForm
+    http_method_names = ("post",)
+
+    def get_success_url(self):
+        """Return tasks list url with the filters kept."""
+        query = self.request.GET.urlencode()
+        url = reverse("tasks")
+        return f"{url}?{query}" if query else url
+
+    def get_tasks(self, form):
+        """Return queryset of the selected tasks."""
+        if form.cleaned_data["select_all"]:
+            task_filter = TaskListFilter(
+                self.request.GET,
+                self.request.user,
+                queryset=Task.objects.all(),
+            )
+            return task_filter.queryset
+        return Task.objects.filter(pk__in=form.cleaned_data["ids"])
+
+    def form_valid(self, form):
+        """Apply the action to the selected tasks."""
+        tasks = self.get_tasks(form)
+        action = form.cleaned_data["action"]
+        with transaction.atomic():
+            if action == "delete":
+                self.delete_tasks(tasks)
+            else:
+                self.update_tasks(tasks, action, form.cleaned_data[action])
+        return redirect(self.get_success_url())
+
+    def form_invalid(self, form):
+        """Show form errors as messages on tasks list."""
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return redirect(self.get_success_url())
+
+    def update_tasks(self, tasks, action, chosen):
+        """Set status or performer of the tasks, or add labels to them."""
+        if action == "labels":
+            num_updated = tasks.add_labels(chosen)
+        else:
+            num_updated = tasks.set_relation(action, chosen)
+        messages.success(
+            self.request,
+            TASKS_UPDATED_MESSAGE % {"count": num_updated},
+        )
+
+    def delete_tasks(self, tasks):
+        """Delete the tasks the user may delete, report skipped ones."""
+        user = self.request.user
+        if not user.is_superuser:
+            num_skipped = tasks.exclude(creator=user).count()
+            if num_skipped:
+                messages.error(
+                    self.request,
+                    TASKS_SKIPPED_MESSAGE % {"count": num_skipped},
+                )
+        num_deleted = tasks.deletable_by(user).bulk_delete()
+        messages.success(
+            self.request,
+            TASKS_DELETED_MESSAGE % {"count": num_deleted},
+        )
@@ -0,0 +1,48 @@
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from django.views import generic
+
+from task_manager import export
+from task_manager.filters import TaskListFilter
+from task_manager.models import Task
+from task_manager.views.mixins import CustomLoginRequiredMixin
+
+
+class TaskExportView(CustomLoginRequiredMixin, generic.View):
+    """
+    Streaming export of tasks list matching the filters.
+
+    Accepts the same filters as tasks list and `format` parameter:
+    `csv` (default) or `ndjson`.
+    """
+
+    formats = {
+        "csv": ("text/csv", export.iter_csv_lines),
+        "ndjson": ("application/x-ndjson", export.iter_ndjson_lines),
+    }
+    ordering = ("-created_on", "-id")
+    chunk_size = export.EXPORT_CHUNK_SIZE
+
+    def get(self, request, *args, **kwargs):
+        """Stream tasks matching the filters in requested format."""
+        export_format = request.GET.get("format", "csv")
+        if export_format not in self.formats:
+            return HttpResponseBadRequest(_("Unknown export format"))
+        content_type, serialize = self.formats[export_format]
+        task_filter = TaskListFilter(
+            request.GET,
+            request.user,
+            queryset=Task.objects.all(),
+        )
+        tasks = export.iter_task_rows(
+            task_filter.queryset.order_by(*self.ordering),
+            chunk_size=self.chunk_size,
+        )
+        response = StreamingHttpResponse(
+            serialize(tasks),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{export_format}"'
+        )
+        return response
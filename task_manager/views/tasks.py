@@ -3,38 +3,59 @@ from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from django.views import generic
 
-from task_manager.filters import TaskFilter
-from task_manager.forms import TaskEditForm, ToggleOnlyOwnTasks
+from task_manager.filters import TaskListFilter
+from task_manager.forms import TaskBulkActionForm, TaskEditForm
 from task_manager.models import Task
-from task_manager.views.mixins import CustomLoginRequiredMixin
+from task_manager.views.mixins import (
+    AsyncDetailViewMixin,
+    AsyncListViewMixin,
+    CachedObjectMixin,
+    CustomLoginRequiredMixin,
+    KeysetPaginationMixin,
+)
 
 
-class TaskListView(CustomLoginRequiredMixin, generic.ListView):
+class TaskListView(
+    AsyncListViewMixin,
+    CustomLoginRequiredMixin,
+    KeysetPaginationMixin,
+    generic.ListView,
+):
     """Tasks list page view."""
 
     template_name = "task_manager/task_list.html"
+    ordering = ("-created_on", "-id")
+
+    @cached_property
+    def task_filter(self):
+        """Return tasks filtering pipeline built once per request."""
+        return TaskListFilter(self.request.GET, self.request.user)
 
-    def get_queryset(self, self_tasks=False):
-        """Return the list of all tasks."""
-        if self_tasks:
-            queryset = Task.objects.filter(creator=self.request.user)
-        else:
-            queryset = Task.objects.order_by("-created_on")
-        task_filter = TaskFilter(self.request.GET, queryset)
-        return task_filter.qs
+    def get_queryset(self):
+        """Return the list of tasks matching the filters."""
+        return self.task_filter.queryset
+
+    # Hook of MultipleObjectMixin
+    def get_ordering(self):  # noqa: WPS615
+        """Order search results by relevance, then newest first."""
+        return self.task_filter.rank_ordering(self.ordering)
 
     def get_context_data(self, **kwargs):
         """Get context data of task filter view."""
         context = super().get_context_data(**kwargs)
-        toggle_self_tasks = ToggleOnlyOwnTasks(self.request.GET)
-        context["toggle_self_tasks"] = toggle_self_tasks
-        self_tasks = toggle_self_tasks.data.get("self_tasks", None) == "on"
-        queryset = self.get_queryset(self_tasks)
-        task_filter = TaskFilter(self.request.GET, queryset)
-        context["task_filter"] = task_filter
+        context["task_filter"] = self.task_filter
+        context["toggle_self_tasks"] = self.task_filter.toggle_self_tasks
+        filter_query = self.request.GET.copy()
+        filter_query.pop(self.cursor_kwarg, None)
+        context["filter_query"] = filter_query.urlencode()
+        bulk_form = TaskBulkActionForm()
+        context["bulk_form"] = bulk_form
+        # Forms share widgets, so their scripts are included once
+        context["media"] = self.task_filter.form.media + bulk_form.media
         return context
 
 
@@ -59,12 +80,20 @@ class TaskCreateView(
         return super().form_valid(form)
 
 
-class TaskDetailView(CustomLoginRequiredMixin, generic.DetailView):
+class TaskDetailView(
+    AsyncDetailViewMixin,
+    CustomLoginRequiredMixin,
+    generic.DetailView,
+):
     """Task detail page view."""
 
     model = Task
     template_name = "task_manager/task_detail.html"
 
+    def get_queryset(self):
+        """Return tasks with relations shown on details page preloaded."""
+        return Task.objects.for_detail()
+
 
 class TaskUpdateView(
     CustomLoginRequiredMixin,
@@ -83,12 +112,14 @@ class TaskUpdateView(
 class TaskDeleteView(
     CustomLoginRequiredMixin,
     SuccessMessageMixin,
+    CachedObjectMixin,
     UserPassesTestMixin,
     generic.DeleteView,
 ):
     """Task delete page view."""
 
     model = Task
+    select_related_fields = ("creator",)
     template_name = "task_manager/task_delete.html"
 
     success_url = reverse_lazy("tasks")
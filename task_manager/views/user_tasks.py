@@ -0,0 +1,74 @@
+from django.utils.functional import cached_property
+from django.views import generic
+
+from task_manager.cache import get_user_tasks
+from task_manager.models import Task
+from task_manager.pagination import CachedKeysPaginator
+from task_manager.views.mixins import (
+    CustomLoginRequiredMixin,
+    KeysetPaginationMixin,
+)
+
+
+class UserTaskListView(
+    CustomLoginRequiredMixin,
+    KeysetPaginationMixin,
+    generic.ListView,
+):
+    """
+    Page of tasks created by or assigned to the current user.
+
+    Pages are found in the cached list of the user's newest tasks, kept
+    up to date as tasks change, so a page costs one query by primary keys
+    whatever the number of tasks.
+    """
+
+    template_name = "task_manager/user_task_list.html"
+    context_object_name = "task_list"
+    paginator_class = CachedKeysPaginator
+    role_kwarg = "role"
+    # Task field linking the user, by role
+    roles = {"created": "creator", "assigned": "performer"}
+    default_role = "assigned"
+
+    @cached_property
+    def role(self):
+        """Return role of the user in the listed tasks."""
+        role = self.request.GET.get(self.role_kwarg)
+        if role in self.roles:
+            return role
+        return self.default_role
+
+    def get_queryset(self):
+        """Return tasks of the user in the role."""
+        return Task.objects.for_list().filter(
+            **{self.roles[self.role]: self.request.user},
+        )
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Return paginator of the cached task list of the user."""
+        cached_keys = get_user_tasks(
+            self.roles[self.role],
+            self.request.user.pk,
+            self.load_task_keys,
+        )
+        return self.paginator_class(
+            queryset,
+            per_page,
+            cached_keys,
+            ordering=self.ordering,
+        )
+
+    def load_task_keys(self, limit):
+        """Return ordering keys of the newest tasks of the user."""
+        key_fields = [field.lstrip("-") for field in self.ordering]
+        tasks = Task.objects.filter(
+            **{self.roles[self.role]: self.request.user},
+        )
+        return tasks.order_by(*self.ordering).values_list(*key_fields)[:limit]
+
+    def get_context_data(self, **kwargs):
+        """Add the role and the roles to switch to."""
+        context = super().get_context_data(**kwargs)
+        context["role"] = self.role
+        return context
@@ -7,27 +7,39 @@ from django.utils.translation import gettext_lazy as _
 from django.views import generic
 
 from task_manager.forms import SiteUserChangeForm
-from task_manager.models import SiteUser
+from task_manager.models import CounterDimension, SiteUser
 from task_manager.views.mixins import (
+    AsyncListViewMixin,
+    CachedObjectMixin,
     CustomLoginRequiredMixin,
-    SuccessOrProtectedErrorMessageMixin,
+    DeletionGuardMixin,
+    ListPaginationMixin,
+    TaskCountsMixin,
 )
 
 
-class SiteUserListView(generic.ListView):
+class SiteUserListView(
+    AsyncListViewMixin,
+    ListPaginationMixin,
+    TaskCountsMixin,
+    generic.ListView,
+):
     """Site users list view."""
 
     template_name = "task_manager/user_list.html"
     context_object_name = "user_list"
+    task_counter_dimension = CounterDimension.PERFORMER
+    ordering = ("-signup_date", "-id")
 
     def get_queryset(self):
         """Return the list of all registered users."""
-        return SiteUser.objects.order_by("-signup_date")
+        return SiteUser.objects.order_by(*self.get_ordering())
 
 
 class SiteUserUpdateView(
     CustomLoginRequiredMixin,
     SuccessMessageMixin,
+    CachedObjectMixin,
     UserPassesTestMixin,
     generic.UpdateView,
 ):
@@ -58,7 +70,8 @@ class SiteUserUpdateView(
 
 class SiteUserDeleteView(
     CustomLoginRequiredMixin,
-    SuccessOrProtectedErrorMessageMixin,
+    DeletionGuardMixin,
+    CachedObjectMixin,
     UserPassesTestMixin,
     generic.DeleteView,
 ):
@@ -66,6 +79,7 @@ class SiteUserDeleteView(
 
     model = SiteUser
     template_name = "registration/user_delete.html"
+    protecting_task_fields = ("creator", "performer")
 
     success_url = reverse_lazy("users")
     success_message = _("User deleted successfully")
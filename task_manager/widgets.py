@@ -0,0 +1,159 @@
+import hashlib
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.utils import flatatt
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
+
+from task_manager.cache import get_or_set_versioned
+
+OPTION_START = '<option value="{0}">'
+OPTION = '<option value="{0}">{1}</option>'
+SELECTED_OPTION_START = '<option value="{0}" selected>'
+
+
+class CachedChoicesMixin:
+    """
+    Render select options from cache of the choices namespace.
+
+    Options are rendered once per namespace version and language,
+    without querying choices from the database. Only the selected
+    options are marked at render time.
+    """
+
+    def __init__(self, namespace, *args, **kwargs):
+        """Set cache namespace of the choices."""
+        self.namespace = namespace
+        super().__init__(*args, **kwargs)
+
+    # Arguments of Widget.render() passed by name
+    def render(self, name, value, attrs=None, renderer=None):  # noqa: WPS110
+        """Render select with cached options."""
+        final_attrs = self.build_attrs(self.attrs, attrs)
+        final_attrs["name"] = name
+        if self.allow_multiple_selected:
+            final_attrs["multiple"] = True
+        options = self.get_options_html()
+        for selected in self.format_value(value):
+            selected = escape(selected)
+            options = options.replace(
+                OPTION_START.format(selected),
+                SELECTED_OPTION_START.format(selected),
+                1,
+            )
+        return format_html(
+            "<select{0}>\n{1}\n</select>",
+            flatatt(final_attrs),
+            mark_safe(options),  # noqa: S308, S703
+        )
+
+    def get_options_html(self):
+        """Return cached HTML of the options."""
+        options_key = ("options", self.get_choices_variant())
+        return get_or_set_versioned(
+            self.namespace,
+            options_key,
+            self.render_options_html,
+        )
+
+    def get_choices_variant(self):
+        """
+        Return key part telling choices of different fields apart.
+
+        Fields of the same namespace differ by their empty label.
+        """
+        field = getattr(self.choices, "field", None)
+        empty_label = getattr(field, "empty_label", None)
+        return hashlib.md5(  # noqa: S324
+            str(empty_label).encode(),
+        ).hexdigest()[:8]
+
+    def render_options_html(self):
+        """Render options of all choices."""
+        return "\n".join(
+            format_html(
+                OPTION,
+                str(choice_value),
+                choice_label,
+            )
+            for choice_value, choice_label in self.choices
+        )
+
+
+class CachedSelect(CachedChoicesMixin, forms.Select):
+    """Select with options cached per namespace version."""
+
+
+class CachedSelectMultiple(CachedChoicesMixin, forms.SelectMultiple):
+    """Multiple select with options cached per namespace version."""
+
+
+class AutocompleteMixin:
+    """
+    Select rendering only selected options, searched on the server.
+
+    Options matching the text typed by user are fetched from JSON
+    autocomplete endpoint, so the page does not depend on the number
+    of objects to choose from.
+    """
+
+    media = forms.Media(js=("task_manager/js/autocomplete.js",))
+
+    def __init__(self, url, *args, **kwargs):
+        """Set url of autocomplete endpoint."""
+        self.url = url
+        super().__init__(*args, **kwargs)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        """Add autocomplete endpoint url to attributes."""
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = str(self.url)
+        return attrs
+
+    # Arguments of ChoiceWidget.optgroups() passed by name
+    def optgroups(self, name, value, attrs=None):  # noqa: WPS110
+        """Return option groups of empty choice and selected objects."""
+        field = self.choices.field
+        choices = []
+        if field.empty_label is not None and not self.allow_multiple_selected:
+            choices.append(("", field.empty_label))
+        selected_values = [choice for choice in value if choice]
+        try:
+            selected_objects = list(
+                field.queryset.filter(pk__in=selected_values),
+            )
+        except (ValidationError, TypeError, ValueError):
+            selected_objects = []
+        choices.extend(
+            (
+                field.prepare_value(selected_object),
+                field.label_from_instance(selected_object),
+            )
+            for selected_object in selected_objects
+        )
+        return [
+            (
+                None,
+                [
+                    self.create_option(
+                        name,
+                        choice_value,
+                        choice_label,
+                        str(choice_value) in value,
+                        index,
+                        attrs=attrs,
+                    ),
+                ],
+                index,
+            )
+            for index, (choice_value, choice_label) in enumerate(choices)
+        ]
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    """Select with options searched on the server."""
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    """Multiple select with options searched on the server."""